@@ -0,0 +1,216 @@
+"""Local JSON HTTP API over the playbook's design and analysis calculators.
+
+    python ab_api.py --port 8600 --workers 8
+
+Every endpoint takes a JSON object via POST. Each field may be a scalar or an
+array; arrays are broadcast against each other and evaluated in one vectorized
+call, so a single request can carry a whole batch. Responses mirror the input
+shape (scalars in, scalars out) and NaN/infinity are returned as ``null``.
+``distribution`` is text (binomial, normal, poisson or negative_binomial) and
+``split`` the treatment share in percent, as in ``ab_batch.py``.
+
+    POST /sample-size       baseline, mde, [alpha], [power], [split],
+                            [distribution], [sd], [dispersion]
+    POST /duration          n_per_group, daily_traffic, [split]
+    POST /budget            baseline, total_n, [mde], [alpha], [power], [split],
+                            [distribution], [sd], [dispersion]
+    POST /srm               control_n, treatment_n, [expected_ratio]
+    POST /ztest             control_n, control_x, treatment_n, treatment_x
+    POST /business-impact   control_rate, treatment_rate, monthly_users,
+                            value_per_conversion, [implementation_cost],
+                            [ongoing_cost_monthly]
+    GET  /health
+
+Identical request bodies are answered from an in-process LRU cache.
+"""
+import argparse
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+
+from playbook import inverse as ab_inverse
+from playbook import stats as ab_stats
+
+
+# Parameters passed through as text rather than converted to float arrays
+TEXT_PARAMETERS = ('distribution',)
+
+
+def _sample_size(baseline, mde, alpha=0.05, power=0.80, split=50, distribution="binomial", sd=None, dispersion=0.0):
+    total = ab_stats.metric_sample_size(baseline, mde, alpha, power, split, distribution, sd, dispersion)
+    # Arms as in the Design phase: the smaller one is the per-group size
+    control_n = np.ceil(total * (1 - split / 100))
+    treatment_n = np.ceil(total * split / 100)
+    return {
+        'sample_size_per_group': np.minimum(control_n, treatment_n),
+        'control_sample_size': control_n,
+        'treatment_sample_size': treatment_n,
+        'total_sample_size': control_n + treatment_n,
+    }
+
+
+def _duration(n_per_group, daily_traffic, split=50):
+    return {'duration_days': ab_stats.duration_days(n_per_group, daily_traffic, split)}
+
+
+def _budget(baseline, total_n, mde=None, alpha=0.05, power=0.80, split=50, distribution="binomial", sd=None,
+            dispersion=0.0):
+    solved = ab_inverse.solve_budget(baseline, total_n, mde, alpha, power, split,
+                                     distribution=distribution, sd=sd, dispersion=dispersion)
+    result = {'detectable_mde': solved['mde']}
+    if mde is not None:
+        result.update(achievable_power=solved['power'], required_alpha=solved['alpha'])
+    return result
+
+
+def _srm(control_n, treatment_n, expected_ratio=50):
+    chi2_stat, p_value = ab_stats.srm_test(control_n, treatment_n, expected_ratio)
+    return {'chi2_stat': chi2_stat, 'p_value': p_value}
+
+
+def _ztest(control_n, control_x, treatment_n, treatment_x):
+    return ab_stats.two_proportion_ztest(control_n, control_x, treatment_n, treatment_x)
+
+
+def _business_impact(control_rate, treatment_rate, monthly_users, value_per_conversion,
+                     implementation_cost=10_000, ongoing_cost_monthly=0):
+    return ab_stats.business_impact(control_rate, treatment_rate, monthly_users, value_per_conversion,
+                                    implementation_cost, ongoing_cost_monthly)
+
+
+ENDPOINTS = {
+    '/sample-size': _sample_size,
+    '/duration': _duration,
+    '/budget': _budget,
+    '/srm': _srm,
+    '/ztest': _ztest,
+    '/business-impact': _business_impact,
+}
+
+
+class APIError(ValueError):
+    """Client error reported back as HTTP 400/404"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _to_json(value):
+    """NumPy results as JSON-safe scalars or lists (non-finite → None)"""
+    array = np.asarray(value, dtype=float)
+    cleaned = np.where(np.isfinite(array), array, np.nan).tolist()
+    if array.ndim == 0:
+        return None if math.isnan(cleaned) else cleaned
+    return [None if math.isnan(v) else v for v in cleaned]
+
+
+def evaluate(path, body):
+    """Decode a request body, run the endpoint and encode the response"""
+    handler = ENDPOINTS.get(path)
+    if handler is None:
+        raise APIError(f"Unknown endpoint {path!r}", status=404)
+    try:
+        params = json.loads(body or b"{}")
+    except json.JSONDecodeError as exc:
+        raise APIError(f"Invalid JSON: {exc}")
+    if not isinstance(params, dict):
+        raise APIError("Request body must be a JSON object")
+
+    try:
+        arrays = {key: (np.char.lower(np.char.strip(np.asarray(value, dtype=str))) if key in TEXT_PARAMETERS
+                        else np.asarray(value, dtype=float))
+                  for key, value in params.items()}
+        np.broadcast_shapes(*(array.shape for array in arrays.values()))
+        result = handler(**arrays)
+    except TypeError as exc:
+        raise APIError(f"Bad parameters for {path}: {exc}")
+    except ValueError as exc:
+        raise APIError(f"Bad parameter values for {path}: {exc}")
+
+    return json.dumps({key: _to_json(value) for key, value in result.items()}).encode()
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ABPlaybookAPI/1.0"
+    # Headers and body go out as separate writes; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+    # Seconds an idle keep-alive connection may hold a pool thread before it is closed
+    timeout = 15
+
+    def _send(self, status, payload):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, b'{"status": "ok"}')
+        else:
+            self._send(404, json.dumps({'error': f"Unknown endpoint {self.path!r}"}).encode())
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        try:
+            self._send(200, self.server.respond(self.path, body))
+        except APIError as exc:
+            self._send(exc.status, json.dumps({'error': str(exc)}).encode())
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles connections on a fixed-size thread pool"""
+
+    def __init__(self, address, workers=4, cache_size=4096, verbose=False):
+        super().__init__(address, APIRequestHandler)
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ab-api")
+        self.respond = lru_cache(maxsize=cache_size)(evaluate) if cache_size else evaluate
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the A/B playbook calculators as a local JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent connection handlers")
+    parser.add_argument("--cache-size", type=int, default=4096, help="Cached responses (0 disables caching)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = PooledHTTPServer((args.host, args.port), args.workers, args.cache_size, args.verbose)
+    print(f"Serving A/B playbook API on http://{args.host}:{args.port} with {args.workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Headless batch evaluation of experiments with the playbook's Phase 3/5/6 math.
+
+Streams a CSV of experiment/metric rows in chunks and appends sample size,
+duration, detectable MDE, SRM, z-test, confidence interval, lift and ROI
+columns:
+
+    python ab_batch.py experiments.csv -o results.parquet --workers 4
+
+Recognised input columns (any other column is passed through untouched):
+
+    design    baseline, mde, alpha, power, daily_traffic, split,
+              distribution, sd, dispersion
+    budget    baseline and total_n (or days and daily_traffic); with mde
+              also achievable_power and required_alpha
+    analysis  control_n, control_x, treatment_n, treatment_x, expected_ratio,
+              alpha (per-row significance level; ``--alpha`` where missing)
+    decision  monthly_users, value_per_conversion,
+              implementation_cost, ongoing_cost_monthly
+
+``distribution`` is one of binomial (default; ``baseline`` is a rate in
+percent), normal (``baseline`` is the mean, ``sd`` required), poisson or
+negative_binomial (``dispersion``: Var = mean + dispersion * mean^2).
+Budget rows answer the inverse question for a fixed list size or campaign
+length: the smallest lift ``total_n`` users detect at ``power``.
+
+Sample sizes use the exact unequal-allocation total for ``split`` (the
+treatment share in percent), split into ``control_sample_size`` and
+``treatment_sample_size``; ``sample_size_per_group`` is the smaller arm, as
+in the Design phase, and drives ``duration_days``.
+
+A group of outputs is only computed when its required columns are present.
+Optional columns fall back to the app's widget defaults. Recognised columns
+are written back as floats and every other column as text, so each chunk has
+the same types whatever its values. Parquet output needs ``pyarrow``.
+"""
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from playbook import inverse as ab_inverse
+from playbook import stats as ab_stats
+
+# Defaults mirror the Streamlit widgets
+DEFAULTS = {
+    'alpha': 0.05,
+    'power': 0.80,
+    'split': 50,
+    'expected_ratio': 50,
+    'implementation_cost': 10_000.0,
+    'ongoing_cost_monthly': 0.0,
+    'sd': np.nan,
+    'dispersion': 0.0,
+}
+
+DESIGN_COLUMNS = ('baseline', 'mde')
+ANALYSIS_COLUMNS = ('control_n', 'control_x', 'treatment_n', 'treatment_x')
+DECISION_COLUMNS = ('monthly_users', 'value_per_conversion')
+NUMERIC_COLUMNS = frozenset(DEFAULTS) | set(DESIGN_COLUMNS + ANALYSIS_COLUMNS + DECISION_COLUMNS) | {
+    'daily_traffic', 'total_n', 'days'}
+
+
+def _column(frame, name):
+    """Column as a float array, falling back to the widget default"""
+    if name in frame.columns:
+        return pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float)
+    return np.full(len(frame), DEFAULTS[name], dtype=float)
+
+
+def _distribution(frame):
+    """Normalised metric families, binomial where missing"""
+    if 'distribution' not in frame.columns:
+        return "binomial"
+    return frame['distribution'].fillna("binomial").astype(str).str.strip().str.lower().to_numpy()
+
+
+def evaluate_frame(frame, significance=0.05):
+    """Append the design, analysis and decision outputs to one chunk"""
+    out = frame.copy()
+    columns = set(frame.columns)
+    # Inferred dtypes vary by chunk (an all-blank chunk reads as float); fix them so every chunk matches
+    for name in NUMERIC_COLUMNS & columns:
+        out[name] = _column(frame, name)
+
+    if columns.issuperset(DESIGN_COLUMNS):
+        split = _column(frame, 'split')
+        exact_total = ab_stats.metric_sample_size(
+            _column(frame, 'baseline'), _column(frame, 'mde'), _column(frame, 'alpha'), _column(frame, 'power'),
+            split, _distribution(frame), _column(frame, 'sd'), _column(frame, 'dispersion')
+        )
+        # Arms as in the Design phase: the smaller one sets the per-group size and the duration
+        control_n = np.ceil(exact_total * (1 - split / 100))
+        treatment_n = np.ceil(exact_total * split / 100)
+        n_per_group = np.minimum(control_n, treatment_n)
+        out['sample_size_per_group'] = n_per_group
+        out['control_sample_size'] = control_n
+        out['treatment_sample_size'] = treatment_n
+        out['total_sample_size'] = control_n + treatment_n
+        if 'daily_traffic' in columns:
+            out['duration_days'] = ab_stats.duration_days(n_per_group, _column(frame, 'daily_traffic'), split)
+
+    if 'baseline' in columns and ('total_n' in columns or columns.issuperset(('days', 'daily_traffic'))):
+        if 'total_n' in columns:
+            budget = _column(frame, 'total_n')
+        else:
+            budget = _column(frame, 'days') * _column(frame, 'daily_traffic')
+        solved = ab_inverse.solve_budget(
+            _column(frame, 'baseline'), budget, _column(frame, 'mde') if 'mde' in columns else None,
+            _column(frame, 'alpha'), _column(frame, 'power'), _column(frame, 'split'),
+            distribution=_distribution(frame), sd=_column(frame, 'sd'), dispersion=_column(frame, 'dispersion')
+        )
+        out['detectable_mde'] = solved['mde']
+        if 'mde' in columns:
+            out['achievable_power'] = solved['power']
+            out['required_alpha'] = solved['alpha']
+
+    if columns.issuperset(ANALYSIS_COLUMNS):
+        control_n = _column(frame, 'control_n')
+        treatment_n = _column(frame, 'treatment_n')
+        out['srm_chi2'], out['srm_p_value'] = ab_stats.srm_test(
+            control_n, treatment_n, _column(frame, 'expected_ratio')
+        )
+
+        test = ab_stats.two_proportion_ztest(
+            control_n, _column(frame, 'control_x'), treatment_n, _column(frame, 'treatment_x')
+        )
+        for key in ('control_rate', 'treatment_rate', 'z_stat', 'p_value', 'se_diff',
+                    'ci_lower', 'ci_upper', 'absolute_lift', 'relative_lift'):
+            out[key] = test[key]
+        # Each row is judged at its own alpha; the command-line level only fills the gaps
+        alpha = _column(frame, 'alpha') if 'alpha' in columns else np.full(len(frame), significance)
+        out['significant'] = test['p_value'] < np.where(np.isnan(alpha), significance, alpha)
+
+        if columns.issuperset(DECISION_COLUMNS):
+            impact = ab_stats.business_impact(
+                test['control_rate'], test['treatment_rate'],
+                _column(frame, 'monthly_users'), _column(frame, 'value_per_conversion'),
+                _column(frame, 'implementation_cost'), _column(frame, 'ongoing_cost_monthly')
+            )
+            for key, values in impact.items():
+                out[key] = values
+
+    return out
+
+
+def _process_chunk(chunk, significance, fmt):
+    """Evaluate a chunk and, for CSV, encode it in the worker that computed it"""
+    result = evaluate_frame(chunk, significance)
+    if fmt == "csv":
+        return list(result.columns), len(result), result.to_csv(index=False, header=False)
+    return list(result.columns), len(result), result
+
+
+class _ResultWriter:
+    """Appends processed chunks to a CSV or Parquet file"""
+
+    def __init__(self, path, fmt):
+        self.path = Path(path)
+        self.fmt = fmt
+        self._handle = None
+        self._parquet = None
+
+    def write(self, columns, payload):
+        if self.fmt == "csv":
+            if self._handle is None:
+                self._handle = open(self.path, "w", newline="")
+                self._handle.write(",".join(columns) + "\n")
+            self._handle.write(payload)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(payload, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table.cast(self._parquet.schema))
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def _process_chunks(chunks, workers, significance, fmt):
+    """Yield processed chunks in input order, optionally sharded across processes"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield _process_chunk(chunk, significance, fmt)
+        return
+
+    # Bounded window of in-flight chunks keeps memory flat on huge inputs
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_process_chunk, chunk, significance, fmt))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run(input_path, output_path, chunksize=100_000, workers=1, fmt=None, significance=0.05):
+    """Evaluate ``input_path`` into ``output_path``; returns the number of rows"""
+    fmt = fmt or ("parquet" if str(output_path).endswith((".parquet", ".pq")) else "csv")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise SystemExit("Parquet output requires pyarrow: pip install pyarrow")
+
+    writer = _ResultWriter(output_path, fmt)
+    rows = 0
+    try:
+        # Pass-through columns stay text: their inferred type could change from one chunk to the next
+        header = pd.read_csv(input_path, nrows=0).columns
+        chunks = pd.read_csv(input_path, chunksize=chunksize,
+                             dtype={name: "string" for name in header if name not in NUMERIC_COLUMNS})
+        for columns, count, payload in _process_chunks(chunks, workers, significance, fmt):
+            writer.write(columns, payload)
+            rows += count
+    finally:
+        writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-evaluate A/B experiments from a CSV file")
+    parser.add_argument("input", help="CSV file with one experiment/metric per row")
+    parser.add_argument("-o", "--output", required=True, help="Output .csv or .parquet file")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="Override the format inferred from --output")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per vectorized chunk")
+    parser.add_argument("--workers", type=int, default=1, help="Processes to shard chunks across")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level for the 'significant' flag on rows without an alpha")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = run(args.input, args.output, args.chunksize, args.workers, args.format, args.alpha)
+    elapsed = time.perf_counter() - started
+    print(f"Evaluated {rows:,} rows in {elapsed:.2f}s → {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Automated sample ratio mismatch check over per-day or per-hour assignment counts.
+
+    python ab_srm.py counts.csv                      # equal split across arms
+    python ab_srm.py counts.csv --expected 50,25,25 -o srm_by_hour.csv
+    python ab_srm.py counts.csv --horizon 336        # hourly check over a 2-week test
+
+The input is either wide (``timestamp, control, treatment, ...``) or long
+(``timestamp, arm, count``). Per-interval and cumulative chi-square p-values
+are checked against ``alpha / (2 * horizon)``: half of alpha per family,
+Bonferroni-corrected over the horizon. For a check that runs after every new
+interval, pass the planned ``--horizon`` and keep it fixed; the false-alarm
+rate over the whole test then stays within alpha. Without it the horizon is
+the number of intervals in the file, which is only valid for one final check.
+
+Exit status: 0 when clean, 2 when SRM is detected (for schedulers and CI).
+"""
+import argparse
+import sys
+import time
+
+from playbook import srm
+
+
+def _weights(text):
+    return [float(part) for part in text.split(",")] if text else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check assignment counts for sample ratio mismatch over time")
+    parser.add_argument("input", help="CSV of assignment counts per interval")
+    parser.add_argument("--expected", type=_weights, help="Comma-separated allocation weights, in column order")
+    parser.add_argument("--alpha", type=float, default=srm.DEFAULT_ALPHA,
+                        help="Family-wise alpha across all intervals (default 0.001)")
+    parser.add_argument("--horizon", type=int,
+                        help="Planned number of intervals, fixed before monitoring (default: intervals in the file)")
+    parser.add_argument("-o", "--output", help="Write the per-interval table to this CSV")
+    args = parser.parse_args(argv)
+
+    counts = srm.load_assignment_counts(args.input)
+    started = time.perf_counter()
+    summary, table = srm.monitor_frame(counts, args.expected, args.alpha, args.horizon)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        table.to_csv(args.output)
+
+    print(f"{summary['intervals']:,} intervals x {len(summary['arms'])} arms ({', '.join(summary['arms'])}) "
+          f"checked in {elapsed * 1000:.1f} ms")
+    print(f"  threshold          p < {summary['threshold']:.3g}  "
+          f"(alpha {summary['alpha']} / 2 families / horizon {summary['horizon']})")
+    print(f"  cumulative p-value {summary['final_p_value']:.3g}")
+    if not summary['srm_detected']:
+        print("  result             no SRM detected")
+        return 0
+
+    print("  result             SRM DETECTED")
+    for label, key in (("first detection", 'first_detection'), ("likely onset", 'likely_onset'),
+                       ("first bad interval", 'first_bad_interval')):
+        if summary[key] is not None:
+            print(f"  {label:18} {summary[key]}")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Load generator for the local JSON API in ``ab_api.py``.
+
+    python ab_api.py --workers 8 &
+    python benchmarks/api_client.py --endpoint /ztest --concurrency 16 --requests 5000
+
+Each client thread keeps one persistent HTTP/1.1 connection open. ``--distinct``
+controls how many different payloads are cycled through, so runs can measure
+both cache hits (small values) and cold computation (large values).
+"""
+import argparse
+import http.client
+import json
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+PAYLOADS = {
+    '/sample-size': lambda rng, k: {
+        'baseline': rng.uniform(1, 20, k).round(2).tolist(),
+        'mde': rng.uniform(5, 30, k).round(1).tolist(),
+    },
+    '/duration': lambda rng, k: {
+        'n_per_group': rng.integers(1_000, 100_000, k).tolist(),
+        'daily_traffic': rng.integers(1_000, 50_000, k).tolist(),
+    },
+    '/budget': lambda rng, k: {
+        'baseline': rng.uniform(1, 20, k).round(2).tolist(),
+        'total_n': rng.integers(10_000, 1_000_000, k).tolist(),
+        'mde': rng.uniform(5, 30, k).round(1).tolist(),
+    },
+    '/srm': lambda rng, k: {
+        'control_n': rng.integers(9_000, 11_000, k).tolist(),
+        'treatment_n': rng.integers(9_000, 11_000, k).tolist(),
+    },
+    '/ztest': lambda rng, k: {
+        'control_n': [10_000] * k,
+        'control_x': rng.integers(400, 600, k).tolist(),
+        'treatment_n': [10_000] * k,
+        'treatment_x': rng.integers(400, 650, k).tolist(),
+    },
+    '/business-impact': lambda rng, k: {
+        'control_rate': rng.uniform(0.01, 0.1, k).tolist(),
+        'treatment_rate': rng.uniform(0.01, 0.1, k).tolist(),
+        'monthly_users': [100_000] * k,
+        'value_per_conversion': [50.0] * k,
+    },
+}
+
+
+def _connect(parsed):
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    conn.connect()
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return conn
+
+
+def _client(url, endpoint, bodies, count, offset, latencies, errors):
+    parsed = urlparse(url)
+    conn = _connect(parsed)
+    headers = {"Content-Type": "application/json"}
+    for i in range(count):
+        body = bodies[(offset + i) % len(bodies)]
+        started = time.perf_counter()
+        try:
+            conn.request("POST", endpoint, body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append("connection")
+            conn.close()
+            conn = _connect(parsed)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+
+
+def run(url, endpoint, concurrency, requests, batch_size, distinct, seed=0):
+    """Fire ``requests`` POSTs from ``concurrency`` threads; returns a summary dict"""
+    rng = np.random.default_rng(seed)
+    bodies = [json.dumps(PAYLOADS[endpoint](rng, batch_size)).encode() for _ in range(distinct)]
+
+    latencies, errors = [], []
+    per_thread = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    threads = [
+        threading.Thread(target=_client, args=(url, endpoint, bodies, n, i * 7919, latencies, errors))
+        for i, n in enumerate(per_thread)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latency_ms = np.asarray(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'elapsed_s': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else float("nan"),
+        'rows_per_s': len(latencies) * batch_size / elapsed if elapsed else float("nan"),
+        'p50_ms': float(np.percentile(latency_ms, 50)) if len(latency_ms) else float("nan"),
+        'p95_ms': float(np.percentile(latency_ms, 95)) if len(latency_ms) else float("nan"),
+        'p99_ms': float(np.percentile(latency_ms, 99)) if len(latency_ms) else float("nan"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the local A/B playbook API")
+    parser.add_argument("--url", default="http://127.0.0.1:8600")
+    parser.add_argument("--endpoint", default="/ztest", choices=sorted(PAYLOADS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per request")
+    parser.add_argument("--distinct", type=int, default=1_000, help="Distinct payloads to cycle through")
+    args = parser.parse_args(argv)
+
+    summary = run(args.url, args.endpoint, args.concurrency, args.requests, args.batch_size, args.distinct)
+    print(f"{args.endpoint}: {summary['requests']:,} requests ({summary['errors']} errors) "
+          f"in {summary['elapsed_s']:.2f}s")
+    print(f"  throughput  {summary['requests_per_s']:,.0f} req/s  ({summary['rows_per_s']:,.0f} rows/s)")
+    print(f"  latency     p50 {summary['p50_ms']:.2f} ms  p95 {summary['p95_ms']:.2f} ms  "
+          f"p99 {summary['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
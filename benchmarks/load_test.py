@@ -0,0 +1,210 @@
+"""Concurrent-session load test for the Streamlit app, driven headlessly.
+
+    python benchmarks/load_test.py --sessions 40 --concurrency 8
+    python benchmarks/load_test.py --sessions 80 --concurrency 8 --workers 4
+
+Every simulated session walks the full playbook the way a user would: initial
+load, the sidebar nav buttons for all six phases, a channel selection,
+"Calculate Sample Size" and "Analyze Results". Each interaction is one rerun
+of the real script through Streamlit's ``AppTest``.
+
+``AppTest`` swaps a process-global runtime in and out on every run, so reruns
+of different sessions cannot overlap inside one process. Each worker process
+therefore keeps ``--concurrency`` live sessions and advances them in bursts:
+all of them "click" at the same moment and are served one after another,
+which is how simultaneous reruns queue up on a single Streamlit worker's GIL.
+Two latencies are reported per rerun:
+
+* service time - the rerun itself
+* response time - from the burst start until that session's rerun finished,
+  i.e. including the wait behind the other sessions
+
+``--workers`` runs that many worker processes side by side (one per CPU core
+you want to load). The report covers throughput, p50/p95/p99 latencies overall
+and per step, and the resident memory each live session adds to its worker.
+Nothing leaves the machine: the registry goes to a temporary directory unless
+``AB_REGISTRY_PATH`` is set.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_PATH = ROOT / "mrkt_sci_ab_v2.py"
+
+
+def _nav(index):
+    return lambda at: at.button(key=f"nav_btn_{index}").click().run()
+
+
+def _click(label):
+    def action(at):
+        next(button for button in at.button if label in button.label).click().run()
+    return action
+
+
+def _select_channel(channel):
+    def action(at):
+        next(box for box in at.selectbox if "Marketing Channel" in box.label).set_value(channel).run()
+    return action
+
+
+# (step name, action) pairs; every action is exactly one rerun
+SCENARIO = (
+    ("initial_load", lambda at: at.run()),
+    ("nav_metrics", _nav(1)),
+    ("nav_design", _nav(2)),
+    ("select_channel", _select_channel("E-commerce")),
+    ("calculate_sample_size", _click("Calculate Sample Size")),
+    ("nav_implementation", _nav(3)),
+    ("nav_analysis", _nav(4)),
+    ("analyze_results", _click("Analyze Results")),
+    ("nav_decision", _nav(5)),
+    ("nav_objective", _nav(0)),
+)
+
+
+def _rss_bytes():
+    """Current resident set size (Linux), falling back to the peak RSS"""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(str(APP_PATH), default_timeout=120)
+
+
+def _worker(sessions, concurrency, think_time):
+    """Run ``sessions`` scenarios in waves of ``concurrency`` live sessions"""
+    logging.disable(logging.WARNING)
+    _app_test().run()  # warm imports and cached resources before measuring
+
+    service, response = defaultdict(list), defaultdict(list)
+    errors, memory, completed = [], [], 0
+    worker_started = time.perf_counter()
+    for wave_start in range(0, sessions, concurrency):
+        wave = [_app_test() for _ in range(min(concurrency, sessions - wave_start))]
+        alive = list(range(len(wave)))
+        rss_before = _rss_bytes()
+
+        for step, action in SCENARIO:
+            burst_started = time.perf_counter()
+            for index in list(alive):
+                at = wave[index]
+                started = time.perf_counter()
+                try:
+                    action(at)
+                    failure = at.exception[0].message if at.exception else None
+                except Exception as exc:
+                    failure = repr(exc)
+                finished = time.perf_counter()
+                if failure:
+                    # A failed step ends the session, like a crashed browser tab
+                    errors.append(f"{step}: {failure}")
+                    alive.remove(index)
+                    continue
+                service[step].append(finished - started)
+                response[step].append(finished - burst_started)
+            if think_time:
+                time.sleep(think_time)
+
+        memory.append((_rss_bytes() - rss_before) / len(wave))
+        completed += len(alive)
+        del wave
+    return {'service': dict(service), 'response': dict(response), 'errors': errors,
+            'memory': memory, 'completed': completed, 'elapsed': time.perf_counter() - worker_started}
+
+
+def _percentiles(seconds):
+    if not len(seconds):
+        return {'p50_ms': float("nan"), 'p95_ms': float("nan"), 'p99_ms': float("nan")}
+    p50, p95, p99 = np.percentile(np.asarray(seconds) * 1000, [50, 95, 99])
+    return {'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+def run(sessions, concurrency, workers=1, think_time=0.0):
+    """Drive ``sessions`` scenarios across ``workers`` processes; returns a summary dict"""
+    shares = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+    shares = [share for share in shares if share]
+
+    with ProcessPoolExecutor(max_workers=len(shares)) as pool:
+        results = list(pool.map(_worker, shares, [concurrency] * len(shares), [think_time] * len(shares)))
+    # Workers time themselves after warm-up, so process start-up isn't counted
+    elapsed = max(result['elapsed'] for result in results)
+
+    service, response = defaultdict(list), defaultdict(list)
+    for result in results:
+        for step, values in result['service'].items():
+            service[step] += values
+        for step, values in result['response'].items():
+            response[step] += values
+    all_service = [value for values in service.values() for value in values]
+    all_response = [value for values in response.values() for value in values]
+    memory = [value for result in results for value in result['memory']]
+
+    return {
+        'sessions': sessions,
+        'completed': sum(result['completed'] for result in results),
+        'concurrency': concurrency,
+        'workers': len(shares),
+        'reruns': len(all_service),
+        'errors': [error for result in results for error in result['errors']],
+        'elapsed_s': elapsed,
+        'reruns_per_s': len(all_service) / elapsed if elapsed else float("nan"),
+        'sessions_per_s': sessions / elapsed if elapsed else float("nan"),
+        'mb_per_session': float(np.mean(memory)) / 2**20 if memory else float("nan"),
+        'service': _percentiles(all_service),
+        'response': _percentiles(all_response),
+        'steps': {step: {'count': len(service[step]), 'service': _percentiles(service[step]),
+                         'response': _percentiles(response[step])}
+                  for step, _ in SCENARIO if service[step]},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the A/B playbook app with headless sessions")
+    parser.add_argument("--sessions", type=int, default=20, help="Simulated sessions to run in total")
+    parser.add_argument("--concurrency", type=int, default=4, help="Live sessions per worker process")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (one per core to load)")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds to pause between interactions")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("AB_REGISTRY_PATH", str(Path(tempfile.mkdtemp()) / "load_registry.db"))
+
+    summary = run(args.sessions, args.concurrency, args.workers, args.think_time)
+    service, response = summary['service'], summary['response']
+    print(f"{summary['sessions']} sessions x {len(SCENARIO)} steps, {summary['concurrency']} live per worker, "
+          f"{summary['workers']} worker(s): {summary['reruns']:,} reruns in {summary['elapsed_s']:.1f}s "
+          f"({len(summary['errors'])} errors)")
+    print(f"  throughput  {summary['reruns_per_s']:.1f} reruns/s  ({summary['sessions_per_s']:.2f} sessions/s)")
+    print(f"  service     p50 {service['p50_ms']:.0f} ms  p95 {service['p95_ms']:.0f} ms  "
+          f"p99 {service['p99_ms']:.0f} ms")
+    print(f"  response    p50 {response['p50_ms']:.0f} ms  p95 {response['p95_ms']:.0f} ms  "
+          f"p99 {response['p99_ms']:.0f} ms")
+    print(f"  memory      ~{summary['mb_per_session']:.2f} MiB RSS per live session")
+
+    print(f"\n  {'step':24} {'count':>6} {'svc p50':>8} {'svc p99':>8} {'resp p50':>9} {'resp p99':>9}")
+    for step, row in summary['steps'].items():
+        print(f"  {step:24} {row['count']:6} {row['service']['p50_ms']:8.0f} {row['service']['p99_ms']:8.0f} "
+              f"{row['response']['p50_ms']:9.0f} {row['response']['p99_ms']:9.0f}")
+    for error in summary['errors'][:5]:
+        print(f"  error: {error}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
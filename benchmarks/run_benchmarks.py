@@ -0,0 +1,379 @@
+"""Benchmark suite for the statistical kernels and headless page renders.
+
+    python benchmarks/run_benchmarks.py                    # compare with baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+    python benchmarks/run_benchmarks.py --filter render    # only matching cases
+
+Kernel cases time ``playbook.stats`` over representative input sizes (one
+Streamlit render, a dashboard batch, a nightly batch). Render cases drive the
+real app through Streamlit's ``AppTest`` and time a steady-state rerun of each
+phase with its results populated.
+
+Each case reports the median per-call time over several repeats. The run fails
+(exit code 1) when a case is slower than its baseline by more than
+``--threshold`` (default 25%). Baselines are machine-specific: record them on
+the machine that runs the comparison.
+
+Check cases (``check/...``) guard results a faster kernel must not change;
+they run once, before timing, and fail the run when they return a problem.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from playbook import aa as ab_aa  # noqa: E402
+from playbook import allocation as ab_allocation  # noqa: E402
+from playbook import assignment as ab_assignment  # noqa: E402
+from playbook import curves as ab_curves  # noqa: E402
+from playbook import downsample as ab_downsample  # noqa: E402
+from playbook import inverse as ab_inverse  # noqa: E402
+from playbook import quality as ab_quality  # noqa: E402
+from playbook import quantiles as ab_quantiles  # noqa: E402
+from playbook import ratio as ab_ratio  # noqa: E402
+from playbook import simulation as ab_simulation  # noqa: E402
+from playbook import srm as ab_srm  # noqa: E402
+from playbook import stats as ab_stats  # noqa: E402
+from playbook import triggered as ab_triggered  # noqa: E402
+
+APP_PATH = ROOT / "mrkt_sci_ab_v2.py"
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+SIZES = (1, 1_000, 1_000_000)
+
+
+def _size_label(size):
+    return f"{size:.0e}".replace("+0", "").replace("+", "") if size >= 1000 else str(size)
+
+
+def kernel_cases():
+    """(name, callable) pairs for the vectorized statistics"""
+    rng = np.random.default_rng(42)
+    cases = []
+    for size in SIZES:
+        label = _size_label(size)
+        baseline = rng.uniform(1, 20, size)
+        mde = rng.uniform(5, 30, size)
+        control_n = rng.integers(5_000, 50_000, size)
+        treatment_n = control_n + rng.integers(-200, 200, size)
+        control_x = (control_n * rng.uniform(0.02, 0.08, size)).astype(int)
+        treatment_x = (treatment_n * rng.uniform(0.02, 0.08, size)).astype(int)
+
+        cases += [
+            (f"kernel/sample_size[n={label}]",
+             lambda b=baseline, m=mde: ab_stats.sample_size_per_group(b, m, 0.05, 0.8)),
+            (f"kernel/srm_chi2[n={label}]",
+             lambda c=control_n, t=treatment_n: ab_stats.srm_test(c, t, 50)),
+            (f"kernel/ztest_ci[n={label}]",
+             lambda cn=control_n, cx=control_x, tn=treatment_n, tx=treatment_x:
+                ab_stats.two_proportion_ztest(cn, cx, tn, tx)),
+        ]
+
+    # A batch mixing all four metric families (rates, means, Poisson and NB counts)
+    size = 1_000_000
+    distribution = rng.choice(np.array(ab_stats.DISTRIBUTIONS), size)
+    cases.append((
+        "kernel/metric_sample_size[n=1e6,mixed]",
+        lambda d=distribution, b=rng.uniform(1, 20, size), m=rng.uniform(5, 30, size), sd=rng.uniform(1, 40, size):
+            ab_stats.metric_sample_size(b, m, 0.05, 0.8, 50, d, sd, 0.5),
+    ))
+
+    # Fixed budgets: detectable MDE and required alpha for a 1M-row scenario table
+    budget = ab_stats.metric_sample_size(rng.uniform(1, 20, size), rng.uniform(5, 30, size)) * rng.uniform(0.5, 2, size)
+    cases += [
+        ("kernel/solve_mde[n=1e6]",
+         lambda b=rng.uniform(1, 20, size), n=budget: ab_inverse.solve_mde(b, n, 0.05, 0.8, 50)),
+        ("kernel/solve_alpha[n=1e6]",
+         lambda b=rng.uniform(1, 20, size), m=rng.uniform(5, 30, size), n=budget: ab_inverse.solve_alpha(b, m, n, 0.8, 50)),
+    ]
+
+    # Six months of hourly assignment counts, two and four arms
+    for arms in (2, 4):
+        counts = rng.poisson(500, (24 * 182, arms))
+        cases.append((
+            f"kernel/srm_monitor[hours=4368,arms={arms}]",
+            lambda c=counts: ab_srm.srm_monitor(c),
+        ))
+
+    for draws in (100_000, 1_000_000):
+        cases.append((
+            f"kernel/impact_simulation[draws={_size_label(draws)}]",
+            lambda d=draws: ab_simulation.summarize_simulation(ab_simulation.simulate_business_impact(
+                0.05, 0.005, 0.0032, 100_000, 50.0, draws=d, seed=1)),
+        ))
+
+    # Full split grid (5-95% in 0.1% steps) with every cost term switched on
+    cases.append((
+        "kernel/split_optimizer[grid=901]",
+        lambda: ab_allocation.optimal_split(ab_allocation.split_costs(
+            5.0, 10.0, daily_traffic=10_000, treatment_cost=0.5, value_per_conversion=50.0, cost_per_day=250.0)),
+    ))
+
+    # All three design trade-off families (power vs n, MDE vs duration, power vs MDE)
+    cases.append((
+        f"kernel/design_curves[points={ab_curves.DEFAULT_POINTS}]",
+        lambda: ab_curves.design_curves(5.0, 10.0, 0.05, 0.80, 50, 10_000),
+    ))
+
+    # Two layers, three experiments, counts only (no output file)
+    ids = np.array([f"user_{i:09d}" for i in range(1_000_000)], dtype=object)
+    assigner = ab_assignment.Assigner([
+        {'name': "hero", 'layer': "home", 'traffic_share': 40},
+        {'name': "cta", 'layer': "home", 'traffic_share': 60, 'arms': {'a': 1, 'b': 1, 'c': 2}},
+        {'name': "price", 'layer': "checkout", 'traffic_share': 50, 'split': 20},
+    ], salt="bench")
+    cases.append((
+        "kernel/assignment[ids=1e6,layers=2]",
+        lambda: assigner.assign_frames(ids, collect=False),
+    ))
+
+    # 1,000 A/A re-randomizations of 100k users, 0/1 and continuous metrics
+    conversions = (rng.random(100_000) < 0.05).astype(float)
+    revenue = rng.lognormal(3, 1, 100_000)
+    for test, values in (("ztest", conversions), ("welch", revenue), ("mann_whitney", revenue)):
+        cases.append((
+            f"kernel/aa_simulation[users=1e5,reps=1e3,{test}]",
+            lambda t=test, v=values: ab_aa.simulate_aa(v, t, 1_000, seed=1),
+        ))
+
+    # Sufficient statistics of one 1M-user chunk, then the delta-method test
+    ratio_frame = pd.DataFrame({
+        'variant': np.where(rng.random(1_000_000) < 0.5, "control", "treatment"),
+        'opens': rng.poisson(3, 1_000_000),
+    })
+    ratio_frame['clicks'] = rng.binomial(ratio_frame['opens'], 0.15)
+    cases.append((
+        "kernel/delta_method[users=1e6]",
+        lambda: ab_ratio.delta_method_ztest(
+            *ab_ratio.summarize_ratio(ratio_frame, "clicks", "opens", "variant").values()),
+    ))
+
+    # Sketch one 1M-value partition; merge 30 stored daily sketches and read p50/p90/p99
+    skewed = rng.lognormal(3, 1, 1_000_000)
+    daily = [ab_quantiles.TDigest().update(rng.lognormal(3, 1, 10_000)) for _ in range(30)]
+    cases.append((
+        "kernel/tdigest_update[values=1e6]",
+        lambda: ab_quantiles.TDigest().update(skewed),
+    ))
+
+    def merge_daily():
+        merged = {}
+        for digest in daily:
+            ab_quantiles.merge_sketches(merged, {'treatment': digest})
+        return merged['treatment'].quantile(ab_quantiles.DEFAULT_QUANTILES)
+
+    cases.append(("kernel/tdigest_merge[days=30]", merge_daily))
+
+    # Data-quality scan of a 1M-row exposure log (CSV parse, hash partitioning and grouping)
+    exposures = pd.DataFrame({
+        'user_id': rng.integers(0, 300_000, 1_000_000),
+        'variant': np.where(rng.random(1_000_000) < 0.5, "control", "treatment"),
+        'timestamp': 1_767_225_600 + rng.integers(0, 14 * 86_400, 1_000_000),
+    }).to_csv(index=False).encode()
+    cases.append((
+        "kernel/exposure_quality[rows=1e6]",
+        lambda: ab_quality.scan_exposures(io.BytesIO(exposures)),
+    ))
+
+    # First-exposure reduction of a 1M-row event log with repeat exposures and pre-exposure conversions
+    events = pd.DataFrame({
+        'user_id': rng.integers(0, 300_000, 1_000_000),
+        'event': rng.choice(["exposure", "purchase", "page_view"], 1_000_000, p=[0.3, 0.05, 0.65]),
+        'variant': np.where(rng.random(1_000_000) < 0.5, "control", "treatment"),
+        'timestamp': 1_767_225_600 + rng.integers(0, 14 * 86_400, 1_000_000),
+    }).to_csv(index=False).encode()
+    cases.append((
+        "kernel/first_exposures[rows=1e6]",
+        lambda: ab_triggered.triggered_analysis(io.BytesIO(events)),
+    ))
+
+    # About ten years of per-minute counts down to a browser-sized series
+    minutes = rng.poisson(50, 5_000_000).astype(float)
+    cases.append((
+        "kernel/minmax_downsample[points=5e6]",
+        lambda: ab_downsample.minmax_indices(minutes),
+    ))
+
+    for points in (1_000, 100_000):
+        cases.append((
+            f"kernel/sampling_curves[points={_size_label(points)}]",
+            lambda p=points: ab_stats.sampling_distribution_curves(31_234, [0.05, 0.055], p),
+        ))
+    return cases
+
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(str(APP_PATH), default_timeout=120)
+
+
+def _prepared_session(phase):
+    """An AppTest session showing ``phase`` with upstream phases completed"""
+    at = _app_test()
+    at.run()
+    if phase >= 2:
+        at.session_state.current_tab = 2
+        at.run()
+        next(box for box in at.selectbox if "Marketing Channel" in box.label).set_value("E-commerce").run()
+        next(button for button in at.button if "Calculate Sample Size" in button.label).click().run()
+    if phase >= 4:
+        at.session_state.current_tab = 4
+        at.run()
+        next(button for button in at.button if "Analyze Results" in button.label).click().run()
+    at.session_state.current_tab = phase
+    at.run()
+    if at.exception:
+        raise RuntimeError(f"Phase {phase} failed to render: {at.exception}")
+    return at
+
+
+PHASES = ("objective", "metrics", "design", "implementation", "analysis", "decision")
+
+_sessions = {}
+
+
+def _rerun_phase(phase):
+    at = _sessions.get(phase)
+    if at is None:
+        at = _sessions[phase] = _prepared_session(phase)
+    at.run()
+
+
+def _large_id_logs():
+    """Exposure and event logs of 200 distinct users with ids above 2**53 (one id missing)"""
+    ids = pd.array(1_234_567_890_123_456_789 + np.arange(200), dtype="Int64")
+    variants = np.where(np.arange(200) % 2, "treatment", "control")
+    exposures = pd.DataFrame({'user_id': ids, 'variant': variants, 'timestamp': 1_767_225_600 + np.arange(200)})
+    exposures.loc[5, 'user_id'] = pd.NA
+    events = pd.DataFrame({'user_id': ids.repeat(2), 'event': ["exposure", "purchase"] * 200,
+                           'variant': variants.repeat(2), 'timestamp': np.tile([1, 2], 200)})
+    return exposures.to_csv(index=False).encode(), events.to_csv(index=False).encode()
+
+
+def check_large_user_ids():
+    """Distinct 19-digit ids must stay distinct users in the quality scan and the triggered analysis"""
+    exposures, events = _large_id_logs()
+    scan = ab_quality.scan_exposures(io.BytesIO(exposures), chunksize=50)
+    if scan['users'] != 200 or scan['mixed_users'] or scan['duplicate_rows']:
+        return (f"quality scan: {scan['users']} users, {scan['mixed_users']} in both arms, "
+                f"{scan['duplicate_rows']} duplicates (expected 200, 0, 0)")
+    report = ab_triggered.triggered_analysis(io.BytesIO(events), chunksize=50)
+    result = report['experiments']['experiment']
+    converters = {name: stats['x'] for name, stats in result['variants'].items()}
+    if result['triggered_users'] != 200 or converters != {'control': 100, 'treatment': 100}:
+        return (f"triggered analysis: {result['triggered_users']} users, converters {converters} "
+                "(expected 200 users, 100 per arm)")
+    return None
+
+
+def check_cases():
+    """(name, callable) pairs returning None when the result is right, else the problem"""
+    return [("check/large_user_ids", check_large_user_ids)]
+
+
+def render_cases():
+    return [
+        (f"render/{phase + 1}_{name}", lambda phase=phase: _rerun_phase(phase))
+        for phase, name in enumerate(PHASES)
+    ]
+
+
+def measure(func, repeats=7, min_time=0.05):
+    """Median seconds per call, calibrating loops so each repeat runs >= ``min_time``"""
+    func()  # warm-up (imports, caches, session preparation)
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or loops >= 10_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - started) / loops)
+    return statistics.median(samples)
+
+
+def _format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the A/B playbook benchmark suite")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this text")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args(argv)
+
+    # Keep headless renders away from the real registry and quiet about bare mode
+    os.environ.setdefault("AB_REGISTRY_PATH", str(Path(tempfile.mkdtemp()) / "bench_registry.db"))
+    logging.disable(logging.WARNING)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+
+    failures = []
+    for name, check in check_cases():
+        if args.filter in name:
+            problem = check()
+            print(f"{name:42} {'FAILED: ' + problem if problem else 'ok'}")
+            if problem:
+                failures.append(name)
+    if failures:
+        print(f"\n{len(failures)} check(s) failed: {', '.join(failures)}")
+        return 1
+
+    results, regressions = {}, []
+    print(f"{'case':42} {'median':>11} {'baseline':>11} {'change':>8}")
+    for name, func in kernel_cases() + render_cases():
+        if args.filter not in name:
+            continue
+        seconds = results[name] = measure(func, repeats=args.repeats)
+        reference = baseline.get(name)
+        if reference:
+            change = seconds / reference - 1
+            flag = "  REGRESSION" if change > args.threshold else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:42} {_format_time(seconds)} {_format_time(reference)} {change:+7.1%}{flag}")
+        else:
+            print(f"{name:42} {_format_time(seconds)} {'—':>11}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        baseline_path.write_text(json.dumps(dict(sorted(baseline.items())), indent=2) + "\n")
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Streamlit-free building blocks behind the A/B Testing Playbook app.
+
+Everything in this package can be imported from batch jobs, services and
+scripts without starting a Streamlit session.
+"""
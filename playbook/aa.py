@@ -0,0 +1,191 @@
+"""A/A simulation: re-randomize historical per-user data into two fake arms.
+
+With no real treatment, a valid test rejects at rate alpha and its p-values
+are Uniform(0, 1). Each replication draws a fresh random assignment for every
+user (independently, like the hash-based assignment engine) and runs the
+chosen test on the two arms. A batch of replications is one ``(batch, users)``
+0/1 mask matrix, and the per-arm sums every test needs (counts, sums, sums of
+squares or rank sums) come out of a single matrix product, so no Python loop
+runs per replication. Batches can be spread over a process pool.
+
+Tests:
+
+* ``ztest``         pooled two-proportion z-test (0/1 metrics), as in Phase 5
+* ``welch``         Welch's t-test (continuous metrics)
+* ``mann_whitney``  Mann-Whitney U, normal approximation with tie correction
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+from .stats import two_proportion_ztest
+
+TESTS = ("ztest", "welch", "mann_whitney")
+DEFAULT_REPLICATIONS = 10_000
+HISTOGRAM_BINS = 20
+# Mask elements per batch (float64 product input: ~64 MiB)
+BATCH_ELEMENTS = 2**23
+# Replications per process-pool task
+SHARD_REPLICATIONS = 1_000
+METRIC_COLUMNS = ("converted", "conversion", "outcome", "value", "revenue", "metric")
+
+
+def load_metric_data(source, column=None):
+    """Per-user metric values from a CSV as ``(values, column)``
+
+    Without ``column`` the first of ``METRIC_COLUMNS`` present is used, else
+    the first numeric column. Rows with a missing metric are dropped.
+    """
+    frame = pd.read_csv(source)
+    if column is None:
+        lowered = {str(name).strip().lower(): name for name in frame.columns}
+        column = next((lowered[name] for name in METRIC_COLUMNS if name in lowered), None)
+        if column is None:
+            numeric = frame.select_dtypes("number").columns
+            if not len(numeric):
+                raise ValueError("No numeric metric column found")
+            column = numeric[0]
+    elif column not in frame.columns:
+        raise ValueError(f"Column {column!r} not found")
+    values = pd.to_numeric(frame[column], errors="coerce").dropna().to_numpy(dtype=float)
+    if len(values) < 4:
+        raise ValueError("Need at least 4 users with a metric value")
+    return values, column
+
+
+def is_binary(values):
+    return bool(np.isin(values, (0.0, 1.0)).all())
+
+
+def default_test(values):
+    return "ztest" if is_binary(values) else "welch"
+
+
+def _columns(values, test):
+    """Per-user columns whose per-arm sums the test needs, and the constants"""
+    if test == "mann_whitney":
+        ranks = stats.rankdata(values)
+        _, ties = np.unique(values, return_counts=True)
+        return ranks[:, None], {'tie_term': float((ties ** 3 - ties).sum())}
+    # Centre before squaring so sums of squares keep their precision
+    centred = values - values.mean()
+    return np.column_stack([centred, centred ** 2]), {}
+
+
+def _p_values(test, n1, sums, totals, n, constants):
+    """p-values of every replication from arm-1 sums and the pooled totals"""
+    n0 = n - n1
+    if test == "mann_whitney":
+        rank_sum = sums[:, 0]
+        u_stat = rank_sum - n1 * (n1 + 1) / 2
+        variance = n1 * n0 / 12 * ((n + 1) - constants['tie_term'] / (n * (n - 1)))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_stat = (u_stat - n1 * n0 / 2) / np.sqrt(variance)
+        return np.where(variance > 0, 2 * special.ndtr(-np.abs(z_stat)), 1.0)
+
+    sum1, sq1 = sums[:, 0], sums[:, 1]
+    sum0, sq0 = totals[0] - sum1, totals[1] - sq1
+    if test == "ztest":
+        # Centred sums shift each arm by the same mean; undo it to get conversions
+        shift = constants['mean']
+        return two_proportion_ztest(n0, sum0 + shift * n0, n1, sum1 + shift * n1)['p_value']
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean1, mean0 = sum1 / n1, sum0 / n0
+        var1 = (sq1 - n1 * mean1 ** 2) / (n1 - 1)
+        var0 = (sq0 - n0 * mean0 ** 2) / (n0 - 1)
+        se2_1, se2_0 = var1 / n1, var0 / n0
+        t_stat = (mean1 - mean0) / np.sqrt(se2_1 + se2_0)
+        df = (se2_1 + se2_0) ** 2 / (se2_1 ** 2 / (n1 - 1) + se2_0 ** 2 / (n0 - 1))
+        p_value = 2 * special.stdtr(df, -np.abs(t_stat))
+    return np.where(np.isfinite(p_value), p_value, 1.0)
+
+
+def _random_mask(rng, size, n, threshold):
+    """``(size, n)`` 0/1 assignments with P(1) = threshold / 65536"""
+    if threshold == 32768:
+        # Fair coin flips: every random byte yields eight assignments
+        return np.unpackbits(rng.integers(0, 256, (size, (n + 7) // 8), dtype=np.uint8), axis=1, count=n)
+    # 16-bit uniforms: 1/65536 split resolution at a quarter of the cost of float64 draws
+    return rng.integers(0, 65536, (size, n), dtype=np.uint16) < threshold
+
+
+def _simulate_batch(values, test, replications, share, seed):
+    """p-values of ``replications`` re-randomizations (one mask-matrix product)"""
+    rng = np.random.default_rng(seed)
+    columns, constants = _columns(values, test)
+    constants['mean'] = float(values.mean())
+    n = len(values)
+    totals = columns.sum(axis=0)
+    threshold = int(round(share * 65536))
+
+    # A ones column makes the arm size come out of the same product
+    columns = np.column_stack([columns, np.ones(n)])
+    p_values = []
+    batch = max(1, BATCH_ELEMENTS // n)
+    for start in range(0, replications, batch):
+        size = min(batch, replications - start)
+        sums = _random_mask(rng, size, n, threshold).astype(np.float64) @ columns
+        p_values.append(_p_values(test, sums[:, -1], sums[:, :-1], totals, float(n), constants))
+    return np.concatenate(p_values)
+
+
+def simulate_aa(values, test=None, replications=DEFAULT_REPLICATIONS, split=50, seed=None, workers=1):
+    """p-values of ``replications`` A/A re-randomizations of ``values``
+
+    ``split`` is the percent of users in the second arm. With ``workers > 1``
+    replications are sharded across processes; results depend only on
+    ``seed``, not on the number of workers.
+    """
+    values = np.asarray(values, dtype=float)
+    test = test or default_test(values)
+    if not 0 < split < 100:
+        raise ValueError("split must leave users in both arms (strictly between 0 and 100)")
+    if test not in TESTS:
+        raise ValueError(f"test must be one of: {', '.join(TESTS)}")
+    if test == "ztest" and not is_binary(values):
+        raise ValueError("The z-test needs a 0/1 metric; use welch or mann_whitney")
+
+    # Fixed-size shards with their own seeds keep results independent of ``workers``
+    sizes = [min(SHARD_REPLICATIONS, replications - start) for start in range(0, replications, SHARD_REPLICATIONS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    share = split / 100
+    if workers <= 1 or len(sizes) == 1:
+        return np.concatenate([_simulate_batch(values, test, size, share, child) for size, child in zip(sizes, seeds)])
+    with ProcessPoolExecutor(max_workers=min(int(workers), len(sizes))) as pool:
+        parts = pool.map(_simulate_batch, [values] * len(sizes), [test] * len(sizes), sizes,
+                         [share] * len(sizes), seeds)
+        return np.concatenate(list(parts))
+
+
+def summarize_aa(p_values, alpha=0.05, bins=HISTOGRAM_BINS, ks_alpha=0.001):
+    """False-positive rate, p-value uniformity (KS) and a pre-binned histogram
+
+    ``fpr_ci`` is the 95% Wilson interval of the observed rate. ``passed``
+    requires that rate to be within 3 binomial standard errors of ``alpha``
+    (the rate expected under a valid test) and the KS test against
+    Uniform(0, 1) not to reject at ``ks_alpha``.
+    """
+    p_values = np.asarray(p_values, dtype=float)
+    replications = len(p_values)
+    false_positive_rate = float((p_values < alpha).mean())
+    standard_error = np.sqrt(alpha * (1 - alpha) / replications)
+    z = 1.96
+    shrink = 1 + z ** 2 / replications
+    centre = (false_positive_rate + z ** 2 / (2 * replications)) / shrink
+    half_width = z * np.sqrt(false_positive_rate * (1 - false_positive_rate) / replications
+                             + z ** 2 / (4 * replications ** 2)) / shrink
+    ks = stats.kstest(p_values, "uniform")
+    counts, edges = np.histogram(p_values, bins=bins, range=(0, 1))
+    return {
+        'replications': replications,
+        'alpha': alpha,
+        'false_positive_rate': false_positive_rate,
+        'fpr_ci': (float(max(0.0, centre - half_width)), float(min(1.0, centre + half_width))),
+        'ks_statistic': float(ks.statistic),
+        'ks_p_value': float(ks.pvalue),
+        'histogram': (edges, counts),
+        'passed': bool(abs(false_positive_rate - alpha) <= 3 * standard_error and ks.pvalue >= ks_alpha),
+    }
@@ -0,0 +1,82 @@
+"""Cost-optimal traffic split between control and treatment.
+
+A 50/50 split minimises the total sample, but it is not always the cheapest
+design: exposing a user to the treatment may cost more (a discount, a paid
+placement), and every treatment user risks seeing a worse experience. For a
+grid of treatment shares the exact unequal-allocation sample size
+(:func:`playbook.stats.metric_sample_size`) gives the users per arm and the
+duration; the expected cost adds
+
+* exposure cost: users per arm times the cost per exposed user of that arm
+* risk cost: treatment users times P(treatment is worse) times the expected
+  conversions (metric units) lost per user times the value of one
+* delay cost: days running times a cost per day (opportunity cost)
+
+The whole grid is evaluated in one vectorized pass.
+"""
+import numpy as np
+import pandas as pd
+
+from .stats import metric_sample_size
+
+# Treatment shares (percent) the optimizer considers; matches the design slider range
+SPLIT_GRID = np.round(np.arange(5.0, 95.0 + 1e-9, 0.1), 1)
+OBJECTIVES = ("cost", "duration")
+
+
+def split_costs(baseline, mde, alpha=0.05, power=0.80, daily_traffic=10_000, control_cost=0.0,
+                treatment_cost=0.0, value_per_conversion=0.0, p_worse=0.5, downside=None,
+                cost_per_day=0.0, splits=SPLIT_GRID, **metric):
+    """Sample size, duration and expected cost for every treatment share in ``splits``
+
+    ``baseline``, ``mde`` and ``downside`` are percentages (``downside`` is the
+    relative drop in conversion if the treatment is worse, defaulting to the
+    MDE); costs are per exposed user, ``cost_per_day`` per day of testing.
+    ``metric`` holds the metric-family keywords of
+    :func:`playbook.stats.metric_sample_size` (binomial by default).
+    """
+    splits = np.asarray(splits, dtype=float)
+    downside = mde if downside is None else downside
+    total = metric_sample_size(baseline, mde, alpha, power, splits, **metric)
+    treatment_n = np.ceil(total * splits / 100)
+    control_n = np.ceil(total * (1 - splits / 100))
+    days = (control_n + treatment_n) / daily_traffic
+
+    mean = baseline / 100 if metric.get('distribution', "binomial") == "binomial" else baseline
+    loss_per_user = p_worse * mean * (downside / 100) * value_per_conversion
+    exposure_cost = control_n * control_cost + treatment_n * treatment_cost
+    risk_cost = treatment_n * loss_per_user
+    delay_cost = days * cost_per_day
+    counts = np.stack([control_n, treatment_n, control_n + treatment_n])
+    if np.isfinite(counts).all():
+        # Invalid designs (target rate above 100%) keep their NaN counts
+        counts = counts.astype(int)
+    return pd.DataFrame({
+        'split': splits,
+        'control_n': counts[0],
+        'treatment_n': counts[1],
+        'total_sample_size': counts[2],
+        'duration_days': days,
+        'exposure_cost': exposure_cost,
+        'risk_cost': risk_cost,
+        'delay_cost': delay_cost,
+        'expected_cost': exposure_cost + risk_cost + delay_cost,
+    })
+
+
+def optimal_split(costs, objective="cost"):
+    """Row of :func:`split_costs` minimising the objective, as a dict
+
+    Ties (e.g. no costs at all) go to the share closest to 50/50.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of: {', '.join(OBJECTIVES)}")
+    column = 'expected_cost' if objective == "cost" else 'duration_days'
+    values = costs[column].to_numpy()
+    candidates = np.flatnonzero(np.isclose(values, values.min(), rtol=1e-9, atol=1e-9))
+    best = candidates[np.abs(costs['split'].to_numpy()[candidates] - 50).argmin()]
+    row = costs.iloc[best].to_dict()
+    baseline_row = costs.iloc[np.abs(costs['split'].to_numpy() - 50).argmin()]
+    row['savings_vs_equal'] = float(baseline_row[column] - row[column])
+    row['objective'] = objective
+    return row
@@ -0,0 +1,300 @@
+"""Deterministic hash-based bulk assignment of IDs to experiment arms.
+
+Every ID is hashed with a salt (SipHash via :func:`pandas.util.hash_array`)
+into one of ``buckets`` buckets, so the same ID, salt and configuration always
+land in the same arm without storing anything. Experiments live in *layers*:
+
+* within a layer experiments are mutually exclusive, each owning a contiguous
+  bucket range sized by its ``traffic_share`` (percent of the layer)
+* different layers use different salts, so they are orthogonal
+* inside an experiment the arm comes from the higher bits of the same 64-bit
+  hash (``hash // buckets``), which are independent of the layer bucket, so
+  each layer costs a single hash pass
+
+ID files are streamed in chunks (pyarrow's CSV reader when installed, pandas
+otherwise) and hashed as whole arrays, several million IDs per second. Running
+totals per arm and per layer bucket feed the same chi-square goodness-of-fit
+test as the SRM monitor, so a bad configuration or a skewed hash shows up as a
+mismatch right after the run.
+"""
+import csv
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from .srm import chi2_rows
+from .stats import chi2_sf
+
+DEFAULT_BUCKETS = 10_000
+DEFAULT_CHUNKSIZE = 1_000_000
+DEFAULT_ALPHA = 0.001
+ID_COLUMNS = ("id", "user_id", "session_id", "account_id", "visitor_id")
+OUTPUT_COLUMNS = ["id", "layer", "experiment", "arm"]
+
+
+def salt_key(*parts):
+    """16-character hash key for :func:`pandas.util.hash_array` from salt parts"""
+    text = "\x1f".join(str(part) for part in parts)
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+def hash_buckets(ids, key, buckets=DEFAULT_BUCKETS):
+    """``(bucket, arm_bucket)`` in ``[0, buckets)`` of every ID; IDs are hashed as strings"""
+    values = np.asarray(ids, dtype=object)
+    hashed = pd.util.hash_array(values, hash_key=key, categorize=False)
+    buckets = np.uint64(buckets)
+    return (hashed % buckets).astype(np.int64), (hashed // buckets % buckets).astype(np.int64)
+
+
+def prepare_experiments(experiments, buckets=DEFAULT_BUCKETS):
+    """Validate experiment configs and lay them out as bucket ranges per layer
+
+    Each config needs a ``name`` and may set ``layer`` ("default"),
+    ``traffic_share`` (percent of the layer, 100) and either ``arms`` (name to
+    weight) or ``split`` (treatment percent, 50). Returns ``{layer: [spec]}``.
+    """
+    layers = {}
+    for config in experiments:
+        name = str(config.get('name') or "").strip()
+        if not name:
+            raise ValueError("Every experiment needs a name")
+        arms = config.get('arms')
+        if not arms:
+            split = float(config.get('split', 50) or 50)
+            arms = {'control': 100 - split, 'treatment': split}
+        weights = np.asarray(list(arms.values()), dtype=float)
+        if len(weights) < 2 or (weights <= 0).any():
+            raise ValueError(f"Experiment {name!r} needs at least two arms with positive weights")
+        share = float(config.get('traffic_share', 100) or 100)
+        if not 0 < share <= 100:
+            raise ValueError(f"Experiment {name!r}: traffic_share must be in (0, 100]")
+
+        layer = str(config.get('layer') or "default")
+        specs = layers.setdefault(layer, [])
+        start = specs[-1]['bucket_end'] if specs else 0
+        end = start + int(round(share / 100 * buckets))
+        if end > buckets:
+            raise ValueError(f"Layer {layer!r} is over-allocated: traffic shares add up to more than 100%")
+        specs.append({
+            'name': name,
+            'layer': layer,
+            'traffic_share': share,
+            'bucket_start': start,
+            'bucket_end': end,
+            'arms': list(arms),
+            'weights': weights / weights.sum(),
+            # Arm i owns arm buckets [edges[i - 1], edges[i])
+            'arm_edges': np.round(np.cumsum(weights / weights.sum()) * buckets).astype(np.int64),
+        })
+    return layers
+
+
+class Assigner:
+    """Salted bucketing of ID arrays with running arm and bucket counts"""
+
+    def __init__(self, experiments, salt="", buckets=DEFAULT_BUCKETS):
+        self.salt = str(salt)
+        self.buckets = int(buckets)
+        self.layers = prepare_experiments(experiments, self.buckets)
+        self.ids_seen = 0
+        self.bucket_counts = {layer: np.zeros(self.buckets, dtype=np.int64) for layer in self.layers}
+        self.arm_counts = {
+            (spec['layer'], spec['name']): np.zeros(len(spec['arms']), dtype=np.int64)
+            for specs in self.layers.values() for spec in specs
+        }
+
+    def assign(self, ids):
+        """Long-format assignments (id, layer, experiment, arm) for one chunk of IDs
+
+        IDs outside every experiment's traffic in a layer get no row for it.
+        """
+        frames = self.assign_frames(ids)
+        if not frames:
+            return pd.DataFrame(columns=OUTPUT_COLUMNS)
+        return pd.concat([frame.astype(str) for frame in frames], ignore_index=True)
+
+    def assign_frames(self, ids, collect=True):
+        """Assignments of one chunk as one frame per experiment (categorical columns)
+
+        With ``collect=False`` only the running counts are updated.
+        """
+        ids = np.asarray(ids, dtype=object)
+        self.ids_seen += len(ids)
+        frames = []
+        for layer, specs in self.layers.items():
+            layer_bucket, arm_bucket = hash_buckets(ids, salt_key(self.salt, layer), self.buckets)
+            self.bucket_counts[layer] += np.bincount(layer_bucket, minlength=self.buckets)
+            for spec in specs:
+                selected = np.flatnonzero((layer_bucket >= spec['bucket_start']) & (layer_bucket < spec['bucket_end']))
+                if not len(selected):
+                    continue
+                arm = np.searchsorted(spec['arm_edges'], arm_bucket[selected], side="right")
+                self.arm_counts[(layer, spec['name'])] += np.bincount(arm, minlength=len(spec['arms']))
+                if collect:
+                    constant = np.zeros(len(selected), dtype=np.int8)
+                    frames.append(pd.DataFrame({
+                        'id': pd.Series(ids[selected], dtype=object),
+                        'layer': pd.Categorical.from_codes(constant, [layer]),
+                        'experiment': pd.Categorical.from_codes(constant, [spec['name']]),
+                        'arm': pd.Categorical.from_codes(arm, spec['arms']),
+                    }))
+        return frames
+
+    def uniformity(self, alpha=DEFAULT_ALPHA):
+        """Chi-square checks of the running counts, one row per check
+
+        ``arms`` rows test each experiment's arm counts against its weights
+        (the SRM test); ``buckets`` rows test that a layer's hash buckets are
+        uniform. Bucket checks need roughly 5+ IDs per bucket to be reliable.
+        """
+        rows = []
+        for (layer, name), counts in self.arm_counts.items():
+            spec = next(spec for spec in self.layers[layer] if spec['name'] == name)
+            rows.append(self._check("arms", layer, name, counts, spec['weights'], alpha))
+        for layer, counts in self.bucket_counts.items():
+            rows.append(self._check("buckets", layer, None, counts, np.full(self.buckets, 1 / self.buckets), alpha))
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _check(check, layer, experiment, counts, shares, alpha):
+        chi2_stat = chi2_rows(counts[None, :].astype(float), shares)[0]
+        p_value = float(chi2_sf(chi2_stat, len(shares) - 1))
+        return {
+            'check': check,
+            'layer': layer,
+            'experiment': experiment,
+            'n': int(counts.sum()),
+            'chi2': float(chi2_stat),
+            'df': len(shares) - 1,
+            'p_value': p_value,
+            'passed': bool(np.isnan(p_value) or p_value >= alpha),
+        }
+
+
+class _AssignmentWriter:
+    """CSV sink for assignment chunks: pyarrow's writer when installed, pandas otherwise
+
+    ``output`` is a path or a binary file object (left open).
+    """
+
+    def __init__(self, output):
+        self._owned = isinstance(output, str) or hasattr(output, "__fspath__")
+        self._handle = open(output, "wb") if self._owned else output
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            frame.astype(str).to_csv(self._handle, index=False, header=self._header)
+            self._header = False
+            return
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        # Categorical chunks arrive as dictionary columns; write plain strings throughout
+        table = table.cast(pa.schema([(name, pa.string()) for name in table.column_names]))
+        if self._writer is None:
+            self._writer = pa_csv.CSVWriter(self._handle, table.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._owned:
+            self._handle.close()
+
+
+def _header(source):
+    """Column names from the first line of a CSV path or seekable file object"""
+    if hasattr(source, "readline"):
+        line = source.readline()
+        source.seek(0)
+    else:
+        with open(source, "rb") as handle:
+            line = handle.readline()
+    if isinstance(line, bytes):
+        line = line.decode("utf-8-sig")
+    return next(csv.reader([line.lstrip("\ufeff")]), [])
+
+
+def _id_column(columns, id_column):
+    if id_column:
+        if id_column not in columns:
+            raise ValueError(f"ID column {id_column!r} not found")
+        return id_column
+    if not columns:
+        raise ValueError("The ID file is empty")
+    lowered = {str(column).strip().lower(): column for column in columns}
+    return next((lowered[name] for name in ID_COLUMNS if name in lowered), columns[0])
+
+
+def read_id_chunks(source, id_column=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream the ID column of a CSV as object arrays of strings
+
+    IDs are always read as text, so ``007`` and ``7`` stay different IDs.
+    Uses pyarrow's multithreaded streaming reader when installed, otherwise
+    chunked :func:`pandas.read_csv`. Without a named column the first of
+    ``ID_COLUMNS`` present (or the first column) is used.
+    """
+    column = _id_column(_header(source), id_column)
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        for chunk in pd.read_csv(source, usecols=[column], dtype=str, chunksize=chunksize):
+            yield chunk[column].dropna().to_numpy(dtype=object)
+        return
+
+    reader = pa_csv.open_csv(
+        source,
+        # Blocks of roughly ``chunksize`` short ID lines
+        read_options=pa_csv.ReadOptions(block_size=max(2**20, chunksize * 16)),
+        convert_options=pa_csv.ConvertOptions(column_types={column: pa.string()}, include_columns=[column]),
+    )
+    for batch in reader:
+        yield batch.column(0).drop_null().to_numpy(zero_copy_only=False)
+
+
+def assign_file(source, experiments, output=None, salt="", id_column=None, buckets=DEFAULT_BUCKETS,
+                chunksize=DEFAULT_CHUNKSIZE, alpha=DEFAULT_ALPHA):
+    """Assign every ID in ``source`` and stream the assignments to ``output`` as CSV
+
+    ``source`` and ``output`` are paths or binary file objects; without ``output``
+    only the counts and checks are produced. Returns a summary dict with the
+    per-experiment arm counts, the uniformity table and the throughput.
+    """
+    assigner = Assigner(experiments, salt, buckets)
+    writer = _AssignmentWriter(output) if output is not None else None
+    started = time.perf_counter()
+    hashing = 0.0
+    try:
+        for ids in read_id_chunks(source, id_column, chunksize):
+            chunk_started = time.perf_counter()
+            frames = assigner.assign_frames(ids, collect=writer is not None)
+            hashing += time.perf_counter() - chunk_started
+            for frame in frames:
+                writer.write(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    elapsed = time.perf_counter() - started
+    checks = assigner.uniformity(alpha)
+    counts = pd.DataFrame([
+        {'layer': layer, 'experiment': name, 'arm': arm, 'n': int(n)}
+        for (layer, name), arm_counts in assigner.arm_counts.items()
+        for arm, n in zip(next(spec['arms'] for spec in assigner.layers[layer] if spec['name'] == name), arm_counts)
+    ])
+    return {
+        'ids': assigner.ids_seen,
+        'rows': int(counts['n'].sum()) if len(counts) else 0,
+        'seconds': elapsed,
+        'ids_per_second': assigner.ids_seen / hashing if hashing else float("nan"),
+        'counts': counts,
+        'checks': checks,
+        'passed': bool(checks['passed'].all()) if len(checks) else True,
+    }
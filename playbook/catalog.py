@@ -0,0 +1,663 @@
+"""Static catalog of marketing metrics, distributions and statistical tests.
+
+The metric dictionary drives the metric picker and the sample-size defaults of
+the design phase; each entry records its distribution, typical range, where
+to get a baseline and an industry source. Plain data, imported only by the
+phases that use it.
+"""
+import re
+
+# Enhanced Marketing Metrics Dictionary (keeping your original data structure)
+MARKETING_METRICS = {
+    "Email Marketing": [
+        {
+            "name": "Open Rate",
+            "description": "Percentage of recipients who opened the email",
+            "formula": "Opens / Delivered Emails",
+            "lifecycle": "Awareness",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "15-25%",
+            "where_to_get_baseline": "ESP dashboard (Mailchimp, Klaviyo), Industry benchmarks (Mailchimp, Campaign Monitor reports)",
+            "sample_size_consideration": "Low variance, medium sample needed",
+            "industry_source": "Mailchimp Email Marketing Benchmarks 2024"
+        },
+        {
+            "name": "Click-Through Rate (CTR)",
+            "description": "Percentage of delivered emails that resulted in clicks",
+            "formula": "Unique Clicks / Delivered Emails",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "2-5%",
+            "where_to_get_baseline": "ESP analytics, Previous campaign data",
+            "sample_size_consideration": "Lower rate = larger sample needed",
+            "industry_source": "Campaign Monitor Email Marketing Benchmarks"
+        },
+        {
+            "name": "Click-to-Open Rate (CTOR)",
+            "description": "Percentage of email openers who clicked (measures content effectiveness)",
+            "formula": "Unique Clicks / Unique Opens",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "10-20%",
+            "where_to_get_baseline": "ESP dashboard, measures email content quality independent of subject line",
+            "sample_size_consideration": "Conditional on opens, moderate sample",
+            "industry_source": "Litmus State of Email Report"
+        },
+        {
+            "name": "Conversion Rate",
+            "description": "Percentage of recipients who completed desired action",
+            "formula": "Conversions / Delivered Emails",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.5-3%",
+            "where_to_get_baseline": "Google Analytics, CRM, Attribution platforms",
+            "sample_size_consideration": "Low rate = very large sample needed",
+            "industry_source": "eMarketer Email ROI Statistics"
+        },
+        {
+            "name": "Unsubscribe Rate",
+            "description": "Percentage of recipients who unsubscribed (guardrail metric)",
+            "formula": "Unsubscribes / Delivered Emails",
+            "lifecycle": "Retention",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test (guardrail)",
+            "typical_range": "0.1-0.5%",
+            "where_to_get_baseline": "ESP analytics, aim to stay below 0.5%",
+            "sample_size_consideration": "Rare event, needs large sample",
+            "industry_source": "CAN-SPAM compliance reports"
+        },
+        {
+            "name": "Revenue per Email (RPE)",
+            "description": "Average revenue generated per email sent",
+            "formula": "Total Revenue / Delivered Emails",
+            "lifecycle": "Conversion",
+            "distribution": "Log-normal / Gamma",
+            "test": "Mann-Whitney U or t-test with log transform",
+            "typical_range": "$0.10-$2.00",
+            "where_to_get_baseline": "E-commerce platform, Marketing attribution tools",
+            "sample_size_consideration": "High variance due to outliers",
+            "industry_source": "DMA Email ROI Report"
+        }
+    ],
+    "Paid Search (PPC)": [
+        {
+            "name": "Click-Through Rate (CTR)",
+            "description": "Percentage of ad impressions that resulted in clicks",
+            "formula": "Clicks / Impressions",
+            "lifecycle": "Awareness",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "2-5%",
+            "where_to_get_baseline": "Google Ads, Microsoft Ads dashboards",
+            "sample_size_consideration": "Depends on impression volume",
+            "industry_source": "WordStream PPC Benchmarks"
+        },
+        {
+            "name": "Conversion Rate",
+            "description": "Percentage of clicks that converted",
+            "formula": "Conversions / Clicks",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "2-10%",
+            "where_to_get_baseline": "Ad platform conversion tracking, Google Analytics",
+            "sample_size_consideration": "Critical metric, needs adequate power",
+            "industry_source": "Google Ads Industry Benchmarks"
+        },
+        {
+            "name": "Cost per Click (CPC)",
+            "description": "Average cost paid for each click",
+            "formula": "Total Spend / Total Clicks",
+            "lifecycle": "Awareness",
+            "distribution": "Normal or Gamma",
+            "test": "Two-sample t-test",
+            "typical_range": "$0.50-$5.00",
+            "where_to_get_baseline": "Historical ad account data, Google Keyword Planner",
+            "sample_size_consideration": "Moderate variance in most cases",
+            "industry_source": "SEMrush CPC Trends Report"
+        },
+        {
+            "name": "Cost per Acquisition (CPA)",
+            "description": "Average cost to acquire one customer",
+            "formula": "Total Spend / Conversions",
+            "lifecycle": "Conversion",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "$10-$200",
+            "where_to_get_baseline": "Ad platform reports, compare to Customer Lifetime Value",
+            "sample_size_consideration": "High variance, sensitive to outliers",
+            "industry_source": "Unbounce Conversion Benchmark Report"
+        },
+        {
+            "name": "Return on Ad Spend (ROAS)",
+            "description": "Revenue generated per dollar spent",
+            "formula": "Revenue / Ad Spend",
+            "lifecycle": "Conversion",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "2:1 to 10:1",
+            "where_to_get_baseline": "Marketing attribution platforms, Target 4:1 as minimum",
+            "sample_size_consideration": "Very high variance",
+            "industry_source": "Nielsen Digital Ad Ratings"
+        },
+        {
+            "name": "Quality Score",
+            "description": "Platform's rating of ad quality (1-10 scale)",
+            "formula": "Platform-calculated (Google/Bing)",
+            "lifecycle": "Awareness",
+            "distribution": "Discrete (1-10)",
+            "test": "Mann-Whitney U test",
+            "typical_range": "5-8",
+            "where_to_get_baseline": "Google Ads interface, aim for 7+",
+            "sample_size_consideration": "Ordinal data, use non-parametric",
+            "industry_source": "Google Quality Score Guidelines"
+        }
+    ],
+    "Display Advertising": [
+        {
+            "name": "Impressions",
+            "description": "Number of times ad was displayed",
+            "formula": "Count of ad displays",
+            "lifecycle": "Awareness",
+            "distribution": "Poisson (for counts)",
+            "test": "Poisson rate test or t-test",
+            "typical_range": "Varies widely",
+            "where_to_get_baseline": "DV360, Google Display Network, programmatic platforms",
+            "sample_size_consideration": "Usually have large volume",
+            "industry_source": "IAB Display Advertising Guidelines"
+        },
+        {
+            "name": "Click-Through Rate (CTR)",
+            "description": "Percentage of impressions that resulted in clicks",
+            "formula": "Clicks / Impressions",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.05-0.5%",
+            "where_to_get_baseline": "Ad server data, historical campaigns",
+            "sample_size_consideration": "Very low rate = huge sample needed",
+            "industry_source": "Google Display Benchmarks Report"
+        },
+        {
+            "name": "Viewability Rate",
+            "description": "Percentage of impressions that were viewable (MRC standard)",
+            "formula": "Viewable Impressions / Total Impressions",
+            "lifecycle": "Awareness",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "50-70%",
+            "where_to_get_baseline": "Ad verification tools (IAS, Moat, DoubleVerify)",
+            "sample_size_consideration": "High rate = moderate sample",
+            "industry_source": "MRC Viewability Standards"
+        },
+        {
+            "name": "View-Through Conversion Rate",
+            "description": "Conversions after viewing (not clicking) ad",
+            "formula": "View-Through Conversions / Impressions",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.01-0.1%",
+            "where_to_get_baseline": "Attribution platforms, campaign manager 360",
+            "sample_size_consideration": "Extremely rare event",
+            "industry_source": "Google Attribution Research"
+        }
+    ],
+    "Social Media Advertising": [
+        {
+            "name": "Engagement Rate",
+            "description": "Percentage of people who engaged with ad",
+            "formula": "(Likes + Comments + Shares) / Impressions",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial (simplified)",
+            "test": "Two-proportion z-test",
+            "typical_range": "1-5%",
+            "where_to_get_baseline": "Platform insights (Meta, LinkedIn, TikTok ads managers)",
+            "sample_size_consideration": "Platform-dependent variance",
+            "industry_source": "Hootsuite Social Media Benchmarks"
+        },
+        {
+            "name": "Click-Through Rate (CTR)",
+            "description": "Percentage of impressions that resulted in clicks",
+            "formula": "Clicks / Impressions",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.5-2%",
+            "where_to_get_baseline": "Historical campaign data from ads manager",
+            "sample_size_consideration": "Lower than search ads",
+            "industry_source": "Wordstream Facebook Ads Benchmarks"
+        },
+        {
+            "name": "Cost per Engagement (CPE)",
+            "description": "Average cost per engagement action",
+            "formula": "Total Spend / Total Engagements",
+            "lifecycle": "Consideration",
+            "distribution": "Gamma or Log-normal",
+            "test": "Mann-Whitney U or t-test",
+            "typical_range": "$0.05-$0.50",
+            "where_to_get_baseline": "Platform historical data, industry CPE reports",
+            "sample_size_consideration": "Moderate variance",
+            "industry_source": "Socialbakers Advertising Benchmarks"
+        },
+        {
+            "name": "Video Completion Rate (VCR)",
+            "description": "Percentage who watched video to completion",
+            "formula": "Completed Views / Total Views",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "15-40%",
+            "where_to_get_baseline": "Video ad reports from platform, varies by length",
+            "sample_size_consideration": "Length-dependent",
+            "industry_source": "Wistia Video Marketing Statistics"
+        },
+        {
+            "name": "Share Rate",
+            "description": "Percentage of viewers who shared content",
+            "formula": "Shares / Impressions",
+            "lifecycle": "Awareness",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.1-1%",
+            "where_to_get_baseline": "Historical organic + paid content performance",
+            "sample_size_consideration": "Rare event, viral potential",
+            "industry_source": "BuzzSumo Content Research"
+        }
+    ],
+    "Video Advertising": [
+        {
+            "name": "Video Start Rate",
+            "description": "Percentage of video impressions that started playing",
+            "formula": "Video Starts / Impressions",
+            "lifecycle": "Awareness",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "60-85%",
+            "where_to_get_baseline": "Video ad platforms (YouTube, Meta, TikTok), IAB video standards",
+            "sample_size_consideration": "Common event, moderate sample",
+            "industry_source": "IAB Video Ad Standards"
+        },
+        {
+            "name": "View-Through Rate (VTR)",
+            "description": "Percentage of video starts watched to completion",
+            "formula": "Completed Views / Video Starts",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "15-40%",
+            "where_to_get_baseline": "Historical video campaign data, strongly depends on video length",
+            "sample_size_consideration": "Varies significantly by video duration",
+            "industry_source": "Wistia Video Benchmarks Report"
+        },
+        {
+            "name": "Cost per View (CPV)",
+            "description": "Average cost per completed video view",
+            "formula": "Total Spend / Completed Views",
+            "lifecycle": "Awareness",
+            "distribution": "Gamma or Log-normal",
+            "test": "Mann-Whitney U or t-test",
+            "typical_range": "$0.10-$0.30",
+            "where_to_get_baseline": "YouTube TrueView, Meta video ads historical data",
+            "sample_size_consideration": "Moderate variance by placement",
+            "industry_source": "YouTube Advertising Benchmarks"
+        },
+        {
+            "name": "Video Engagement Rate",
+            "description": "Interactions relative to views (likes, shares, comments)",
+            "formula": "(Likes + Comments + Shares) / Video Views",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "2-8%",
+            "where_to_get_baseline": "Platform analytics, varies by content quality and platform",
+            "sample_size_consideration": "Higher on short-form platforms (TikTok, Reels)",
+            "industry_source": "Tubular Labs Video Intelligence"
+        },
+        {
+            "name": "Watch Time",
+            "description": "Average seconds watched per view",
+            "formula": "Total Watch Time / Total Views",
+            "lifecycle": "Consideration",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "Varies by video length",
+            "where_to_get_baseline": "YouTube Analytics, platform dashboards",
+            "sample_size_consideration": "Right-skewed, some watch full video, most drop off early",
+            "industry_source": "Wistia Engagement Graphs"
+        },
+        {
+            "name": "Video Click-Through Rate",
+            "description": "Percentage of views that resulted in clicks to destination",
+            "formula": "Clicks / Video Views",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "0.5-2%",
+            "where_to_get_baseline": "Video ad platform reports",
+            "sample_size_consideration": "Lower than display CTR",
+            "industry_source": "Google Video Ads Best Practices"
+        }
+    ],
+    "Website / Landing Page": [
+        {
+            "name": "Bounce Rate",
+            "description": "Percentage of visitors who left without interaction",
+            "formula": "Single-Page Sessions / Total Sessions",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test (inverse interpretation)",
+            "typical_range": "40-60%",
+            "where_to_get_baseline": "Google Analytics, Adobe Analytics",
+            "sample_size_consideration": "Common event, moderate sample",
+            "industry_source": "Google Analytics Benchmarks"
+        },
+        {
+            "name": "Conversion Rate",
+            "description": "Percentage of visitors who completed goal",
+            "formula": "Conversions / Visitors",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "1-5%",
+            "where_to_get_baseline": "Historical website data, industry CRO reports",
+            "sample_size_consideration": "Primary metric, needs good power",
+            "industry_source": "Unbounce Landing Page Benchmark Report"
+        },
+        {
+            "name": "Average Session Duration",
+            "description": "Mean time visitors spend on site",
+            "formula": "Total Session Duration / Sessions",
+            "lifecycle": "Consideration",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "2-5 minutes",
+            "where_to_get_baseline": "Google Analytics Behavior reports",
+            "sample_size_consideration": "High variance, outliers common",
+            "industry_source": "Contentsquare Digital Experience Benchmarks"
+        },
+        {
+            "name": "Pages per Session",
+            "description": "Average number of pages viewed per session",
+            "formula": "Total Pageviews / Sessions",
+            "lifecycle": "Consideration",
+            "distribution": "Poisson or Negative Binomial",
+            "test": "Mann-Whitney U or t-test",
+            "typical_range": "2-4 pages",
+            "where_to_get_baseline": "Google Analytics Audience reports",
+            "sample_size_consideration": "Overdispersed count data",
+            "industry_source": "GA4 Benchmarks by Industry"
+        },
+        {
+            "name": "Form Completion Rate",
+            "description": "Percentage who completed the form after starting",
+            "formula": "Form Submissions / Form Starts",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "20-50%",
+            "where_to_get_baseline": "Form analytics tools (Formstack, Typeform), heatmap analysis",
+            "sample_size_consideration": "Depends on form complexity",
+            "industry_source": "Formstack Form Conversion Report"
+        }
+    ],
+    "E-commerce": [
+        {
+            "name": "Add-to-Cart Rate",
+            "description": "Percentage of visitors who added items to cart",
+            "formula": "Add-to-Carts / Visitors",
+            "lifecycle": "Consideration",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "5-15%",
+            "where_to_get_baseline": "E-commerce platform analytics (Shopify, GA4 Enhanced E-commerce)",
+            "sample_size_consideration": "Moderate rate",
+            "industry_source": "Shopify Commerce Trends Report"
+        },
+        {
+            "name": "Cart Abandonment Rate",
+            "description": "Percentage of carts not completed (guardrail metric)",
+            "formula": "Abandoned Carts / Total Carts",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test (guardrail)",
+            "typical_range": "60-80%",
+            "where_to_get_baseline": "Historical e-commerce data, Baymard Institute research",
+            "sample_size_consideration": "Common event",
+            "industry_source": "Baymard Institute Cart Abandonment Research"
+        },
+        {
+            "name": "Purchase Conversion Rate",
+            "description": "Percentage of visitors who made a purchase",
+            "formula": "Purchases / Visitors",
+            "lifecycle": "Conversion",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "1-3%",
+            "where_to_get_baseline": "Platform reports, compare to industry vertical",
+            "sample_size_consideration": "Critical metric",
+            "industry_source": "Adobe Digital Economy Index"
+        },
+        {
+            "name": "Average Order Value (AOV)",
+            "description": "Average revenue per order",
+            "formula": "Total Revenue / Number of Orders",
+            "lifecycle": "Conversion",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "$50-$200",
+            "where_to_get_baseline": "Historical order data, segment by customer type",
+            "sample_size_consideration": "High variance, outliers",
+            "industry_source": "Shopify Benchmarks Report"
+        },
+        {
+            "name": "Revenue per Visitor (RPV)",
+            "description": "Average revenue generated per visitor",
+            "formula": "Total Revenue / Total Visitors",
+            "lifecycle": "Conversion",
+            "distribution": "Zero-inflated (most are $0)",
+            "test": "Mann-Whitney U test",
+            "typical_range": "$0.50-$5.00",
+            "where_to_get_baseline": "E-commerce analytics platforms",
+            "sample_size_consideration": "Extreme outliers, zero-heavy",
+            "industry_source": "Google Merchandise Store Benchmarks"
+        },
+        {
+            "name": "Items per Order",
+            "description": "Average number of items purchased per order",
+            "formula": "Total Items / Number of Orders",
+            "lifecycle": "Conversion",
+            "distribution": "Poisson or Negative Binomial",
+            "test": "Mann-Whitney U or t-test",
+            "typical_range": "1.5-3.5",
+            "where_to_get_baseline": "Order history data from e-commerce platform",
+            "sample_size_consideration": "Overdispersed count",
+            "industry_source": "BigCommerce E-commerce Analytics Guide"
+        }
+    ],
+    "Customer Retention": [
+        {
+            "name": "Repeat Purchase Rate",
+            "description": "Percentage of customers who make repeat purchase",
+            "formula": "Repeat Customers / Total Customers",
+            "lifecycle": "Retention",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test",
+            "typical_range": "20-40%",
+            "where_to_get_baseline": "CRM data, cohort analysis",
+            "sample_size_consideration": "Needs long observation period",
+            "industry_source": "Smile.io Retention Benchmarks"
+        },
+        {
+            "name": "Churn Rate",
+            "description": "Percentage of customers who stopped buying",
+            "formula": "Churned Customers / Total Customers",
+            "lifecycle": "Retention",
+            "distribution": "Binomial",
+            "test": "Two-proportion z-test or survival analysis",
+            "typical_range": "5-10% monthly",
+            "where_to_get_baseline": "Subscription management platforms, cohort retention analysis",
+            "sample_size_consideration": "Time-dependent metric",
+            "industry_source": "ProfitWell Retention Report"
+        },
+        {
+            "name": "Customer Lifetime Value (CLV)",
+            "description": "Total revenue expected from customer relationship",
+            "formula": "Avg Purchase Value × Purchase Frequency × Avg Lifespan",
+            "lifecycle": "Retention",
+            "distribution": "Log-normal",
+            "test": "Mann-Whitney U or log-transformed t-test",
+            "typical_range": "$100-$1000",
+            "where_to_get_baseline": "Historical cohort analysis, predictive models",
+            "sample_size_consideration": "Very high variance, long timeframe",
+            "industry_source": "Harvard Business Review CLV Calculator"
+        },
+        {
+            "name": "Net Promoter Score (NPS)",
+            "description": "Likelihood to recommend (0-10 scale)",
+            "formula": "% Promoters (9-10) - % Detractors (0-6)",
+            "lifecycle": "Retention",
+            "distribution": "Ordinal/Discrete",
+            "test": "Mann-Whitney U or proportions test",
+            "typical_range": "-10 to +50",
+            "where_to_get_baseline": "Survey platforms (Qualtrics, SurveyMonkey), compare to industry NPS",
+            "sample_size_consideration": "Survey-based, response bias",
+            "industry_source": "Bain & Company NPS Benchmarks"
+        }
+    ]
+}
+
+# Distribution explanations with practical applications (keeping your original)
+DISTRIBUTIONS = {
+    "Binomial": {
+        "description": "Models success/failure outcomes (yes/no, clicked/didn't click)",
+        "when_to_use": "Conversion rates, click-through rates, any binary outcome",
+        "parameters": "n (trials), p (probability of success)",
+        "example": "Out of 1000 emails, 250 were opened → p = 0.25",
+        "variance_note": "Variance = n×p×(1-p). Lower for extreme probabilities (near 0 or 1)",
+        "practical_application": "Use historical conversion rate distribution as Bayesian prior for campaign planning. If past CVR is 3% (Beta(300, 9700)), update with new data to forecast future performance.",
+        "mmm_use": "Binary response models in MMM - did ad exposure lead to conversion? Logistic regression backbone."
+    },
+    "Normal": {
+        "description": "Bell-curved distribution for continuous data",
+        "when_to_use": "Large sample sizes, metrics influenced by many factors",
+        "parameters": "μ (mean), σ (standard deviation)",
+        "example": "Session duration when you have thousands of users",
+        "variance_note": "Applies via Central Limit Theorem when n is large",
+        "practical_application": "Model aggregated effects in MMM. Channel contributions often normally distributed around mean effect.",
+        "mmm_use": "Standard assumption for error terms in linear MMM. Transform skewed data (log) to achieve normality for regression."
+    },
+    "Log-normal": {
+        "description": "Right-skewed distribution (many small values, few large ones)",
+        "when_to_use": "Revenue, time duration, anything that can't be negative with long tail",
+        "parameters": "μ (log-scale mean), σ (log-scale std dev)",
+        "example": "Order values: most are $20-50, but some are $500+",
+        "variance_note": "High variance due to outliers. Log-transform before t-test or use non-parametric",
+        "practical_application": "Model customer lifetime value distribution. Most customers worth $X, few 'whales' worth 10X. Use for revenue forecasting with realistic tail risk.",
+        "mmm_use": "Revenue response curves in MMM. Diminishing returns (concave) or S-curves often emerge from log-normal channel effects."
+    },
+    "Poisson": {
+        "description": "Models count data (events occurring in fixed interval)",
+        "when_to_use": "Number of purchases per user, page views per session",
+        "parameters": "λ (average rate)",
+        "example": "Average of 3 page views per session",
+        "variance_note": "Variance = mean. If variance >> mean, use Negative Binomial",
+        "practical_application": "Model arrival rates for conversion events. If customers convert at rate λ per week, predict volume for capacity planning.",
+        "mmm_use": "Count-based dependent variables in MMM (number of orders, store visits). Poisson regression for count outcomes."
+    },
+    "Negative Binomial": {
+        "description": "Overdispersed count data (variance > mean)",
+        "when_to_use": "Page views, items per order when there's high variability",
+        "parameters": "r (successes), p (probability)",
+        "example": "Most users view 2 pages, but some view 20+",
+        "variance_note": "Handles overdispersion better than Poisson",
+        "practical_application": "Model conversion counts with high variance. Accounts for unobserved heterogeneity in customer behavior.",
+        "mmm_use": "Alternative to Poisson in MMM when conversion counts show overdispersion. Common in e-commerce with repeat purchase."
+    },
+    "Gamma": {
+        "description": "Continuous positive values with right skew",
+        "when_to_use": "Costs, time to conversion, positive continuous metrics",
+        "parameters": "shape (k), scale (θ)",
+        "example": "Cost per click ranging from $0.50 to $10",
+        "variance_note": "More flexible than log-normal for certain skewed data",
+        "practical_application": "Model time-to-conversion, customer acquisition cost distributions. Shape parameter captures variation in conversion speed.",
+        "mmm_use": "Gamma GLM for positive continuous outcomes in MMM (revenue, cost). Allows asymmetric response to marketing spend."
+    },
+    "Beta": {
+        "description": "Distribution for probabilities and proportions (bounded 0-1)",
+        "when_to_use": "Prior distributions for conversion rates, click rates",
+        "parameters": "α (successes), β (failures)",
+        "example": "Historical CVR of 3% with 300 conversions, 9700 non-conversions → Beta(300, 9700)",
+        "variance_note": "Variance decreases as α + β increases (more data = more certainty)",
+        "practical_application": "Bayesian A/B testing. Start with Beta prior from historical data, update with test data to get posterior distribution. Quantify probability one variant is better.",
+        "mmm_use": "Priors for conversion probability parameters in Bayesian MMM. Especially useful with limited data or hierarchical models."
+    }
+}
+
+# Statistical tests explained (keeping your original)
+STATISTICAL_TESTS = {
+    "Two-proportion z-test": {
+        "use_case": "Comparing conversion rates, CTR, or any binary metric between two groups",
+        "assumptions": ["Independent samples", "n×p ≥ 5 and n×(1-p) ≥ 5 for both groups"],
+        "formula": "z = (p₁ - p₂) / √(p̄(1-p̄)(1/n₁ + 1/n₂))",
+        "null_hypothesis": "H₀: p₁ = p₂",
+        "example": "Control CVR = 5%, Treatment CVR = 5.5%",
+        "practical_note": "Most common marketing test. If sample size requirements not met, use Fisher's exact test."
+    },
+    "Two-sample t-test": {
+        "use_case": "Comparing means of continuous metrics (revenue, time, costs)",
+        "assumptions": ["Independent samples", "Approximately normal distribution (or large n)", "Equal variances (or use Welch's t-test)"],
+        "formula": "t = (x̄₁ - x̄₂) / √(s₁²/n₁ + s₂²/n₂)",
+        "null_hypothesis": "H₀: μ₁ = μ₂",
+        "example": "Average session duration: Control = 3.2 min, Treatment = 3.5 min",
+        "practical_note": "Check normality with QQ-plot. If skewed, use Mann-Whitney or log-transform first."
+    },
+    "Mann-Whitney U test": {
+        "use_case": "Non-parametric alternative when data is skewed or assumptions violated",
+        "assumptions": ["Independent samples", "Ordinal or continuous data"],
+        "formula": "Based on rank sums",
+        "null_hypothesis": "H₀: Distributions are equal",
+        "example": "Revenue per user (highly skewed with outliers)",
+        "practical_note": "Default choice for revenue, AOV, and any metric with extreme outliers. More robust than t-test."
+    },
+    "Log-transformed t-test": {
+        "use_case": "When data is log-normally distributed (revenue, AOV)",
+        "assumptions": ["Data must be positive", "Log-transformed data is approximately normal"],
+        "formula": "Take log of all values, then apply t-test",
+        "null_hypothesis": "H₀: Geometric means are equal",
+        "example": "Order values: log(AOV) then compare",
+        "practical_note": "Tests geometric mean difference. Interpret as % change rather than absolute. Add $1 if zeros present."
+    },
+    "Chi-square test": {
+        "use_case": "Comparing categorical distributions or contingency tables",
+        "assumptions": ["Independent observations", "Expected frequency ≥ 5 in each cell"],
+        "formula": "χ² = Σ(Observed - Expected)² / Expected",
+        "null_hypothesis": "H₀: Variables are independent",
+        "example": "Comparing device type distribution (mobile/desktop/tablet) between groups",
+        "practical_note": "Use for randomization checks (A/A test) and detecting sample ratio mismatch."
+    }
+}
+
+# Sample-size family per catalog distribution; anything else is a mean with a standard deviation
+SAMPLE_SIZE_FAMILIES = {
+    "Binomial": "binomial",
+    "Binomial (simplified)": "binomial",
+    "Poisson (for counts)": "poisson",
+    "Poisson or Negative Binomial": "negative_binomial",
+}
+
+def sample_size_family(metric):
+    return SAMPLE_SIZE_FAMILIES.get(metric['distribution'], "normal")
+
+def format_metric_value(value, distribution="binomial"):
+    """Rates as percentages, means in their own units"""
+    return f"{value:.2f}%" if distribution == "binomial" else f"{value:,.2f}"
+
+def typical_metric_value(metric):
+    """Midpoint of the catalog's typical range, the default mean for non-rate metrics"""
+    numbers = [float(number) for number in re.findall(r"\d+(?:\.\d+)?", metric['typical_range'].replace(",", ""))]
+    return sum(numbers[:2]) / len(numbers[:2]) if numbers else 1.0
@@ -0,0 +1,86 @@
+"""Power and MDE trade-off curves for the design phase.
+
+A single sample size hides the trade-off frontier: how fast power builds up
+with more users, how small an effect each extra week of testing can detect,
+and how power falls off for effects smaller than the MDE. Each family below is
+one broadcast call of the :mod:`playbook.stats` kernels over a dense grid (a
+few lines by a few hundred points), cheap enough to recompute on every widget
+change.
+
+MDE-vs-duration solves the inverse problem at every point with the bracketed
+Newton solver of :mod:`playbook.inverse`, exact to rounding rather than to a
+grid's resolution.
+
+Every function takes the metric-family keywords of
+:func:`playbook.stats.metric_sample_size` (``distribution``, ``sd``,
+``dispersion``) and defaults to a binomial rate in percent.
+"""
+import numpy as np
+
+from .inverse import mde_ceiling, solve_mde
+from .stats import metric_power, metric_sample_size
+
+DEFAULT_POINTS = 400
+# Lines per family: MDE multiples (power vs n), power levels (MDE vs duration),
+# sample multiples (power vs MDE)
+SCALE_FACTORS = (0.5, 1.0, 2.0)
+POWER_LEVELS = (0.7, 0.8, 0.9)
+MAX_CURVE_DAYS = 365
+
+
+def power_vs_sample_size(baseline, mde, alpha=0.05, power=0.80, split=50, points=DEFAULT_POINTS,
+                         factors=SCALE_FACTORS, **metric):
+    """Power over total samples (0 to 3x the requirement) for multiples of the MDE
+
+    Returns ``{'n': (points,), 'mde': (lines,), 'power': (lines, points)}``.
+    """
+    required = float(metric_sample_size(baseline, mde, alpha, power, split, **metric))
+    n = np.linspace(0, 3 * required if np.isfinite(required) else 1.0, points)
+    mdes = mde * np.asarray(factors, dtype=float)
+    return {'n': n, 'mde': mdes, 'power': metric_power(baseline, mdes[:, None], n, alpha, split, **metric)}
+
+
+def mde_vs_duration(baseline, daily_traffic, alpha=0.05, split=50, max_days=56, points=DEFAULT_POINTS,
+                    powers=POWER_LEVELS, **metric):
+    """Smallest detectable relative lift after each day of testing, per power level
+
+    ``daily_traffic`` is the total daily sample across both arms. Durations
+    whose sample cannot detect any lift up to :func:`playbook.inverse.mde_ceiling` are NaN.
+    Returns ``{'days': (points,), 'power': (lines,), 'mde': (lines, points)}``.
+    """
+    days = np.linspace(1, max_days, points)
+    powers = np.asarray(powers, dtype=float)
+    mde = solve_mde(baseline, days * daily_traffic, alpha, powers[:, None], split, **metric)
+    return {'days': days, 'power': powers, 'mde': mde}
+
+
+def power_vs_mde(baseline, total_n, alpha=0.05, split=50, max_mde=None, points=DEFAULT_POINTS,
+                 factors=SCALE_FACTORS, **metric):
+    """Power over relative lifts (0 to ``max_mde``) for multiples of the sample
+
+    Returns ``{'mde': (points,), 'n': (lines,), 'power': (lines, points)}``.
+    """
+    ceiling = float(mde_ceiling(baseline, metric.get('distribution', "binomial")))
+    mde = np.linspace(0, min(max_mde or ceiling, ceiling), points)
+    n = total_n * np.asarray(factors, dtype=float)
+    return {'mde': mde, 'n': n, 'power': metric_power(baseline, mde, n[:, None], alpha, split, **metric)}
+
+
+def design_curves(baseline, mde, alpha=0.05, power=0.80, split=50, daily_traffic=10_000, points=DEFAULT_POINTS,
+                  **metric):
+    """All three trade-off families around one design, plus its sample and duration"""
+    required = float(metric_sample_size(baseline, mde, alpha, power, split, **metric))
+    days = required / daily_traffic
+    powers = tuple(sorted({*POWER_LEVELS, round(float(power), 2)}))
+    return {
+        'required_n': required,
+        'days': days,
+        'power_vs_n': power_vs_sample_size(baseline, mde, alpha, power, split, points, **metric),
+        'mde_vs_duration': mde_vs_duration(
+            baseline, daily_traffic, alpha, split,
+            max_days=min(MAX_CURVE_DAYS, max(56, int(np.ceil(2 * days))) if np.isfinite(days) else 56),
+            points=points, powers=powers, **metric,
+        ),
+        'power_vs_mde': power_vs_mde(baseline, required if np.isfinite(required) else 0.0, alpha, split,
+                                     max_mde=3 * mde, points=points, **metric),
+    }
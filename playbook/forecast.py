@@ -0,0 +1,168 @@
+"""Seasonal daily-traffic forecasts for experiment duration planning.
+
+The model is deliberately small: ``log(visitors) = trend * t + weekday effect``
+fitted by least squares, which captures steady growth and weekly seasonality
+from a few weeks of history. Forecasts come with a prediction band from the
+residual spread, and the end date of a test is the first day the cumulative
+eligible sample per arm reaches the target, found with one vectorized
+cumulative sum over the forecast.
+
+The range of end dates comes from the band of the *cumulative* traffic, not
+from summing the daily band edges (which would assume every day misses the
+forecast in the same direction). Daily deviations are treated as independent
+and the sum of the lognormal days is matched to a lognormal by its mean and
+variance (Fenton-Wilkinson).
+
+Models are plain dicts of floats and ISO dates, so they can be stored in
+``st.session_state`` and the experiment registry as-is.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+MIN_HISTORY_DAYS = 14
+DEFAULT_HORIZON = 365
+
+
+def load_traffic_history(source):
+    """Read a CSV of daily traffic into a date-indexed Series
+
+    The date column is the first one named like ``date``/``day`` (else the
+    first column); the traffic column is the first other numeric column.
+    Duplicate dates are summed.
+    """
+    frame = pd.read_csv(source)
+    if frame.shape[1] < 2:
+        raise ValueError("Traffic history needs a date column and a visitors column")
+
+    date_column = next((c for c in frame.columns if str(c).strip().lower() in ("date", "day", "ds")),
+                       frame.columns[0])
+    numeric = [c for c in frame.select_dtypes("number").columns if c != date_column]
+    if not numeric:
+        raise ValueError("No numeric traffic column found")
+
+    dates = pd.to_datetime(frame[date_column], errors="coerce").dt.normalize()
+    history = pd.Series(frame[numeric[0]].to_numpy(dtype=float), index=dates, name="visitors")
+    history = history[history.index.notna() & (history > 0)]
+    return history.groupby(level=0).sum().sort_index()
+
+
+def _design_matrix(offsets, weekdays):
+    """Columns: linear trend in days, then one indicator per weekday"""
+    matrix = np.zeros((len(offsets), 8))
+    matrix[:, 0] = offsets
+    matrix[np.arange(len(offsets)), 1 + np.asarray(weekdays)] = 1.0
+    return matrix
+
+
+def fit_traffic_model(history):
+    """Fit the log-linear trend + day-of-week model to a daily Series"""
+    history = history[history > 0]
+    if len(history) < MIN_HISTORY_DAYS:
+        raise ValueError(f"Need at least {MIN_HISTORY_DAYS} days of traffic history, got {len(history)}")
+
+    origin = history.index[0]
+    offsets = (history.index - origin).days.to_numpy(dtype=float)
+    matrix = _design_matrix(offsets, history.index.dayofweek)
+    target = np.log(history.to_numpy(dtype=float))
+
+    coefficients, _, rank, _ = np.linalg.lstsq(matrix, target, rcond=None)
+    residuals = target - matrix @ coefficients
+    dof = max(len(target) - rank, 1)
+
+    return {
+        'origin': origin.date().isoformat(),
+        'last_observed': history.index[-1].date().isoformat(),
+        'trend': float(coefficients[0]),
+        'weekday': coefficients[1:].tolist(),
+        'sigma': float(np.sqrt(residuals @ residuals / dof)),
+        'observations': int(len(history)),
+        'mean_daily': float(history.mean()),
+    }
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else pd.Timestamp(value).date()
+
+
+def predict_traffic(model, start, days, interval=0.80):
+    """Daily forecast from ``start`` with a prediction band
+
+    Returns a DataFrame indexed by date with ``forecast`` (median), ``lower``
+    and ``upper`` columns.
+    """
+    start = _as_date(start)
+    dates = pd.date_range(start, periods=int(days), freq="D")
+    offsets = (dates - pd.Timestamp(_as_date(model['origin']))).days.to_numpy(dtype=float)
+
+    log_mean = offsets * model['trend'] + np.asarray(model['weekday'])[dates.dayofweek]
+    spread = stats.norm.ppf(0.5 + interval / 2) * model['sigma']
+    return pd.DataFrame({
+        'forecast': np.exp(log_mean),
+        'lower': np.exp(log_mean - spread),
+        'upper': np.exp(log_mean + spread),
+    }, index=dates)
+
+
+def _days_to_reach(cumulative, n_per_group, split):
+    """First day (1-based) the smaller arm's share of ``cumulative`` reaches ``n_per_group``, NaN if never"""
+    short = np.asarray(cumulative, dtype=float) * (min(split, 100 - split) / 100) < n_per_group
+    days = short.sum(axis=-1) + 1.0
+    return np.where(short.all(axis=-1), np.nan, days)
+
+
+def days_to_sample(daily_traffic, n_per_group, split=50):
+    """Days until the cumulative smaller-arm sample first reaches ``n_per_group``
+
+    ``daily_traffic`` may be 1-D or stacked scenarios (rows); the count runs
+    along the last axis. Scenarios that never get there return NaN.
+    """
+    return _days_to_reach(np.cumsum(np.asarray(daily_traffic, dtype=float), axis=-1), n_per_group, split)
+
+
+def cumulative_traffic_band(model, forecast, interval=0.80):
+    """``(lower, upper)`` prediction band of the running total of ``forecast`` (daily medians)
+
+    Each day is lognormal around its median with the model's residual
+    ``sigma``, independently of the others; the running total is approximated
+    by the lognormal with the same mean and variance.
+    """
+    variance = model['sigma'] ** 2
+    median = np.asarray(forecast, dtype=float)
+    mean = np.cumsum(median * np.exp(variance / 2))
+    spread = np.cumsum(median ** 2 * np.exp(variance) * np.expm1(variance))
+    log_variance = np.log1p(spread / mean ** 2)
+    log_median = np.log(mean) - log_variance / 2
+    z = stats.norm.ppf(0.5 + interval / 2) * np.sqrt(log_variance)
+    return np.exp(log_median - z), np.exp(log_median + z)
+
+
+def forecast_duration(model, start, n_per_group, split=50, interval=0.80, horizon=DEFAULT_HORIZON):
+    """Forecast-based test length and end dates from launch day ``start``
+
+    ``days`` follows the median forecast. ``days_low`` and ``days_high`` bound
+    the day the target is reached with probability ``interval``, from the
+    band of the cumulative traffic (:func:`cumulative_traffic_band`); any of
+    them is None when the target isn't reached within ``horizon`` days.
+    """
+    start = _as_date(start)
+    frame = predict_traffic(model, start, horizon, interval)
+    lower, upper = cumulative_traffic_band(model, frame['forecast'], interval)
+    # P(done by day t) = P(cumulative_t >= target): the upper band gives the early end, the lower the late one
+    days = _days_to_reach(np.vstack([np.cumsum(frame['forecast'].to_numpy()), upper, lower]), n_per_group, split)
+
+    def end(value):
+        return None if np.isnan(value) else start + timedelta(days=int(value) - 1)
+
+    expected, fastest, slowest = (None if np.isnan(d) else int(d) for d in days)
+    return {
+        'days': expected,
+        'days_low': fastest,
+        'days_high': slowest,
+        'end_date': end(days[0]),
+        'end_date_low': end(days[1]),
+        'end_date_high': end(days[2]),
+        'forecast': frame,
+    }
@@ -0,0 +1,250 @@
+"""Opt-in render-time and rerun instrumentation with Prometheus text export.
+
+Instrumentation is off unless ``AB_INSTRUMENT=1`` is set for the process or a
+session opens the app with ``?debug=1``. Activation is tracked per thread
+(Streamlit runs each session's script on its own thread), so timers in
+sessions that did not opt in cost a single attribute lookup.
+
+Metrics are aggregated process-wide and can be exported as Prometheus text:
+
+* ``AB_METRICS_FILE=/path/metrics.prom`` rewrites the file after every rerun
+* ``AB_METRICS_PORT=9464`` serves ``/metrics`` from a background thread
+"""
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENV_ENABLED = os.environ.get("AB_INSTRUMENT", "").lower() in ("1", "true", "yes", "on")
+
+# Upper bounds (seconds) of the duration histogram buckets
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_state = threading.local()
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "total", "maximum", "last")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+        self.last = value
+
+
+class MetricsRegistry:
+    """Thread-safe duration histograms and counters keyed by label tuples"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._counters = {}
+
+    def observe(self, kind, name, seconds):
+        with self._lock:
+            histogram = self._durations.get((kind, name))
+            if histogram is None:
+                histogram = self._durations[(kind, name)] = _Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, counter, labels=(), amount=1):
+        key = (counter, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counters.clear()
+
+    def timings(self):
+        """Rows for the debug panel, slowest total time first"""
+        with self._lock:
+            rows = [
+                {
+                    'kind': kind,
+                    'name': name,
+                    'calls': h.count,
+                    'total_ms': h.total * 1000,
+                    'mean_ms': h.total / h.count * 1000,
+                    'max_ms': h.maximum * 1000,
+                    'last_ms': h.last * 1000,
+                }
+                for (kind, name), h in self._durations.items()
+            ]
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def counters(self, counter):
+        with self._lock:
+            return {labels: value for (name, labels), value in self._counters.items() if name == counter}
+
+    def render_prometheus(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = [
+            "# HELP ab_duration_seconds Time spent in phase renders, stats calls and figure builds.",
+            "# TYPE ab_duration_seconds histogram",
+        ]
+        with self._lock:
+            for (kind, name), h in sorted(self._durations.items()):
+                labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, h.counts):
+                    cumulative += count
+                    lines.append(f'ab_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'ab_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"ab_duration_seconds_sum{{{labels}}} {h.total:.9f}")
+                lines.append(f"ab_duration_seconds_count{{{labels}}} {h.count}")
+
+            seen = set()
+            for (counter, labels), value in sorted(self._counters.items()):
+                if counter not in seen:
+                    seen.add(counter)
+                    lines.append(f"# TYPE {counter} counter")
+                label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+                lines.append(f"{counter}{{{label_text}}} {value}" if label_text else f"{counter} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = MetricsRegistry()
+
+
+def activate(enabled):
+    """Turn timing on or off for the current thread (one Streamlit script run)"""
+    _state.enabled = bool(enabled)
+
+
+def is_active():
+    return getattr(_state, "enabled", False)
+
+
+@contextmanager
+def timed(kind, name):
+    """Time the enclosed block when instrumentation is active"""
+    if not is_active():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(kind, name, time.perf_counter() - started)
+
+
+def timed_fn(kind, name=None):
+    """Decorator form of :func:`timed`"""
+    def decorator(func):
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_active():
+                return func(*args, **kwargs)
+            with timed(kind, label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_TRACKED_TYPES = (bool, int, float, str)
+
+
+def record_rerun(session_state):
+    """Count a rerun and attribute it to the keyed widgets whose values changed
+
+    Returns ``(session_rerun_count, triggering_widgets)``.
+    """
+    current = {
+        key: value for key, value in session_state.items()
+        if not str(key).startswith("_") and isinstance(value, _TRACKED_TYPES)
+    }
+    previous = session_state.get("_instrument_widgets")
+    reruns = session_state.get("_instrument_reruns", 0) + 1
+
+    if previous is None:
+        METRICS.inc("ab_sessions_total")
+        triggers = ["initial_load"]
+    else:
+        # A clicked button reads True for exactly one run; other widgets count when
+        # their value changed (newly rendered widgets didn't trigger anything)
+        triggers = [
+            key for key, value in current.items()
+            if (value is True and previous.get(key) is not True)
+            or (key in previous and previous[key] != value and value is not False)
+        ]
+        triggers = triggers or ["unkeyed_widget"]
+
+    for widget in triggers:
+        METRICS.inc("ab_reruns_total", (("widget", widget),))
+        counts = session_state.setdefault("_instrument_widget_reruns", {})
+        counts[widget] = counts.get(widget, 0) + 1
+
+    session_state["_instrument_widgets"] = current
+    session_state["_instrument_reruns"] = reruns
+    return reruns, triggers
+
+
+def write_prometheus_file(path):
+    """Atomically replace ``path`` with the current metrics
+
+    Each writer uses its own temporary file next to ``path``, so concurrent
+    exports never clobber each other's file before the rename.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp",
+                                     delete=False) as handle:
+        handle.write(METRICS.render_prometheus())
+    try:
+        # Temporary files are private; scrapers such as node_exporter run as another user
+        os.chmod(handle.name, 0o644)
+        os.replace(handle.name, path)
+    except OSError:
+        os.remove(handle.name)
+        raise
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        payload = METRICS.render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server_lock = threading.Lock()
+_server = None
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve ``/metrics`` on a daemon thread (idempotent)"""
+    global _server
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="ab-metrics", daemon=True).start()
+    return _server
@@ -0,0 +1,135 @@
+"""Inverse design solvers: MDE, power or alpha from a fixed sample budget.
+
+The design phase answers "how many users do I need?". Teams with a fixed list
+size or a fixed campaign length ask the opposite: what is the smallest lift
+this budget can detect, how much power does it leave for the lift we care
+about, or what significance level would it take? ``total_n`` is the budget
+across both arms; a fixed campaign length is ``days * daily_traffic``.
+
+Power has a closed form (:func:`playbook.stats.metric_power`). MDE and alpha
+are found by root finding on the power z-score
+(:func:`playbook.stats.metric_power_z`), which stays finite where the power
+itself saturates at 0 or 1. The root finder is a bracketed Newton iteration
+over whole arrays: every element takes a Newton step (finite-difference
+slope) and falls back to bisection whenever the step leaves its bracket, so a
+table of a million constrained scenarios solves in about ten array passes.
+
+All solvers take the metric-family keywords of
+:func:`playbook.stats.metric_sample_size` (``distribution``, ``sd``,
+``dispersion``) and broadcast over every argument.
+"""
+import numpy as np
+from scipy import special
+
+from .stats import metric_power, metric_power_z, metric_variance
+
+# Relative lifts searched, in percent
+MIN_MDE = 1e-6
+MAX_MDE = 1000.0
+# Critical values searched when solving for alpha (alpha down to ~1e-87)
+MAX_Z_ALPHA = 20.0
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 60
+
+
+def mde_ceiling(baseline, distribution="binomial"):
+    """Largest relative lift (percent) searched; binomial rates must stay below 100%"""
+    baseline = np.asarray(baseline, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate_ceiling = np.minimum(MAX_MDE, (100 / baseline - 1) * 100 * 0.999)
+    return np.where(np.asarray(distribution) == "binomial", rate_ceiling, MAX_MDE)
+
+
+def bracketed_newton(func, lower, upper, start=None, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+    """Roots of an increasing ``func`` on ``[lower, upper]``, element-wise over arrays
+
+    ``func`` maps an array of points to an array of values and must broadcast
+    over a new leading axis (the point and its finite-difference neighbour are
+    evaluated in one call). Elements already positive at ``lower`` come back
+    as ``lower``; elements still negative at ``upper`` (or with a NaN
+    bracket) come back NaN.
+    """
+    x = (np.asarray(lower, dtype=float) + np.asarray(upper, dtype=float)) / 2 if start is None else start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shape = np.shape(func(x))
+        lower, upper, x = (np.broadcast_to(np.asarray(value, dtype=float), shape) for value in (lower, upper, x))
+        x = np.where(np.isfinite(x), np.clip(x, lower, upper), (lower + upper) / 2)
+        ends = func(np.stack([lower, upper]))
+    valid = (lower < upper) & (ends[1] >= 0)
+    below = ends[0] > 0
+
+    step = 1e-6
+    for _ in range(max_iter):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            value, shifted = func(np.stack([x, x + step]))
+            # Shrink the bracket around the root, then try the Newton step inside it
+            lower = np.where(value < 0, x, lower)
+            upper = np.where(value >= 0, x, upper)
+            newton = value * step / (shifted - value)
+        # A converged step is accepted even if rounding puts it a hair outside the bracket
+        done = np.abs(newton) <= tol * np.maximum(1.0, np.abs(x))
+        candidate = x - newton
+        inside = np.isfinite(candidate) & (candidate >= lower) & (candidate <= upper)
+        x = np.where(inside | done, candidate, (lower + upper) / 2)
+        if np.all(done | below | ~valid):
+            break
+    return np.where(valid, np.where(below, lower, x), np.nan)
+
+
+def solve_mde(baseline, total_n, alpha=0.05, power=0.80, split=50, distribution="binomial", sd=None,
+              dispersion=0.0):
+    """Smallest relative lift (percent) that ``total_n`` samples detect with ``power``
+
+    NaN where no lift up to :func:`mde_ceiling` is detectable. Solved in
+    log-lift, where the power z-score is close to linear.
+    """
+    metric = {'distribution': distribution, 'sd': sd, 'dispersion': dispersion}
+    target = special.ndtri(np.asarray(power, dtype=float))
+    baseline = np.asarray(baseline, dtype=float)
+
+    # Start from the lift that would need total_n if the variance stayed at the baseline's
+    mean = np.where(np.asarray(distribution) == "binomial", baseline / 100, baseline)
+    w = np.asarray(split, dtype=float) / 100
+    z_sum = special.ndtri(1 - np.asarray(alpha, dtype=float) / 2) + target
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = 100 * z_sum * np.sqrt(metric_variance(mean, **metric) * (1 / w + 1 / (1 - w))
+                                      / np.asarray(total_n, dtype=float)) / mean
+
+    def margin(log_mde):
+        return metric_power_z(baseline, np.exp(log_mde), total_n, alpha, split, **metric) - target
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_mde = bracketed_newton(margin, np.log(MIN_MDE), np.log(mde_ceiling(baseline, distribution)),
+                                   np.log(guess))
+    return np.exp(log_mde)
+
+
+def solve_power(baseline, mde, total_n, alpha=0.05, split=50, distribution="binomial", sd=None, dispersion=0.0):
+    """Power that ``total_n`` samples leave for a relative lift of ``mde`` percent"""
+    return metric_power(baseline, mde, total_n, alpha, split, distribution, sd, dispersion)
+
+
+def solve_alpha(baseline, mde, total_n, power=0.80, split=50, distribution="binomial", sd=None, dispersion=0.0):
+    """Smallest two-sided alpha at which ``total_n`` samples detect ``mde`` with ``power``
+
+    NaN where even alpha = 1 falls short; budgets vast enough for any alpha
+    get ``2 * ndtr(-MAX_Z_ALPHA)``. Solved in the critical value, in
+    which the power z-score is linear (Newton lands in one step).
+    """
+    metric = {'distribution': distribution, 'sd': sd, 'dispersion': dispersion}
+    target = special.ndtri(np.asarray(power, dtype=float))
+
+    def margin(neg_z_alpha):
+        return metric_power_z(baseline, mde, total_n, 2 * special.ndtr(neg_z_alpha), split, **metric) - target
+
+    neg_z_alpha = bracketed_newton(margin, -MAX_Z_ALPHA, 0.0, -special.ndtri(0.975))
+    return 2 * special.ndtr(neg_z_alpha)
+
+
+def solve_budget(baseline, total_n, mde=None, alpha=0.05, power=0.80, split=50, **metric):
+    """Detectable MDE, and with ``mde`` the achievable power and required alpha, for one budget"""
+    solved = {'mde': solve_mde(baseline, total_n, alpha, power, split, **metric)}
+    if mde is not None:
+        solved['power'] = solve_power(baseline, mde, total_n, alpha, split, **metric)
+        solved['alpha'] = solve_alpha(baseline, mde, total_n, power, split, **metric)
+    return solved
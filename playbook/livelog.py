@@ -0,0 +1,215 @@
+"""Incremental tail-follow of growing exposure log files.
+
+A :class:`LogFollower` remembers a byte offset per file and, on every poll,
+parses only the complete records appended since the last one. The new records
+are reduced to per-variant sufficient statistics (exposures, conversions, and
+value sum / sum of squares) and merged into running totals, so the cost of a
+refresh depends on the new data only, never on the total file size.
+
+Supported formats, chosen by extension:
+
+* CSV with a header row (``.csv``, anything unrecognised)
+* JSON lines (``.jsonl``, ``.ndjson``)
+
+Each record needs a variant column (``variant``, ``arm`` or ``group``) and a
+0/1 outcome column (``converted``, ``conversion`` or ``outcome``); a numeric
+``value`` column is aggregated when present.
+
+A line that cannot be parsed, or one longer than :data:`MAX_BYTES_PER_POLL`,
+is skipped rather than retried forever: the cursor moves past it and counts
+it, keeping the offset of the last one so it can be inspected. Only a CSV
+header without the needed columns stops the follower.
+
+Cursors (device/inode, offset, CSV header and the totals) can be persisted in
+the experiment registry, so a restarted worker resumes where it left off. A
+file that shrinks or is replaced (log rotation) is re-read from the start.
+"""
+import csv
+import io
+import os
+import threading
+import time
+
+import pandas as pd
+
+VARIANT_COLUMNS = ("variant", "arm", "group")
+OUTCOME_COLUMNS = ("converted", "conversion", "outcome")
+VALUE_COLUMN = "value"
+STAT_FIELDS = ("n", "x", "value_sum", "value_sq_sum")
+
+# Upper bound on bytes parsed per poll, so a huge backlog is caught up over several refreshes
+MAX_BYTES_PER_POLL = 64 * 2**20
+
+
+def _pick(columns, candidates, what):
+    lowered = {str(column).strip().lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    raise ValueError(f"No {what} column (expected one of: {', '.join(candidates)})")
+
+
+def summarize_records(records):
+    """Per-variant sufficient statistics of a frame of exposure records"""
+    if records.empty:
+        return {}
+    variant = _pick(records.columns, VARIANT_COLUMNS, "variant")
+    outcome = _pick(records.columns, OUTCOME_COLUMNS, "outcome")
+
+    frame = pd.DataFrame({
+        'variant': records[variant].astype(str),
+        'x': pd.to_numeric(records[outcome], errors="coerce").fillna(0),
+    })
+    if VALUE_COLUMN in records.columns:
+        frame['value_sum'] = pd.to_numeric(records[VALUE_COLUMN], errors="coerce").fillna(0)
+    else:
+        frame['value_sum'] = 0.0
+    frame['value_sq_sum'] = frame['value_sum'] ** 2
+
+    grouped = frame.groupby('variant', sort=True)
+    totals = grouped[['x', 'value_sum', 'value_sq_sum']].sum()
+    totals['n'] = grouped.size()
+    return {
+        name: {field: float(row[field]) for field in STAT_FIELDS}
+        for name, row in totals.iterrows()
+    }
+
+
+def merge_stats(totals, delta):
+    """Add per-variant statistics ``delta`` into ``totals`` in place"""
+    for name, stats in delta.items():
+        current = totals.setdefault(name, dict.fromkeys(STAT_FIELDS, 0.0))
+        for field in STAT_FIELDS:
+            current[field] += stats[field]
+    return totals
+
+
+def _is_json_lines(path):
+    return str(path).lower().endswith((".jsonl", ".ndjson"))
+
+
+def new_cursor():
+    return {'file_id': None, 'offset': 0, 'header': None, 'stats': {}, 'records': 0, 'skipped': 0,
+            'skipped_offset': None}
+
+
+class LogFollower:
+    """Byte-offset cursor over one append-only exposure log
+
+    ``poll()`` is thread-safe, so one follower can be shared by every session
+    watching the same file.
+    """
+
+    def __init__(self, path, cursor=None, on_update=None):
+        self.path = str(path)
+        # Cursors saved before a field existed get its default
+        self.cursor = {**new_cursor(), **(cursor or {})}
+        self.on_update = on_update
+        self.last_poll = {'bytes': 0, 'records': 0, 'skipped': 0, 'seconds': 0.0, 'at': None}
+        self._lock = threading.Lock()
+
+    def _read_chunk(self, handle):
+        """``(chunk, oversized)``: complete lines appended since the cursor (a trailing partial line waits)
+
+        A first line longer than :data:`MAX_BYTES_PER_POLL` never fits in a
+        chunk; once it is complete its length is returned as ``oversized``
+        instead, so the caller can skip it.
+        """
+        handle.seek(self.cursor['offset'])
+        chunk = handle.read(MAX_BYTES_PER_POLL)
+        complete = chunk.rfind(b"\n") + 1
+        if complete or len(chunk) < MAX_BYTES_PER_POLL:
+            return chunk[:complete], 0
+        length = len(chunk)
+        while block := handle.read(MAX_BYTES_PER_POLL):
+            end = block.find(b"\n")
+            if end >= 0:
+                return b"", length + end + 1
+            length += len(block)
+        return b"", 0
+
+    def _split_header(self, chunk):
+        """``(header, body_start)`` of a chunk: only the first chunk of a CSV file starts with a header"""
+        header = self.cursor['header']
+        if header is not None or _is_json_lines(self.path):
+            return header, 0
+        header_end = chunk.find(b"\n") + 1
+        header = next(csv.reader([chunk[:header_end].decode().strip()]), [])
+        # A header without the needed columns is a setup error, not a line to skip
+        _pick(header, VARIANT_COLUMNS, "variant")
+        _pick(header, OUTCOME_COLUMNS, "outcome")
+        return header, header_end
+
+    def _parse(self, body, header):
+        """Records of the complete lines in ``body``"""
+        if _is_json_lines(self.path):
+            return pd.read_json(io.BytesIO(body), lines=True)
+        records = pd.read_csv(io.BytesIO(body), header=None, names=header)
+        # pandas turns the surplus fields of a too-long first line into the index instead of failing
+        if not isinstance(records.index, pd.RangeIndex):
+            raise ValueError("More fields than the header")
+        return records
+
+    def _summarize(self, body, header, start):
+        """``(stats, records, skipped)`` of ``body``, which starts at byte ``start``
+
+        A body that fails to parse is split in half until the bad lines are
+        isolated; ``skipped`` lists their offsets. The good lines cost one
+        parse per half, so a few bad lines don't force a line-by-line parse.
+        """
+        if not body.strip():
+            return {}, 0, []
+        try:
+            frame = self._parse(body, header)
+            return summarize_records(frame), len(frame), []
+        except ValueError:
+            lines = body[:-1].split(b"\n")
+            if len(lines) == 1:
+                return {}, 0, [start]
+        head = b"\n".join(lines[:len(lines) // 2]) + b"\n"
+        first = self._summarize(head, header, start)
+        second = self._summarize(body[len(head):], header, start + len(head))
+        return merge_stats(first[0], second[0]), first[1] + second[1], first[2] + second[2]
+
+    def poll(self):
+        """Fold newly appended records into the totals; returns the cursor"""
+        with self._lock:
+            started = time.perf_counter()
+            stat = os.stat(self.path)
+            file_id = [stat.st_dev, stat.st_ino]
+            if self.cursor['file_id'] != file_id or stat.st_size < self.cursor['offset']:
+                # New, rotated or truncated file: start over
+                self.cursor = {**new_cursor(), 'file_id': file_id}
+
+            records, bytes_read, skipped = 0, 0, []
+            if stat.st_size > self.cursor['offset']:
+                start = self.cursor['offset']
+                with open(self.path, "rb") as handle:
+                    chunk, oversized = self._read_chunk(handle)
+                if oversized:
+                    skipped, bytes_read = [start], oversized
+                elif chunk:
+                    header, body_start = self._split_header(chunk)
+                    delta, records, skipped = self._summarize(chunk[body_start:], header, start + body_start)
+                    # Nothing is committed until the whole chunk is summarized
+                    self.cursor['header'] = header
+                    merge_stats(self.cursor['stats'], delta)
+                    self.cursor['records'] += records
+                    bytes_read = len(chunk)
+                self.cursor['offset'] += bytes_read
+                if skipped:
+                    self.cursor['skipped'] += len(skipped)
+                    self.cursor['skipped_offset'] = skipped[-1]
+
+            self.last_poll = {'bytes': bytes_read, 'records': records, 'skipped': len(skipped),
+                              'seconds': time.perf_counter() - started, 'at': time.time()}
+            if bytes_read and self.on_update is not None:
+                self.on_update(self.path, self.cursor)
+            return self.cursor
+
+    @property
+    def caught_up(self):
+        try:
+            return os.path.getsize(self.path) - self.cursor['offset'] < MAX_BYTES_PER_POLL
+        except OSError:
+            return True
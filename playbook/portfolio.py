@@ -0,0 +1,117 @@
+"""Portfolio scheduling of many experiments over shared traffic.
+
+Every experiment runs on a *surface* (an email list, a landing page, ...)
+with a known daily eligible traffic, inside a mutual-exclusion *layer* of
+that surface: experiments in the same (surface, layer) split its users
+between them, while different layers are orthogonal and each see the full
+surface traffic.
+
+An experiment asks for a share of its layer's traffic (``traffic_share``,
+100% by default) and needs enough users for both arms to reach
+``sample_size_per_group``; its duration follows from the two. Scheduling is
+greedy list scheduling per layer, driven by completion events: whenever
+capacity frees up, waiting experiments are started in order of priority,
+then longest duration first (which keeps the calendar short), and smaller
+experiments backfill capacity a larger one cannot use yet. Allocations stay
+fixed once an experiment starts, so planned durations hold.
+"""
+import heapq
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLUMNS = ("name", "sample_size_per_group", "surface")
+DEFAULTS = {'split': 50.0, 'layer': "default", 'priority': 0, 'traffic_share': 100.0}
+
+
+def required_users(sample_size_per_group, split=50):
+    """Eligible users needed so the smaller arm reaches ``sample_size_per_group``"""
+    smaller_share = np.minimum(np.asarray(split, dtype=float), 100 - np.asarray(split, dtype=float)) / 100
+    with np.errstate(divide="ignore"):
+        return np.asarray(sample_size_per_group, dtype=float) / smaller_share
+
+
+def prepare_portfolio(experiments, surfaces):
+    """Validate the experiment table, fill defaults and compute durations in days
+
+    ``surfaces`` maps surface name to daily eligible traffic.
+    """
+    frame = pd.DataFrame(experiments).copy()
+    missing = [column for column in REQUIRED_COLUMNS if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Missing experiment columns: {', '.join(missing)}")
+    for column, default in DEFAULTS.items():
+        frame[column] = frame[column].fillna(default) if column in frame.columns else default
+    frame = frame.dropna(subset=list(REQUIRED_COLUMNS)).reset_index(drop=True)
+
+    unknown = sorted(set(frame['surface']) - set(surfaces))
+    if unknown:
+        raise ValueError(f"No daily traffic given for surface(s): {', '.join(map(str, unknown))}")
+    if ((frame['traffic_share'] <= 0) | (frame['traffic_share'] > 100)).any():
+        raise ValueError("traffic_share must be in (0, 100]")
+
+    frame['daily_traffic'] = frame['surface'].map(surfaces).astype(float)
+    frame['required_users'] = required_users(frame['sample_size_per_group'], frame['split'])
+    frame['duration_days'] = np.ceil(
+        frame['required_users'] / (frame['daily_traffic'] * frame['traffic_share'] / 100)
+    ).astype(int)
+    return frame
+
+
+def _schedule_layer(jobs, order):
+    """Event-driven greedy list scheduling of one layer; jobs are row dicts"""
+    if order == "spt":
+        queue = sorted(jobs, key=lambda job: (-job['priority'], job['duration_days']))
+    else:
+        queue = sorted(jobs, key=lambda job: (-job['priority'], -job['duration_days']))
+
+    capacity, now, running, placed = 100.0, 0, [], []
+    while queue:
+        # Start everything that fits, in queue order (later, smaller jobs may backfill)
+        for job in list(queue):
+            if job['traffic_share'] <= capacity + 1e-9:
+                capacity -= job['traffic_share']
+                heapq.heappush(running, (now + job['duration_days'], len(placed), job['traffic_share']))
+                placed.append({**job, 'start_day': now, 'end_day': now + job['duration_days']})
+                queue.remove(job)
+        if not queue:
+            break
+        # Advance to the next completion and release its traffic (plus any finishing together)
+        now, _, share = heapq.heappop(running)
+        capacity += share
+        while running and running[0][0] == now:
+            capacity += heapq.heappop(running)[2]
+    return placed
+
+
+def schedule_portfolio(experiments, surfaces, start=None, order="lpt"):
+    """Schedule every experiment; returns ``(schedule, summary)``
+
+    ``order`` is ``"lpt"`` (longest first within a priority; shortest calendar)
+    or ``"spt"`` (shortest first; results arrive sooner on average). The
+    schedule has one row per experiment with start/end days and dates.
+    """
+    frame = prepare_portfolio(experiments, surfaces)
+    start = date.fromisoformat(start) if isinstance(start, str) else (start or date.today())
+
+    placed = []
+    for _, layer in frame.groupby(['surface', 'layer'], sort=False):
+        placed += _schedule_layer(layer.to_dict('records'), order)
+
+    schedule = pd.DataFrame(placed)
+    if schedule.empty:
+        return schedule, {'experiments': 0, 'makespan_days': 0, 'sequential_days': 0, 'mean_completion_days': 0.0}
+    schedule['start_date'] = [start + timedelta(days=int(day)) for day in schedule['start_day']]
+    schedule['end_date'] = [start + timedelta(days=int(day)) for day in schedule['end_day']]
+    schedule = schedule.sort_values(['start_day', 'surface', 'layer', 'name']).reset_index(drop=True)
+
+    summary = {
+        'experiments': len(schedule),
+        'makespan_days': int(schedule['end_day'].max()),
+        # Calendar time if every experiment ran one after another at its requested share
+        'sequential_days': int(schedule['duration_days'].sum()),
+        'mean_completion_days': float(schedule['end_day'].mean()),
+        'end_date': start + timedelta(days=int(schedule['end_day'].max())),
+    }
+    return schedule, summary
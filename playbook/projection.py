@@ -0,0 +1,117 @@
+"""Multi-scenario ROI projection over rollout strategies.
+
+Each rollout strategy is an exposure schedule: the share of eligible traffic
+receiving the treatment in each month. Net value is projected for every
+combination of strategy, effect size (CI lower bound / point estimate / CI
+upper bound), monthly effect decay (novelty wearing off) and cost multiplier
+as one broadcast array of shape ``(strategy, effect, decay, cost, month)``,
+so a whole comparison grid costs a single NumPy expression.
+"""
+import numpy as np
+import pandas as pd
+
+HORIZON_MONTHS = 24
+
+# Keys match the rollout options offered in the decision phase
+ROLLOUT_SCHEDULES = {
+    "Staged rollout (10% → 50% → 100%)": (0.10, 0.50, 1.0),
+    "Holdout control (keep 5-10%)": (0.925,),
+    "Geo / cohort phased launch": (0.25, 0.50, 0.75, 1.0),
+    "Dark launch (behind feature flag)": (0.0, 1.0),
+    "Do not roll out": (0.0,),
+}
+
+DEFAULT_DECAYS = (0.0, 0.02, 0.05, 0.10)
+DEFAULT_COST_MULTIPLIERS = (0.75, 1.0, 1.5)
+
+
+def exposure_schedule(ramp, months=HORIZON_MONTHS):
+    """Monthly exposure shares: the ramp, then its last value held to the horizon"""
+    ramp = np.asarray(ramp, dtype=float)[:months]
+    return np.concatenate([ramp, np.full(months - len(ramp), ramp[-1])])
+
+
+def project_rollouts(monthly_users, value_per_conversion, effects, implementation_cost=10_000,
+                     ongoing_cost_monthly=0, schedules=None, decays=DEFAULT_DECAYS,
+                     cost_multipliers=DEFAULT_COST_MULTIPLIERS, months=HORIZON_MONTHS):
+    """Monthly and cumulative net value for every scenario in the grid
+
+    ``effects`` maps labels to absolute conversion-rate lifts (proportions),
+    e.g. the CI bounds and the point estimate. A strategy that never exposes
+    anyone incurs no costs. Returns a dict with the grid axes and
+    ``monthly_net`` / ``cumulative_net`` arrays of shape
+    ``(strategy, effect, decay, cost, month)``.
+    """
+    schedules = schedules or ROLLOUT_SCHEDULES
+    names = list(schedules)
+    exposure = np.stack([exposure_schedule(schedules[name], months) for name in names])  # (S, M)
+    launched = np.cumsum(exposure > 0, axis=1) > 0                                        # (S, M)
+    ever_launched = launched[:, -1]                                                       # (S,)
+
+    effect = np.asarray(list(effects.values()), dtype=float)                               # (E,)
+    decay = np.asarray(decays, dtype=float)                                               # (D,)
+    cost = np.asarray(cost_multipliers, dtype=float)                                      # (C,)
+    month = np.arange(months)                                                             # (M,)
+
+    decay_factor = (1 - decay[:, None]) ** month                                          # (D, M)
+    value = (monthly_users * value_per_conversion
+             * exposure[:, None, None, None, :]
+             * effect[None, :, None, None, None]
+             * decay_factor[None, None, :, None, :])
+    costs = cost[None, None, None, :, None] * (
+        ongoing_cost_monthly * launched[:, None, None, None, :]
+        + implementation_cost * ((month == 0) & ever_launched[:, None])[:, None, None, None, :]
+    )
+    monthly_net = value - costs
+    return {
+        'strategies': names,
+        'effects': list(effects),
+        'decays': decay,
+        'cost_multipliers': cost,
+        'months': month + 1,
+        'exposure': exposure,
+        'monthly_net': monthly_net,
+        'cumulative_net': np.cumsum(monthly_net, axis=-1),
+    }
+
+
+def breakeven_months(cumulative_net):
+    """First month (1-based) with non-negative cumulative net, NaN if never"""
+    positive = cumulative_net >= 0
+    first = positive.argmax(axis=-1) + 1.0
+    return np.where(positive.any(axis=-1), first, np.nan)
+
+
+def projection_frame(projection):
+    """Tidy long-format table of a projection, one row per scenario and month"""
+    shape = projection['monthly_net'].shape
+    index = pd.MultiIndex.from_product(
+        [projection['strategies'], projection['effects'], projection['decays'],
+         projection['cost_multipliers'], projection['months']],
+        names=['strategy', 'effect', 'monthly_decay', 'cost_multiplier', 'month'],
+    )
+    exposure = np.broadcast_to(projection['exposure'][:, None, None, None, :], shape)
+    return pd.DataFrame({
+        'exposure': exposure.ravel(),
+        'monthly_net': projection['monthly_net'].ravel(),
+        'cumulative_net': projection['cumulative_net'].ravel(),
+    }, index=index).reset_index()
+
+
+def scenario_summary(projection):
+    """Per-strategy range of the final cumulative net and breakeven across the grid
+
+    ``share_positive`` is the fraction of grid scenarios ending above zero and
+    a ``median_breakeven_month`` of ``inf`` means most scenarios never break even.
+    """
+    final = projection['cumulative_net'][..., -1]
+    flat = final.reshape(len(projection['strategies']), -1)
+    breakeven = breakeven_months(projection['cumulative_net']).reshape(flat.shape)
+    return pd.DataFrame({
+        'strategy': projection['strategies'],
+        'worst_net': flat.min(axis=1),
+        'median_net': np.median(flat, axis=1),
+        'best_net': flat.max(axis=1),
+        'share_positive': (flat > 0).mean(axis=1),
+        'median_breakeven_month': np.median(np.where(np.isnan(breakeven), np.inf, breakeven), axis=1),
+    })
@@ -0,0 +1,290 @@
+"""Data-quality scan of raw exposure logs: duplicates, cross-arm users and bots.
+
+Totals can pass an SRM check while the rows behind them are untrustworthy.
+This module scans the exposure log itself (one row per exposure, with a user
+id and a variant, optionally a timestamp) and reports:
+
+* **duplicate exposures**: repeated (user, variant, timestamp) records, i.e.
+  double-fired logging. Without a timestamp column every repeat exposure of
+  a user to the same variant counts as a duplicate.
+* **cross-arm users**: users exposed to more than one variant, whose outcome
+  cannot be attributed to either arm.
+* **bot-like users**: users whose exposure count is a robust outlier
+  (``BOT_MAD_MULTIPLE`` median absolute deviations above the median in log
+  space, and at least ``BOT_MIN_EVENTS``), or, with timestamps, who exceed
+  ``BOT_MAX_PER_MINUTE`` exposures per minute over their active span.
+
+Users flagged as cross-arm or bot-like are the exclusions; the per-variant
+report counts them, their rows and the clean users that remain.
+
+The scan is a hash-partition aggregation with bounded memory. Each chunk of
+the CSV is reduced to fixed-width records (a 64-bit hash of the user, a
+variant code and the timestamp) and routed to one of ``partitions`` buckets
+by user hash, so every record of a user lands in the same bucket. Buckets are buffered in memory and spilled to temporary files
+past ``spill_bytes``; each bucket is then grouped on its own with hash tables
+(``pd.factorize`` and ``duplicated``), so peak memory is one chunk plus one
+bucket, whatever the size of the log. With 64-bit hashes, the chance that any
+two of 100M distinct users collide is about 1 in 4,000.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .livelog import VARIANT_COLUMNS
+from .ratio import DEFAULT_CHUNKSIZE, iter_csv_chunks
+
+USER_COLUMNS = ("user_id", "user", "uid", "visitor_id", "client_id", "unit_id")
+TIME_COLUMNS = ("timestamp", "ts", "time", "event_time", "exposed_at")
+
+DEFAULT_PARTITIONS = 64
+SPILL_BYTES = 256 * 2**20
+# Bot heuristics: count outliers in log space, and sustained exposure rates
+BOT_MIN_EVENTS = 50
+BOT_MAD_MULTIPLE = 6.0
+BOT_MAX_PER_MINUTE = 30.0
+
+RECORD = np.dtype([('user', '<u8'), ('variant', 'u1'), ('time', '<i8')])
+MISSING_TIME = np.iinfo(np.int64).min
+MISSING_USER_HASH = np.uint64(pd.util.hash_array(np.array([np.nan]))[0])
+COUNT_FIELDS = ("rows", "duplicate_rows", "users", "mixed_users", "mixed_rows", "bot_users", "bot_rows",
+                "excluded_users", "excluded_rows", "clean_users")
+
+
+def guess_log_columns(header):
+    """``{'user', 'variant', 'timestamp'}`` names among ``header``, None where nothing matches"""
+    lowered = {str(column).strip().lower(): column for column in header}
+
+    def pick(candidates):
+        return next((lowered[name] for name in candidates if name in lowered), None)
+
+    return {'user': pick(USER_COLUMNS), 'variant': pick(VARIANT_COLUMNS), 'timestamp': pick(TIME_COLUMNS)}
+
+
+def find_log_columns(source):
+    """:func:`guess_log_columns` for a CSV path or seekable file; user and variant are required"""
+    header = pd.read_csv(source, nrows=0).columns
+    if hasattr(source, "seek"):
+        source.seek(0)
+    columns = guess_log_columns(header)
+    for role, candidates in (('user', USER_COLUMNS), ('variant', VARIANT_COLUMNS)):
+        if columns[role] is None:
+            raise ValueError(f"No {role} column (expected one of: {', '.join(candidates)})")
+    return columns
+
+
+def to_nanoseconds(values):
+    """Nanoseconds since the epoch; numbers are Unix seconds, unparsable values are missing"""
+    if pd.api.types.is_numeric_dtype(values):
+        parsed = pd.to_datetime(values, unit="s", errors="coerce")
+    else:
+        parsed = pd.to_datetime(values, errors="coerce", utc=True).dt.tz_localize(None)
+    return parsed.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+def hash_users(values):
+    """64-bit hash per user id
+
+    Integer ids hash exactly as 64-bit integers, so ids above 2**53 stay
+    distinct. Whole-number floats (an integer column with gaps, read without
+    nullable types) are hashed as integers too, so 123 and 123.0 match;
+    missing ids share :data:`MISSING_USER_HASH`.
+    """
+    if pd.api.types.is_float_dtype(values):
+        present = values.dropna()
+        if (present == np.floor(present)).all() and (present.abs() < 2.0**63).all():
+            values = values.astype("Int64")
+    if pd.api.types.is_integer_dtype(values):
+        unsigned = pd.api.types.is_unsigned_integer_dtype(values)
+        # Equal bit patterns hash alike, so an id hashes the same from int64 and uint64 chunks
+        hashed = pd.util.hash_array(values.to_numpy(dtype=np.uint64 if unsigned else np.int64, na_value=0))
+        hashed[values.isna().to_numpy()] = MISSING_USER_HASH
+        return hashed
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.util.hash_array(values.to_numpy(dtype=float, na_value=np.nan))
+    return pd.util.hash_array(values.astype(str).to_numpy(dtype=object), categorize=False)
+
+
+def to_records(frame, user, variant, timestamp, variants):
+    """Fixed-width :data:`RECORD` array of one chunk; ``variants`` maps names to codes and grows"""
+    # Rows without a variant get their own "nan" variant rather than vanishing from the counts
+    codes, uniques = pd.factorize(frame[variant], use_na_sentinel=False)
+    for name in uniques:
+        variants.setdefault(str(name), len(variants))
+    if len(variants) > np.iinfo(np.uint8).max:
+        raise ValueError("More than 255 distinct variants; is the variant column right?")
+
+    records = np.empty(len(frame), dtype=RECORD)
+    records['user'] = hash_users(frame[user])
+    records['variant'] = np.array([variants[str(name)] for name in uniques], dtype=np.uint8)[codes]
+    records['time'] = to_nanoseconds(frame[timestamp]) if timestamp else MISSING_TIME
+    return records
+
+
+class HashPartitions:
+    """Structured records bucketed by their ``'user'`` hash field
+
+    Buckets are kept in memory up to ``spill_bytes`` and appended to temporary
+    files beyond; iterating yields one bucket at a time.
+    """
+
+    def __init__(self, partitions=DEFAULT_PARTITIONS, spill_bytes=SPILL_BYTES, spill_dir=None):
+        self.partitions = partitions
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        self.buffers = [[] for _ in range(partitions)]
+        self.buffered = 0
+        self.dtype = None
+        self.tempdir = None
+
+    def add(self, records):
+        self.dtype = records.dtype
+        bucket = (records['user'] % np.uint64(self.partitions)).astype(np.uint16)
+        # A stable sort on a small integer key is a radix sort, linear in the chunk
+        order = np.argsort(bucket, kind="stable")
+        bounds = np.searchsorted(bucket[order], np.arange(self.partitions + 1))
+        records = records[order]
+        for index in range(self.partitions):
+            if bounds[index + 1] > bounds[index]:
+                self.buffers[index].append(records[bounds[index]:bounds[index + 1]])
+        self.buffered += records.nbytes
+        if self.buffered > self.spill_bytes:
+            self._spill()
+
+    def _path(self, index):
+        return os.path.join(self.tempdir.name, f"{index}.bin")
+
+    def _spill(self):
+        if self.tempdir is None:
+            self.tempdir = tempfile.TemporaryDirectory(prefix="ab_quality_", dir=self.spill_dir)
+        for index, buffer in enumerate(self.buffers):
+            if buffer:
+                with open(self._path(index), "ab") as handle:
+                    for records in buffer:
+                        records.tofile(handle)
+                buffer.clear()
+        self.buffered = 0
+
+    def __iter__(self):
+        """Each non-empty bucket as one array, spilled part first; temporary files are removed"""
+        try:
+            for index in range(self.partitions):
+                parts, self.buffers[index] = self.buffers[index], []
+                if self.tempdir is not None and os.path.exists(self._path(index)):
+                    parts.insert(0, np.fromfile(self._path(index), dtype=self.dtype))
+                    os.remove(self._path(index))
+                if parts:
+                    yield np.concatenate(parts)
+        finally:
+            if self.tempdir is not None:
+                self.tempdir.cleanup()
+
+
+def _scan_partition(records, n_variants, totals, histogram, candidates):
+    """Fold one bucket into the per-variant ``totals``; keep users who may be bots in ``candidates``
+
+    Returns the number of distinct cross-arm users in the bucket.
+    """
+    user_codes, users = pd.factorize(records['user'])
+    variant = records['variant'].astype(np.intp)
+    counts = np.bincount(user_codes * n_variants + variant,
+                         minlength=len(users) * n_variants).reshape(len(users), n_variants)
+    present = counts > 0
+    mixed = present.sum(axis=1) > 1
+    duplicate = pd.DataFrame({'user': user_codes, 'variant': variant, 'time': records['time']}).duplicated()
+
+    totals['rows'] += np.bincount(variant, minlength=n_variants)
+    totals['duplicate_rows'] += np.bincount(variant[duplicate.to_numpy()], minlength=n_variants)
+    totals['users'] += present.sum(axis=0)
+    totals['mixed_users'] += present[mixed].sum(axis=0)
+    totals['mixed_rows'] += counts[mixed].sum(axis=0)
+
+    events = counts.sum(axis=1)
+    block = np.bincount(events)
+    if len(block) > len(histogram):
+        histogram.resize(len(block), refcheck=False)
+    histogram[:len(block)] += block
+
+    # Only users above the event floor can be bots; their exposure rates need the time span
+    possible = np.flatnonzero(events >= BOT_MIN_EVENTS)
+    if len(possible):
+        rows = np.isin(user_codes, possible) & (records['time'] != MISSING_TIME)
+        spans = pd.Series(records['time'][rows]).groupby(user_codes[rows]).agg(["min", "max"])
+        minutes = (spans['max'] - spans['min']).reindex(possible).to_numpy(dtype=float) / 60e9
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(np.isnan(minutes), 0.0, (events[possible] - 1) / minutes)
+        candidates.append((counts[possible], events[possible], rate, mixed[possible]))
+    return int(mixed.sum())
+
+
+def _count_fence(histogram):
+    """Exposure count above which a user is an outlier: median + k MADs of the log counts"""
+    values = np.flatnonzero(histogram)
+    if not len(values):
+        return float(BOT_MIN_EVENTS)
+    weights = histogram[values]
+
+    def weighted_median(points):
+        order = np.argsort(points)
+        cumulative = np.cumsum(weights[order])
+        return points[order][np.searchsorted(cumulative, cumulative[-1] / 2)]
+
+    logs = np.log(values)
+    median = weighted_median(logs)
+    mad = 1.4826 * weighted_median(np.abs(logs - median))
+    return max(float(BOT_MIN_EVENTS), float(np.exp(median + BOT_MAD_MULTIPLE * mad)))
+
+
+def scan_exposures(source, user=None, variant=None, timestamp=None, partitions=DEFAULT_PARTITIONS,
+                   chunksize=DEFAULT_CHUNKSIZE, spill_bytes=SPILL_BYTES, spill_dir=None):
+    """Data-quality report of an exposure-level CSV in one streaming pass
+
+    Columns default to the first match in :data:`USER_COLUMNS`,
+    ``VARIANT_COLUMNS`` and :data:`TIME_COLUMNS`; pass ``timestamp=False`` to
+    ignore timestamps. Returns overall counts (distinct users) and, under
+    ``'variants'``, the :data:`COUNT_FIELDS` of every variant (a cross-arm
+    user counts in each arm it saw).
+    """
+    if user is None or variant is None or timestamp is None:
+        found = find_log_columns(source)
+        user, variant = user or found['user'], variant or found['variant']
+        timestamp = found['timestamp'] if timestamp is None else timestamp
+
+    variants, rows = {}, 0
+    buckets = HashPartitions(partitions, spill_bytes, spill_dir)
+    for chunk in iter_csv_chunks(source, [user, variant] + ([timestamp] if timestamp else []), chunksize, [user]):
+        buckets.add(to_records(chunk, user, variant, timestamp, variants))
+        rows += len(chunk)
+
+    n_variants = len(variants)
+    totals = {field: np.zeros(n_variants, dtype=np.int64) for field in COUNT_FIELDS[:5]}
+    histogram, candidates, mixed_users = np.zeros(1, dtype=np.int64), [], 0
+    for records in buckets:
+        mixed_users += _scan_partition(records, n_variants, totals, histogram, candidates)
+
+    fence = _count_fence(histogram)
+    counts, events, rate, mixed = (
+        (np.concatenate(parts) for parts in zip(*candidates)) if candidates
+        else (np.zeros((0, n_variants), dtype=np.int64), np.zeros(0), np.zeros(0), np.zeros(0, dtype=bool))
+    )
+    bot = (events > fence) | (rate > BOT_MAX_PER_MINUTE)
+    # A cross-arm bot is excluded once, as cross-arm
+    bot_only = bot & ~mixed
+    totals['bot_users'] = (counts[bot] > 0).sum(axis=0)
+    totals['bot_rows'] = counts[bot].sum(axis=0)
+    totals['excluded_users'] = totals['mixed_users'] + (counts[bot_only] > 0).sum(axis=0)
+    totals['excluded_rows'] = totals['mixed_rows'] + counts[bot_only].sum(axis=0)
+    totals['clean_users'] = totals['users'] - totals['excluded_users']
+
+    return {
+        'rows': rows,
+        'users': int(histogram.sum()),
+        'duplicate_rows': int(totals['duplicate_rows'].sum()),
+        'mixed_users': mixed_users,
+        'bot_users': int(bot.sum()),
+        'excluded_users': mixed_users + int(bot_only.sum()),
+        'bot_event_fence': fence,
+        'bot_rate_limit': BOT_MAX_PER_MINUTE if timestamp else None,
+        'variants': {name: {field: int(totals[field][code]) for field in COUNT_FIELDS} for name, code in variants.items()},
+    }
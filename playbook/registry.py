@@ -0,0 +1,395 @@
+"""Persistent experiment registry backed by a local SQLite file.
+
+Designs, daily snapshots, analysis results, rollout decisions and resumable
+app sessions survive browser refreshes and worker restarts. Writes are queued to a single
+background thread so callers (the Streamlit render thread in particular)
+never wait on disk; experiment ids are generated client-side for the same
+reason. Reads use per-thread connections and WAL mode, so they are never
+blocked by the writer.
+"""
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiments (
+    id          TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    channel     TEXT,
+    metric      TEXT,
+    lifecycle   TEXT,
+    status      TEXT NOT NULL DEFAULT 'design',
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    design      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_experiments_channel ON experiments (channel, created_at);
+CREATE INDEX IF NOT EXISTS idx_experiments_metric ON experiments (metric, created_at);
+CREATE INDEX IF NOT EXISTS idx_experiments_lifecycle ON experiments (lifecycle, created_at);
+CREATE INDEX IF NOT EXISTS idx_experiments_status ON experiments (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_experiments_created ON experiments (created_at);
+CREATE INDEX IF NOT EXISTS idx_experiments_updated ON experiments (updated_at);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    experiment_id  TEXT NOT NULL REFERENCES experiments (id) ON DELETE CASCADE,
+    day            TEXT NOT NULL,
+    control_n      INTEGER NOT NULL,
+    control_x      INTEGER NOT NULL,
+    treatment_n    INTEGER NOT NULL,
+    treatment_x    INTEGER NOT NULL,
+    PRIMARY KEY (experiment_id, day)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_day ON snapshots (day);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    experiment_id  TEXT NOT NULL REFERENCES experiments (id) ON DELETE CASCADE,
+    created_at     TEXT NOT NULL,
+    p_value        REAL,
+    relative_lift  REAL,
+    results        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_experiment ON analyses (experiment_id, created_at);
+
+CREATE TABLE IF NOT EXISTS decisions (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    experiment_id  TEXT NOT NULL REFERENCES experiments (id) ON DELETE CASCADE,
+    created_at     TEXT NOT NULL,
+    strategy       TEXT NOT NULL,
+    notes          TEXT,
+    impact         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_experiment ON decisions (experiment_id, created_at);
+
+CREATE TABLE IF NOT EXISTS quantile_sketches (
+    experiment_id  TEXT NOT NULL REFERENCES experiments (id) ON DELETE CASCADE,
+    metric         TEXT NOT NULL,
+    day            TEXT NOT NULL,
+    variant        TEXT NOT NULL,
+    sketch         TEXT NOT NULL,
+    PRIMARY KEY (experiment_id, metric, day, variant)
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    token       TEXT PRIMARY KEY,
+    updated_at  TEXT NOT NULL,
+    snapshot    BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+
+CREATE TABLE IF NOT EXISTS log_cursors (
+    path        TEXT PRIMARY KEY,
+    updated_at  TEXT NOT NULL,
+    cursor      TEXT NOT NULL
+);
+"""
+
+# Columns returned by list_experiments (the JSON design blob is left out on purpose)
+SUMMARY_COLUMNS = ("id", "name", "channel", "metric", "lifecycle", "status", "created_at", "updated_at")
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _dumps(value):
+    """JSON encode session data, tolerating dates and NumPy scalars"""
+    def default(obj):
+        if isinstance(obj, (date, datetime)):
+            return obj.isoformat()
+        if hasattr(obj, "item"):
+            return obj.item()
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        return str(obj)
+    return json.dumps(value, default=default)
+
+
+def new_experiment_id():
+    return uuid.uuid4().hex
+
+
+class ExperimentRegistry:
+    """SQLite experiment store with asynchronous, ordered writes"""
+
+    MAX_BATCH = 1000
+
+    def __init__(self, path="experiments.db"):
+        self.path = str(path)
+        self._local = threading.local()
+        self._queue = queue.Queue()
+        self._errors = []
+        self._errors_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+        self._writer = threading.Thread(target=self._write_loop, name="experiment-registry-writer", daemon=True)
+        self._writer.start()
+
+    # -- connections -----------------------------------------------------------------
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    def _write_loop(self):
+        conn = self._connect()
+        stopping = False
+        while not stopping:
+            # Commit everything already queued in one transaction
+            jobs = [self._queue.get()]
+            while len(jobs) < self.MAX_BATCH:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in jobs:
+                stopping = True
+                jobs = [job for job in jobs if job is not _STOP]
+
+            try:
+                with conn:
+                    for job in jobs:
+                        job(conn)
+            except Exception:
+                # Replay one by one so a single bad write doesn't drop its neighbours
+                for job in jobs:
+                    try:
+                        with conn:
+                            job(conn)
+                    except Exception as exc:
+                        logger.error("Registry write failed: %s", exc, exc_info=exc)
+                        with self._errors_lock:
+                            self._errors.append(exc)
+            finally:
+                for _ in range(len(jobs) + stopping):
+                    self._queue.task_done()
+        conn.close()
+
+    def _submit(self, job):
+        self._queue.put(job)
+
+    def take_errors(self):
+        """Writes that failed since the last call (or flush), oldest first; clears them"""
+        with self._errors_lock:
+            errors, self._errors[:] = list(self._errors), []
+        return errors
+
+    def flush(self):
+        """Block until every queued write has been committed; raises the first failed write"""
+        self._queue.join()
+        errors = self.take_errors()
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    # -- writes (asynchronous) -------------------------------------------------------
+
+    def save_design(self, design, experiment_id=None, name=None):
+        """Insert or update an experiment design; returns its id immediately"""
+        experiment_id = experiment_id or new_experiment_id()
+        name = name or f"{design.get('channel', 'Experiment')} · {design.get('metric', 'Untitled')}"
+        payload = _dumps(design)
+        now = _now()
+
+        def job(conn):
+            conn.execute(
+                """
+                INSERT INTO experiments (id, name, channel, metric, lifecycle, created_at, updated_at, design)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name, channel = excluded.channel, metric = excluded.metric,
+                    lifecycle = excluded.lifecycle, updated_at = excluded.updated_at, design = excluded.design
+                """,
+                (experiment_id, name, design.get('channel'), design.get('metric'),
+                 design.get('lifecycle'), now, now, payload),
+            )
+        self._submit(job)
+        return experiment_id
+
+    def record_snapshot(self, experiment_id, day, control_n, control_x, treatment_n, treatment_x):
+        """Store (or replace) the cumulative counts observed on ``day``"""
+        row = (experiment_id, str(day), int(control_n), int(control_x), int(treatment_n), int(treatment_x))
+
+        def job(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)", row
+            )
+        self._submit(job)
+
+    def save_analysis(self, experiment_id, results):
+        payload = _dumps(results)
+        now = _now()
+
+        def job(conn):
+            conn.execute(
+                "INSERT INTO analyses (experiment_id, created_at, p_value, relative_lift, results) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (experiment_id, now, results.get('p_value'), results.get('relative_lift'), payload),
+            )
+            conn.execute(
+                "UPDATE experiments SET status = 'analyzed', updated_at = ? WHERE id = ? AND status = 'design'",
+                (now, experiment_id),
+            )
+        self._submit(job)
+
+    def record_decision(self, experiment_id, strategy, notes="", impact=None):
+        payload = _dumps(impact or {})
+        now = _now()
+
+        def job(conn):
+            conn.execute(
+                "INSERT INTO decisions (experiment_id, created_at, strategy, notes, impact) VALUES (?, ?, ?, ?, ?)",
+                (experiment_id, now, strategy, notes, payload),
+            )
+            conn.execute(
+                "UPDATE experiments SET status = 'decided', updated_at = ? WHERE id = ?", (now, experiment_id)
+            )
+        self._submit(job)
+
+    def save_log_cursor(self, path, cursor):
+        """Persist a live-log cursor (offset, header and running per-variant totals)"""
+        payload = _dumps(cursor)
+        now = _now()
+        self._submit(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO log_cursors (path, updated_at, cursor) VALUES (?, ?, ?)", (path, now, payload)
+        ))
+
+    def save_sketches(self, experiment_id, metric, day, sketches):
+        """Store (or replace) one day's per-variant quantile sketches of ``metric``
+
+        ``sketches`` maps variant to a JSON-ready sketch (``TDigest.to_dict()``).
+        """
+        rows = [(experiment_id, metric, str(day), str(variant), _dumps(sketch))
+                for variant, sketch in sketches.items()]
+        self._submit(lambda conn: conn.executemany(
+            "INSERT OR REPLACE INTO quantile_sketches VALUES (?, ?, ?, ?, ?)", rows
+        ))
+
+    def save_session(self, token, snapshot):
+        """Store (or replace) an encoded session snapshot (see :mod:`playbook.session`)"""
+        now = _now()
+        self._submit(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO sessions (token, updated_at, snapshot) VALUES (?, ?, ?)",
+            (token, now, sqlite3.Binary(snapshot)),
+        ))
+
+    def prune_sessions(self, before):
+        """Drop session snapshots last written before ``before`` (ISO timestamp)"""
+        self._submit(lambda conn: conn.execute("DELETE FROM sessions WHERE updated_at < ?", (str(before),)))
+
+    def delete_experiment(self, experiment_id):
+        self._submit(lambda conn: conn.execute("DELETE FROM experiments WHERE id = ?", (experiment_id,)))
+
+    # -- reads -----------------------------------------------------------------------
+
+    @staticmethod
+    def _filters(channel=None, metric=None, lifecycle=None, status=None, since=None, until=None):
+        clauses, params = [], []
+        for column, value in (("channel", channel), ("metric", metric),
+                              ("lifecycle", lifecycle), ("status", status)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(str(since))
+        if until:
+            clauses.append("created_at < ?")
+            params.append(str(until))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def list_experiments(self, limit=100, offset=0, **filters):
+        """Newest-first experiment summaries matching the given filters"""
+        where, params = self._filters(**filters)
+        rows = self._reader().execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM experiments{where} "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (*params, int(limit), int(offset)),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_experiments(self, **filters):
+        where, params = self._filters(**filters)
+        return self._reader().execute(f"SELECT COUNT(*) FROM experiments{where}", params).fetchone()[0]
+
+    def distinct_values(self, column):
+        """Values present in an indexed summary column, for filter dropdowns"""
+        if column not in ("channel", "metric", "lifecycle", "status"):
+            raise ValueError(f"Unsupported column {column!r}")
+        rows = self._reader().execute(
+            f"SELECT DISTINCT {column} FROM experiments WHERE {column} IS NOT NULL ORDER BY {column}"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def load_log_cursor(self, path):
+        row = self._reader().execute("SELECT cursor FROM log_cursors WHERE path = ?", (path,)).fetchone()
+        return json.loads(row['cursor']) if row else None
+
+    def load_session(self, token):
+        """Encoded snapshot stored under ``token`` (or None)"""
+        row = self._reader().execute("SELECT snapshot FROM sessions WHERE token = ?", (token,)).fetchone()
+        return bytes(row['snapshot']) if row else None
+
+    def load_sketches(self, experiment_id, metric=None):
+        """Stored quantile sketches as ``[{metric, day, variant, sketch}]`` ordered by day"""
+        query = "SELECT metric, day, variant, sketch FROM quantile_sketches WHERE experiment_id = ?"
+        params = [experiment_id]
+        if metric:
+            query += " AND metric = ?"
+            params.append(metric)
+        rows = self._reader().execute(query + " ORDER BY metric, day, variant", params).fetchall()
+        return [{**dict(row), 'sketch': json.loads(row['sketch'])} for row in rows]
+
+    def load_experiment(self, experiment_id):
+        """Design, latest analysis, snapshots and decisions for one experiment (or None)"""
+        conn = self._reader()
+        row = conn.execute("SELECT * FROM experiments WHERE id = ?", (experiment_id,)).fetchone()
+        if row is None:
+            return None
+
+        experiment = {key: row[key] for key in SUMMARY_COLUMNS}
+        experiment['design'] = json.loads(row['design'])
+
+        analysis = conn.execute(
+            "SELECT results FROM analyses WHERE experiment_id = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            (experiment_id,),
+        ).fetchone()
+        experiment['analysis'] = json.loads(analysis['results']) if analysis else None
+
+        experiment['snapshots'] = [
+            dict(snapshot) for snapshot in conn.execute(
+                "SELECT day, control_n, control_x, treatment_n, treatment_x FROM snapshots "
+                "WHERE experiment_id = ? ORDER BY day", (experiment_id,)
+            )
+        ]
+        experiment['decisions'] = [
+            {**dict(decision), 'impact': json.loads(decision['impact'] or "{}")}
+            for decision in conn.execute(
+                "SELECT created_at, strategy, notes, impact FROM decisions "
+                "WHERE experiment_id = ? ORDER BY created_at", (experiment_id,)
+            )
+        ]
+        return experiment
@@ -0,0 +1,56 @@
+"""Compact snapshots of an app session, for resuming it from a URL token.
+
+A snapshot is a plain dict (widget values, the experiment design and computed
+results). It is stored as zlib-compressed JSON under a short random token that
+travels in the page URL, so a refresh, a worker restart or a shared link
+brings back the same inputs and results without recomputing them. Dates are
+tagged so date widgets get ``date`` objects back; NumPy values are stored as
+plain numbers and lists and anything else as its string form.
+"""
+import json
+import secrets
+import zlib
+from datetime import date, datetime
+
+TOKEN_BYTES = 12
+COMPRESSION_LEVEL = 6
+
+
+def new_session_token():
+    """URL-safe random token (16 characters)"""
+    return secrets.token_urlsafe(TOKEN_BYTES)
+
+
+def _default(obj):
+    if isinstance(obj, datetime):
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'__date__': obj.isoformat()}
+    if hasattr(obj, "item") and getattr(obj, "ndim", 0) == 0:
+        return obj.item()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+def _restore(obj):
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def encode_snapshot(snapshot):
+    """Compressed JSON bytes of a snapshot dict"""
+    payload = json.dumps(snapshot, default=_default, separators=(",", ":"), allow_nan=True)
+    return zlib.compress(payload.encode(), COMPRESSION_LEVEL)
+
+
+def decode_snapshot(blob):
+    """Inverse of :func:`encode_snapshot`; ValueError for a corrupt blob"""
+    try:
+        payload = zlib.decompress(blob)
+    except zlib.error as exc:
+        raise ValueError(f"Corrupt session snapshot: {exc}") from exc
+    return json.loads(payload, object_hook=_restore)
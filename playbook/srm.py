@@ -0,0 +1,195 @@
+"""Time-series sample ratio mismatch (SRM) monitoring for any number of arms.
+
+Assignment counts arrive as a ``(intervals, arms)`` matrix (one row per day or
+hour). Per-interval and cumulative chi-square goodness-of-fit statistics are
+computed for every row in one vectorized pass, so months of hourly data take
+milliseconds and the check can run unattended (see ``ab_srm.py``).
+
+Every interval and every running total is a test, so ``alpha`` is split
+evenly between the two families and each is Bonferroni-corrected over the
+planned number of intervals (the ``horizon``): ``alpha / (2 * horizon)``.
+Fixing the horizon up front keeps every threshold the same no matter when the
+check runs, so a monitor re-run after each new interval stays within
+``alpha`` family-wise over the whole horizon. Without one, the horizon is the
+number of intervals present, which is only valid for a single final check.
+It is conservative, but SRM from a real assignment bug keeps growing with the
+sample, so it is still caught quickly.
+"""
+import numpy as np
+import pandas as pd
+
+from .stats import chi2_sf
+
+DEFAULT_ALPHA = 0.001
+
+
+def _expected_shares(expected, arms):
+    if expected is None:
+        return np.full(arms, 1.0 / arms)
+    shares = np.asarray(expected, dtype=float)
+    if shares.shape != (arms,) or (shares <= 0).any():
+        raise ValueError(f"Expected allocation needs {arms} positive weights, got {list(np.atleast_1d(expected))}")
+    return shares / shares.sum()
+
+
+def chi2_rows(counts, shares):
+    """Goodness-of-fit chi-square of every row against ``shares``; empty rows are NaN"""
+    totals = counts.sum(axis=1, keepdims=True)
+    expected = totals * shares
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2_stat = ((counts - expected) ** 2 / expected).sum(axis=1)
+    chi2_stat[totals[:, 0] == 0] = np.nan
+    return chi2_stat
+
+
+def srm_series(counts, expected=None):
+    """Per-interval and cumulative chi-square statistics and p-values
+
+    ``counts`` is ``(intervals, arms)``; ``expected`` the allocation weights
+    (equal split by default). Returns a dict of 1-D arrays.
+    """
+    counts = np.asarray(counts, dtype=float)
+    if counts.ndim != 2 or counts.shape[1] < 2:
+        raise ValueError("Counts must be a 2-D (intervals, arms) array with at least two arms")
+    shares = _expected_shares(expected, counts.shape[1])
+    df = counts.shape[1] - 1
+
+    cumulative = np.cumsum(counts, axis=0)
+    chi2_interval = chi2_rows(counts, shares)
+    chi2_cumulative = chi2_rows(cumulative, shares)
+    return {
+        'n': counts.sum(axis=1),
+        'chi2': chi2_interval,
+        'p_value': chi2_sf(chi2_interval, df),
+        'cum_n': cumulative.sum(axis=1),
+        'cum_chi2': chi2_cumulative,
+        'cum_p_value': chi2_sf(chi2_cumulative, df),
+        'cum_share': cumulative / cumulative.sum(axis=1, keepdims=True).clip(min=1),
+    }
+
+
+def _first(mask):
+    hits = np.flatnonzero(mask)
+    return int(hits[0]) if len(hits) else None
+
+
+def likely_onset(counts, shares, end):
+    """Start of the window ending at ``end`` with the strongest mismatch
+
+    An imbalance that begins at interval ``s`` makes the window ``[s, end]``
+    the most extreme: earlier starts dilute it with clean traffic, later ones
+    lose sample. All candidate starts are scored at once from cumulative sums.
+    """
+    cumulative = np.cumsum(np.asarray(counts, dtype=float)[:end + 1], axis=0)
+    before = np.vstack([np.zeros((1, cumulative.shape[1])), cumulative[:-1]])
+    return int(np.nanargmax(chi2_rows(cumulative[-1] - before, shares)))
+
+
+def srm_monitor(counts, expected=None, alpha=DEFAULT_ALPHA, horizon=None):
+    """Run the SRM monitor and locate the first bad interval
+
+    ``horizon`` is the planned number of intervals (default: those in
+    ``counts``); counts beyond it are a ValueError, since later tests would
+    exceed the alpha budget. Returns a dict with the per-interval arrays from
+    :func:`srm_series`, the per-test ``threshold`` (``alpha / (2 * horizon)``),
+    boolean ``flagged`` / ``cum_flagged`` arrays and the positions of
+    ``first_bad_interval`` (first interval whose own counts fail),
+    ``first_detection`` (first interval at which the cumulative test fails)
+    and ``likely_onset`` (where the mismatch most plausibly started), each
+    None when clean.
+    """
+    series = srm_series(counts, expected)
+    intervals = len(series['n'])
+    horizon = max(intervals, 1) if horizon is None else int(horizon)
+    if intervals > horizon:
+        raise ValueError(f"{intervals} intervals exceed the planned horizon of {horizon}; "
+                         "raise the horizon only before monitoring starts")
+    # Half of alpha for the per-interval tests, half for the running totals
+    threshold = alpha / (2 * horizon)
+
+    with np.errstate(invalid="ignore"):
+        flagged = series['p_value'] < threshold
+        cum_flagged = series['cum_p_value'] < threshold
+
+    first_detection = _first(cum_flagged)
+    onset = None
+    if first_detection is not None:
+        onset = likely_onset(counts, _expected_shares(expected, np.shape(counts)[1]), first_detection)
+
+    return {
+        **series,
+        'alpha': alpha,
+        'horizon': horizon,
+        'threshold': threshold,
+        'flagged': flagged,
+        'cum_flagged': cum_flagged,
+        'first_bad_interval': _first(flagged),
+        'first_detection': first_detection,
+        'likely_onset': onset,
+        'srm_detected': bool(cum_flagged.any() or flagged.any()),
+        'final_p_value': float(series['cum_p_value'][-1]) if intervals else float("nan"),
+    }
+
+
+def load_assignment_counts(source):
+    """Read assignment counts into a time-indexed DataFrame with one column per arm
+
+    Accepts wide CSVs (``timestamp, control, treatment, ...``) and long ones
+    (``timestamp, arm, count``). Rows for the same timestamp are summed.
+    """
+    frame = pd.read_csv(source)
+    time_column = frame.columns[0]
+    frame[time_column] = pd.to_datetime(frame[time_column], errors="coerce")
+    frame = frame[frame[time_column].notna()]
+
+    text_columns = [c for c in frame.columns[1:] if not pd.api.types.is_numeric_dtype(frame[c])]
+    if text_columns:
+        value_columns = frame.select_dtypes("number").columns
+        if not len(value_columns):
+            raise ValueError("Long-format counts need a numeric count column")
+        wide = frame.pivot_table(index=time_column, columns=text_columns[0], values=value_columns[0],
+                                 aggfunc="sum", fill_value=0)
+    else:
+        wide = frame.groupby(time_column).sum()
+
+    if wide.shape[1] < 2:
+        raise ValueError("Need assignment counts for at least two arms")
+    wide.columns = [str(c) for c in wide.columns]
+    wide.columns.name = None
+    return wide.sort_index()
+
+
+def monitor_frame(counts_frame, expected=None, alpha=DEFAULT_ALPHA, horizon=None):
+    """:func:`srm_monitor` over a DataFrame from :func:`load_assignment_counts`
+
+    Returns ``(summary, table)`` where ``table`` holds the per-interval results
+    indexed like the input.
+    """
+    result = srm_monitor(counts_frame.to_numpy(), expected, alpha, horizon)
+    table = pd.DataFrame({
+        'n': result['n'],
+        'p_value': result['p_value'],
+        'cum_n': result['cum_n'],
+        'cum_p_value': result['cum_p_value'],
+        'flagged': result['flagged'],
+        'cum_flagged': result['cum_flagged'],
+    }, index=counts_frame.index)
+    for arm, share in zip(counts_frame.columns, result['cum_share'].T):
+        table[f'cum_share_{arm}'] = share
+
+    def label(position):
+        return None if position is None else counts_frame.index[position]
+
+    summary = {
+        'arms': list(counts_frame.columns),
+        'intervals': len(counts_frame),
+        'alpha': alpha,
+        'horizon': result['horizon'],
+        'threshold': result['threshold'],
+        'final_p_value': result['final_p_value'],
+        'srm_detected': result['srm_detected'],
+        'first_bad_interval': label(result['first_bad_interval']),
+        'first_detection': label(result['first_detection']),
+        'likely_onset': label(result['likely_onset']),
+    }
+    return summary, table
@@ -0,0 +1,278 @@
+"""Vectorized statistical kernels for the design, analysis and decision phases.
+
+Every function accepts scalars or NumPy arrays (broadcast against each other)
+and returns arrays, so the same code serves a single Streamlit render and a
+batch of a million rows. Inputs use the units of the app widgets: rates and
+lifts in percent, splits as the treatment share in percent.
+"""
+import numpy as np
+from scipy import special, stats
+
+
+def _z_scores(alpha, power):
+    """Two-sided critical value for alpha and the quantile for power"""
+    return stats.norm.ppf(1 - np.asarray(alpha, dtype=float) / 2), stats.norm.ppf(power)
+
+
+def chi2_sf(chi2_stat, df):
+    """Chi-square survival function with a closed form for one degree of freedom
+
+    ``erfc(sqrt(x / 2))`` is exact for df=1 and far cheaper than the incomplete
+    gamma behind ``stats.chi2.sf``; other dfs use the ``chdtrc`` ufunc directly.
+    """
+    chi2_stat = np.asarray(chi2_stat, dtype=float)
+    if np.ndim(df) == 0 and df == 1:
+        return special.erfc(np.sqrt(chi2_stat / 2))
+    return special.chdtrc(df, chi2_stat)
+
+
+def sample_size_per_group(baseline, mde, alpha=0.05, power=0.80):
+    """Samples per variant for a two-proportion z-test
+
+    ``baseline`` is the current rate in percent and ``mde`` the relative lift in
+    percent. Invalid combinations (e.g. a target rate above 100%) yield NaN.
+    """
+    p1 = np.asarray(baseline, dtype=float) / 100
+    p2 = p1 * (1 + np.asarray(mde, dtype=float) / 100)
+    z_alpha, z_beta = _z_scores(alpha, power)
+
+    pooled_p = (p1 + p2) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = ((z_alpha * np.sqrt(2 * pooled_p * (1 - pooled_p)) +
+              z_beta * np.sqrt(p1 * (1 - p1) + p2 * (1 - p2))) / (p2 - p1)) ** 2
+    return np.ceil(n)
+
+
+DISTRIBUTIONS = ("binomial", "normal", "poisson", "negative_binomial")
+
+
+def _families(distribution):
+    """``(name, None)`` for one distribution, ``(None, masks)`` with a mask per family for an array"""
+    distribution = np.asarray(distribution)
+    if distribution.ndim == 0 and distribution.item() in DISTRIBUTIONS:
+        return distribution.item(), None
+    # Equality masks instead of np.unique: no sort over large string arrays
+    masks = [distribution == name for name in DISTRIBUTIONS]
+    known = np.logical_or.reduce(masks)
+    if not np.all(known):
+        unknown = np.unique(distribution[~known]) if distribution.ndim else [distribution.item()]
+        raise ValueError(f"Unknown distribution(s) {', '.join(map(str, unknown))}; "
+                         f"expected one of: {', '.join(DISTRIBUTIONS)}")
+    return None, masks
+
+
+def _variance(mean, families, sd, dispersion):
+    name, masks = families
+    sd = np.asarray(np.nan if sd is None else sd, dtype=float)
+    dispersion = np.asarray(dispersion, dtype=float)
+    variances = {
+        'binomial': lambda: mean * (1 - mean),
+        'normal': lambda: sd ** 2 + 0 * mean,
+        'poisson': lambda: mean,
+        'negative_binomial': lambda: mean + dispersion * mean ** 2,
+    }
+    if name is not None:
+        # One family (the common case): evaluate only its variance function
+        return variances[name]()
+    return np.select(masks, [variances[family]() for family in DISTRIBUTIONS])
+
+
+def metric_variance(mean, distribution="binomial", sd=None, dispersion=0.0):
+    """Per-unit variance of a metric with the given mean (a 0-1 rate for binomial)
+
+    Variance functions: ``p (1 - p)`` (binomial), ``sd^2`` (normal),
+    ``m`` (Poisson) and ``m + dispersion * m^2`` (negative binomial).
+    """
+    return _variance(np.asarray(mean, dtype=float), _families(distribution), sd, dispersion)
+
+
+def _family_moments(baseline, mde, split, distribution, sd, dispersion):
+    """Arm means and per-unit variances (control, treatment, pooled under H0)
+
+    Binomial baselines are rates in percent; every other family takes the
+    per-user mean in its own units.
+    """
+    families = _families(distribution)
+    name, masks = families
+    binomial = name == "binomial" if name is not None else masks[0]
+    baseline = np.asarray(baseline, dtype=float)
+    m1 = np.where(binomial, baseline / 100, baseline)
+    m2 = m1 * (1 + np.asarray(mde, dtype=float) / 100)
+    w = np.asarray(split, dtype=float) / 100
+    pooled = (1 - w) * m1 + w * m2
+    return (m1, m2, *(_variance(m, families, sd, dispersion) for m in (m1, m2, pooled)), w)
+
+
+def metric_sample_size(baseline, mde, alpha=0.05, power=0.80, split=50, distribution="binomial", sd=None,
+                       dispersion=0.0):
+    """Total samples to detect a relative lift of ``mde``% in a metric's mean
+
+    ``distribution`` (scalar or array, see :data:`DISTRIBUTIONS`) picks the
+    variance function; ``sd`` is the per-user standard deviation of a normal
+    metric and ``dispersion`` the negative-binomial overdispersion
+    (``Var = m + dispersion * m^2``; 0 is Poisson). Uses the exact
+    unequal-allocation variances (pooled under H0, per arm under H1), so
+    ``total * split / 100`` samples land in treatment.
+    """
+    m1, m2, v1, v2, v0, w = _family_moments(baseline, mde, split, distribution, sd, dispersion)
+    z_alpha, z_beta = _z_scores(alpha, power)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        null_sd = np.sqrt(v0 * (1 / (1 - w) + 1 / w))
+        alt_sd = np.sqrt(v1 / (1 - w) + v2 / w)
+        return ((z_alpha * null_sd + z_beta * alt_sd) / (m2 - m1)) ** 2
+
+
+def metric_power_z(baseline, mde, total_n, alpha=0.05, split=50, distribution="binomial", sd=None,
+                   dispersion=0.0):
+    """Standard-normal quantile of :func:`metric_power`
+
+    Unlike the power itself it does not saturate at 0 or 1, which makes it the
+    target the inverse solvers of :mod:`playbook.inverse` root-find on.
+    """
+    m1, m2, v1, v2, v0, w = _family_moments(baseline, mde, split, distribution, sd, dispersion)
+    # From the lower tail: 1 - alpha / 2 rounds to 1 for alpha below ~1e-16
+    z_alpha = -special.ndtri(np.asarray(alpha, dtype=float) / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        null_sd = np.sqrt(v0 * (1 / (1 - w) + 1 / w))
+        alt_sd = np.sqrt(v1 / (1 - w) + v2 / w)
+        return (np.abs(m2 - m1) * np.sqrt(np.asarray(total_n, dtype=float)) - z_alpha * null_sd) / alt_sd
+
+
+def metric_power(baseline, mde, total_n, alpha=0.05, split=50, distribution="binomial", sd=None, dispersion=0.0):
+    """Power with ``total_n`` samples; the inverse of :func:`metric_sample_size` in ``power``
+
+    The far rejection tail is ignored, as in the sample-size formula.
+    """
+    return special.ndtr(metric_power_z(baseline, mde, total_n, alpha, split, distribution, sd, dispersion))
+
+
+def total_sample_size(baseline, mde, alpha=0.05, power=0.80, split=50):
+    """Total samples for a two-proportion z-test with ``split``% sent to treatment
+
+    The binomial case of :func:`metric_sample_size`. At a 50% split this is
+    twice :func:`sample_size_per_group` before rounding.
+    """
+    return metric_sample_size(baseline, mde, alpha, power, split)
+
+
+def achieved_power(baseline, mde, total_n, alpha=0.05, split=50):
+    """Power of a two-proportion z-test with ``total_n`` samples, ``split``% in treatment"""
+    return metric_power(baseline, mde, total_n, alpha, split)
+
+
+def duration_days(n_per_group, daily_traffic, split=50):
+    """Days until the smaller arm collects ``n_per_group`` samples"""
+    split = np.asarray(split, dtype=float)
+    effective_daily = np.asarray(daily_traffic, dtype=float) * (np.minimum(split, 100 - split) / 100)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.ceil(np.asarray(n_per_group, dtype=float) / effective_daily)
+
+
+def srm_test(control_n, treatment_n, expected_ratio=50):
+    """Chi-square sample ratio mismatch test
+
+    ``expected_ratio`` is the expected control share in percent. Returns
+    ``(chi2_stat, p_value)``; rows without traffic give NaN.
+    """
+    control_n = np.asarray(control_n, dtype=float)
+    treatment_n = np.asarray(treatment_n, dtype=float)
+    total = control_n + treatment_n
+    expected_control = total * (np.asarray(expected_ratio, dtype=float) / 100)
+    expected_treatment = total - expected_control
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        chi2_stat = ((control_n - expected_control) ** 2 / expected_control +
+                     (treatment_n - expected_treatment) ** 2 / expected_treatment)
+    return chi2_stat, chi2_sf(chi2_stat, 1)
+
+
+def two_proportion_ztest(control_n, control_x, treatment_n, treatment_x):
+    """Pooled two-proportion z-test with an unpooled 95% CI on the difference
+
+    Returns a dict with the same keys the app stores in ``analysis_results``.
+    """
+    control_n = np.asarray(control_n, dtype=float)
+    treatment_n = np.asarray(treatment_n, dtype=float)
+    control_x = np.asarray(control_x, dtype=float)
+    treatment_x = np.asarray(treatment_x, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        control_rate = np.where(control_n > 0, control_x / control_n, 0.0)
+        treatment_rate = np.where(treatment_n > 0, treatment_x / treatment_n, 0.0)
+        diff = treatment_rate - control_rate
+
+        pooled_rate = (control_x + treatment_x) / (control_n + treatment_n)
+        se_pooled = np.sqrt(pooled_rate * (1 - pooled_rate) * (1 / control_n + 1 / treatment_n))
+        z_stat = np.where(se_pooled > 0, diff / se_pooled, 0.0)
+        p_value = 2 * stats.norm.sf(np.abs(z_stat))
+
+        se_diff = np.sqrt(control_rate * (1 - control_rate) / control_n +
+                          treatment_rate * (1 - treatment_rate) / treatment_n)
+        relative_lift = np.where(control_rate > 0, diff / control_rate * 100, 0.0)
+
+    return {
+        'control_n': control_n,
+        'treatment_n': treatment_n,
+        'control_rate': control_rate,
+        'treatment_rate': treatment_rate,
+        'p_value': p_value,
+        'absolute_lift': diff * 100,
+        'relative_lift': relative_lift,
+        'ci_lower': diff - 1.96 * se_diff,
+        'ci_upper': diff + 1.96 * se_diff,
+        'z_stat': z_stat,
+        'se_diff': se_diff,
+    }
+
+
+def business_impact(control_rate, treatment_rate, monthly_users, value_per_conversion,
+                    implementation_cost=10_000, ongoing_cost_monthly=0):
+    """Monthly/annual revenue impact and ROI timing of shipping the treatment
+
+    ``months_to_roi`` is ``inf`` wherever the impact never covers the ongoing cost.
+    """
+    monthly_users = np.asarray(monthly_users, dtype=float)
+    implementation_cost = np.asarray(implementation_cost, dtype=float)
+    ongoing_cost_monthly = np.asarray(ongoing_cost_monthly, dtype=float)
+
+    baseline_conversions = monthly_users * np.asarray(control_rate, dtype=float)
+    incremental_conversions = monthly_users * np.asarray(treatment_rate, dtype=float) - baseline_conversions
+    monthly_impact = incremental_conversions * np.asarray(value_per_conversion, dtype=float)
+
+    recoverable = (monthly_impact > ongoing_cost_monthly) & (monthly_impact > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months_to_roi = np.where(recoverable, implementation_cost / monthly_impact, np.inf)
+
+    return {
+        'baseline_conversions': baseline_conversions,
+        'incremental_conversions': incremental_conversions,
+        'monthly_impact': monthly_impact,
+        'annual_impact': monthly_impact * 12,
+        'first_month_net': monthly_impact - implementation_cost - ongoing_cost_monthly,
+        'ongoing_monthly_net': monthly_impact - ongoing_cost_monthly,
+        'months_to_roi': months_to_roi,
+    }
+
+
+def mean_sampling_curves(n_per_group, means, variances, points=1000):
+    """Normal approximation to the sample-mean distribution of each arm
+
+    Shares one grid spanning four standard errors around every arm; returns
+    ``(x, densities)`` with one row per mean.
+    """
+    means = np.atleast_1d(np.asarray(means, dtype=float))[:, None]
+    errors = np.sqrt(np.atleast_1d(np.asarray(variances, dtype=float))[:, None] / n_per_group)
+    x = np.linspace((means - 4 * errors).min(), (means + 4 * errors).max(), points)
+    return x, stats.norm.pdf(x, means, errors)
+
+
+def sampling_distribution_curves(n_per_group, rates, points=1000):
+    """Normal approximation to the success-count distribution of each arm
+
+    Evaluates every arm in one ``norm.pdf`` call over a shared grid on
+    ``[0, n_per_group]``; returns ``(x, densities)`` with one row per rate.
+    """
+    rates = np.atleast_1d(np.asarray(rates, dtype=float))[:, None]
+    x = np.linspace(0, n_per_group, points)
+    densities = stats.norm.pdf(x, n_per_group * rates, np.sqrt(n_per_group * rates * (1 - rates)))
+    return x, densities
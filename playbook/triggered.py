@@ -0,0 +1,230 @@
+"""First-exposure deduplication and triggered analysis of raw event logs.
+
+Exposure logs repeat: a user who reloads the page or revisits the sub-flow is
+logged once per impression. Many tests also only change a sub-flow (checkout,
+a settings page), so most assigned users never see the difference. Analysing
+every assigned user dilutes the effect with noise; analysing every impression
+double-counts users. The unit of a triggered analysis is one record per user
+per experiment: the user's **first exposure**, its variant and the
+conversions that happened **at or after** it. Conversions before the first
+exposure cannot have been caused by the treatment and are dropped.
+
+The triggered lift applies only to triggered users. Its effect on all users is
+diluted by the trigger rate (triggered users over all users in the log), the
+**dilution factor**: the overall absolute effect per user is the triggered
+absolute effect times that factor, which is what business-impact projections
+over total traffic need.
+
+The log has one row per event, with a user id, an event name and a timestamp
+(file order is used without one); exposure rows carry the variant and,
+optionally, an experiment id. Conversion rows without an experiment id count
+for every experiment the user was exposed to. Events that are neither
+exposures nor conversions (page views, sessions) only count towards the
+population of all users.
+
+Deduplication uses the hash-partitioned aggregation of
+:mod:`playbook.quality` rather than a global sort: every event of a user lands
+in the same bucket, and within a bucket the first exposure of each (user,
+experiment) is found with hash grouping, and conversions are matched to it
+with a hash join.
+"""
+import numpy as np
+import pandas as pd
+
+from .livelog import VARIANT_COLUMNS
+from .quality import (DEFAULT_PARTITIONS, SPILL_BYTES, TIME_COLUMNS, USER_COLUMNS, HashPartitions, hash_users,
+                      to_nanoseconds)
+from .ratio import DEFAULT_CHUNKSIZE, iter_csv_chunks
+
+EVENT_COLUMNS = ("event", "event_type", "event_name", "type")
+EXPERIMENT_COLUMNS = ("experiment", "experiment_id", "test", "test_id")
+VALUE_COLUMNS = ("value", "revenue", "amount")
+EXPOSURE_EVENTS = ("exposure", "impression", "trigger", "triggered", "exposed")
+CONVERSION_EVENTS = ("conversion", "convert", "converted", "purchase", "order")
+# Experiment name used when the log has no experiment column
+DEFAULT_EXPERIMENT = "experiment"
+
+EXPOSURE, CONVERSION, OTHER = 0, 1, 2
+# Conversion rows without an experiment id match every experiment of the user
+ANY_EXPERIMENT = np.iinfo(np.uint16).max
+EVENT_RECORD = np.dtype([('user', '<u8'), ('experiment', '<u2'), ('variant', 'u1'), ('kind', 'u1'),
+                         ('time', '<i8'), ('value', '<f8')])
+VARIANT_FIELDS = ("n", "x", "value_sum", "value_sq_sum", "exposures", "conversions")
+
+
+def guess_event_columns(header):
+    """``{'user', 'variant', 'event', 'timestamp', 'experiment', 'value'}`` names among ``header``"""
+    lowered = {str(column).strip().lower(): column for column in header}
+
+    def pick(candidates):
+        return next((lowered[name] for name in candidates if name in lowered), None)
+
+    return {
+        'user': pick(USER_COLUMNS), 'variant': pick(VARIANT_COLUMNS), 'event': pick(EVENT_COLUMNS),
+        'timestamp': pick(TIME_COLUMNS), 'experiment': pick(EXPERIMENT_COLUMNS), 'value': pick(VALUE_COLUMNS),
+    }
+
+
+def _blank(value):
+    # Streaming CSV readers return empty strings rather than NaN for blank text cells
+    return pd.isna(value) or not str(value).strip()
+
+
+def _codes(values, names, limit):
+    """Codes of ``values`` in the growing ``names`` mapping; missing values get ``limit``"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    for name in uniques:
+        if not _blank(name):
+            names.setdefault(str(name).strip(), len(names))
+    if len(names) >= limit:
+        raise ValueError(f"More than {limit - 1} distinct values in {values.name!r}; is the column right?")
+    lookup = np.array([limit if _blank(name) else names[str(name).strip()] for name in uniques], dtype=np.int64)
+    return lookup[codes] if len(uniques) else np.zeros(len(values), dtype=np.int64)
+
+
+def to_event_records(frame, columns, exposure_events, conversion_events, variants, experiments, offset):
+    """Fixed-width :data:`EVENT_RECORD` array of one chunk
+
+    ``variants`` and ``experiments`` map names to codes and grow across chunks;
+    ``offset`` (rows read so far) orders events when there is no timestamp.
+    """
+    # Classify each distinct event name once rather than every row
+    codes, names = pd.factorize(frame[columns['event']], use_na_sentinel=False)
+    names = [str(name).strip().lower() for name in names]
+    lookup = np.array([EXPOSURE if name in exposure_events else CONVERSION if name in conversion_events else OTHER
+                       for name in names], dtype=np.int64)
+    kind = lookup[codes] if len(names) else np.zeros(len(frame), dtype=np.int64)
+
+    records = np.zeros(len(frame), dtype=EVENT_RECORD)
+    records['user'] = hash_users(frame[columns['user']])
+    if columns.get('experiment'):
+        experiment = frame[columns['experiment']].where(kind != OTHER)
+        records['experiment'] = _codes(experiment, experiments, ANY_EXPERIMENT)
+        # An exposure must name its experiment; without one it only counts towards the population
+        kind[(kind == EXPOSURE) & (records['experiment'] == ANY_EXPERIMENT)] = OTHER
+    else:
+        experiments.setdefault(DEFAULT_EXPERIMENT, 0)
+    # Variants are named by exposure rows only; conversions take the variant of the first exposure
+    variant = _codes(frame[columns['variant']].where(kind == EXPOSURE), variants, np.iinfo(np.uint8).max)
+    kind[(kind == EXPOSURE) & (variant == np.iinfo(np.uint8).max)] = OTHER
+    records['kind'] = kind
+    records['variant'] = np.where(kind == EXPOSURE, variant, 0)
+    records['time'] = (to_nanoseconds(frame[columns['timestamp']]) if columns.get('timestamp')
+                       else np.arange(offset, offset + len(frame)))
+    records['value'] = (pd.to_numeric(frame[columns['value']], errors="coerce").fillna(0).to_numpy(dtype=float)
+                        if columns.get('value') else 0.0)
+    return records
+
+
+def first_exposures(records):
+    """One row per (user, experiment) of a bucket: first exposure and the conversions attributed to it
+
+    Returns ``(firsts, population, converters, dropped)``: a frame with
+    ``user, experiment, variant, exposed_at, exposures, conversions, value``,
+    the distinct users in the bucket, those with any conversion, and the
+    conversions before first exposure per experiment code.
+    """
+    user_codes, users = pd.factorize(records['user'])
+    kind = records['kind']
+    converters = len(np.unique(user_codes[kind == CONVERSION]))
+
+    rows = np.flatnonzero(kind == EXPOSURE)
+    pair = user_codes[rows].astype(np.int64) * (ANY_EXPERIMENT + 1) + records['experiment'][rows]
+    group, _ = pd.factorize(pair)
+    times = records['time'][rows]
+    first_time = pd.Series(times).groupby(group).min().to_numpy()
+    # The earliest exposure of each group; ties go to the first row in file order
+    earliest = np.flatnonzero(times == first_time[group])
+    earliest = earliest[~pd.Series(group[earliest]).duplicated().to_numpy()]
+    firsts = pd.DataFrame({
+        'user': user_codes[rows[earliest]],
+        'experiment': records['experiment'][rows[earliest]].astype(np.int64),
+        'variant': records['variant'][rows[earliest]].astype(np.int64),
+        'exposed_at': first_time[group[earliest]],
+        'exposures': np.bincount(group)[group[earliest]],
+    })
+
+    conversion_rows = np.flatnonzero(kind == CONVERSION)
+    conversions = pd.DataFrame({
+        'user': user_codes[conversion_rows],
+        'conversion_experiment': records['experiment'][conversion_rows].astype(np.int64),
+        'time': records['time'][conversion_rows],
+        'value': records['value'][conversion_rows],
+    })
+    # Hash join of conversions onto first exposures of the same user (and experiment, when given)
+    matched = conversions.merge(firsts[['user', 'experiment', 'exposed_at']].reset_index(), on='user')
+    matched = matched[(matched['conversion_experiment'] == ANY_EXPERIMENT)
+                      | (matched['conversion_experiment'] == matched['experiment'])]
+    after = (matched['time'] >= matched['exposed_at']).to_numpy()
+    index = matched['index'].to_numpy()
+    firsts['conversions'] = np.bincount(index[after], minlength=len(firsts))
+    firsts['value'] = np.bincount(index[after], weights=matched['value'].to_numpy()[after], minlength=len(firsts))
+    dropped = matched.loc[~after, 'experiment'].value_counts().to_dict()
+    return firsts, len(users), converters, dropped
+
+
+def triggered_analysis(source, columns=None, exposure_events=EXPOSURE_EVENTS, conversion_events=CONVERSION_EVENTS,
+                       partitions=DEFAULT_PARTITIONS, chunksize=DEFAULT_CHUNKSIZE, spill_bytes=SPILL_BYTES,
+                       spill_dir=None):
+    """First-exposure, post-exposure-conversion statistics of an event-level CSV
+
+    ``columns`` maps the roles of :func:`guess_event_columns` to column names
+    (guessed from the header when omitted; ``user``, ``variant`` and ``event``
+    are required). Returns the ``rows`` read, the ``population`` of distinct
+    users, ``population_converters``, and per experiment its
+    ``triggered_users``, ``dilution_factor`` (triggered share of the
+    population), ``duplicate_exposures`` removed, ``pre_exposure_conversions``
+    dropped and per-variant :data:`VARIANT_FIELDS` (``n`` users, ``x``
+    converting users).
+    """
+    if columns is None:
+        header = pd.read_csv(source, nrows=0).columns
+        if hasattr(source, "seek"):
+            source.seek(0)
+        columns = guess_event_columns(header)
+    for role in ('user', 'variant', 'event'):
+        if not columns.get(role):
+            raise ValueError(f"No {role} column")
+    exposure_events = {str(name).strip().lower() for name in exposure_events}
+    conversion_events = {str(name).strip().lower() for name in conversion_events}
+
+    variants, experiments, rows = {}, {}, 0
+    buckets = HashPartitions(partitions, spill_bytes, spill_dir)
+    wanted = [column for column in dict.fromkeys(columns.values()) if column]
+    for chunk in iter_csv_chunks(source, wanted, chunksize, [columns['user']]):
+        buckets.add(to_event_records(chunk, columns, exposure_events, conversion_events, variants, experiments,
+                                     rows))
+        rows += len(chunk)
+
+    shape = (max(len(experiments), 1), max(len(variants), 1))
+    totals = {field: np.zeros(shape) for field in VARIANT_FIELDS}
+    dropped = np.zeros(shape[0], dtype=np.int64)
+    population = population_converters = 0
+    for records in buckets:
+        firsts, users, converters, early = first_exposures(records)
+        population += users
+        population_converters += converters
+        for code, count in early.items():
+            dropped[code] += count
+        cell = np.ravel_multi_index((firsts['experiment'].to_numpy(), firsts['variant'].to_numpy()), shape)
+        for field, weights in (('n', None), ('x', firsts['conversions'] > 0), ('value_sum', firsts['value']),
+                               ('value_sq_sum', firsts['value'] ** 2), ('exposures', firsts['exposures']),
+                               ('conversions', firsts['conversions'])):
+            totals[field] += np.bincount(cell, weights=weights, minlength=shape[0] * shape[1]).reshape(shape)
+
+    report = {'rows': rows, 'population': population, 'population_converters': population_converters,
+              'experiments': {}}
+    for experiment, code in experiments.items():
+        stats = {name: {field: float(totals[field][code, index]) for field in VARIANT_FIELDS}
+                 for name, index in variants.items() if totals['n'][code, index]}
+        triggered = int(totals['n'][code].sum())
+        if not triggered:
+            continue
+        report['experiments'][experiment] = {
+            'triggered_users': triggered,
+            'dilution_factor': triggered / population,
+            'duplicate_exposures': int(totals['exposures'][code].sum()) - triggered,
+            'pre_exposure_conversions': int(dropped[code]),
+            'variants': stats,
+        }
+    return report
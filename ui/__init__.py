@@ -0,0 +1,6 @@
+"""Streamlit front end of the A/B Testing Playbook.
+
+``mrkt_sci_ab_v2.py`` is the entry point. It sets up the page and hands the
+active phase to :mod:`ui.phases`, which imports each phase module on first
+visit. Statistics live in the Streamlit-free :mod:`playbook` package.
+"""
@@ -0,0 +1,51 @@
+"""Helpers shared by the phases: figure caching, long-series traces and the registry."""
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from playbook import downsample as ab_downsample
+from playbook.registry import ExperimentRegistry
+
+# Series longer than this reach the browser min/max-downsampled, as WebGL traces
+WEBGL_THRESHOLD = ab_downsample.DEFAULT_MAX_POINTS
+FIGURE_CACHE_ENTRIES = 64
+
+def cached_figure(builder):
+    """Reuse a builder's figure per input parameters across reruns and sessions
+
+    Cached figures are shared objects: render them, never mutate them.
+    """
+    return st.cache_resource(show_spinner=False, max_entries=FIGURE_CACHE_ENTRIES)(builder)
+
+def scatter_trace(x, y, **kwargs):
+    """go.Scatter, or a downsampled go.Scattergl for series too long to ship whole"""
+    if len(y) <= WEBGL_THRESHOLD:
+        return go.Scatter(x=x, y=y, **kwargs)
+    index = ab_downsample.minmax_indices(y, WEBGL_THRESHOLD)
+    return go.Scattergl(x=np.asarray(x)[index], y=np.asarray(y)[index], **kwargs)
+
+# Session snapshots untouched for this long are pruned when the registry opens
+SESSION_RETENTION_DAYS = 30
+
+@st.cache_resource
+def get_registry():
+    """Process-wide experiment registry (set AB_REGISTRY_PATH to relocate the SQLite file)"""
+    registry = ExperimentRegistry(os.environ.get("AB_REGISTRY_PATH", "experiments.db"))
+    cutoff = datetime.now(timezone.utc) - timedelta(days=SESSION_RETENTION_DAYS)
+    registry.prune_sessions(cutoff.isoformat(timespec="seconds"))
+    return registry
+
+def persist_design():
+    """Queue the current design for the registry and remember its id
+
+    Nothing is stored until the Design phase has sized the experiment; the
+    existing id (or None) is returned instead.
+    """
+    data = st.session_state.experiment_data
+    if 'sample_size_per_group' not in data:
+        return data.get('experiment_id')
+    data['experiment_id'] = get_registry().save_design(data, data.get('experiment_id'))
+    return data['experiment_id']
@@ -0,0 +1,24 @@
+"""The six workflow phases, each imported on its first visit.
+
+Streamlit re-executes only the entry script on every rerun; imported modules
+stay in ``sys.modules``. Keeping each phase (its figures, helpers and static
+data) in its own module means its definitions run once per process, and only
+when someone opens it, so a rerun pays for the active phase alone.
+"""
+import importlib
+
+# (module, render function) per navigation step, in workflow order
+PHASES = (
+    ("objective", "tab_business_objective"),
+    ("metrics", "tab_define_metrics"),
+    ("design", "tab_design_experiment"),
+    ("implementation", "tab_implementation"),
+    ("analysis", "tab_analysis"),
+    ("decision", "tab_decision"),
+)
+
+
+def load_phase(index):
+    """Render function of phase ``index``, importing its module on first use"""
+    module, function = PHASES[index]
+    return getattr(importlib.import_module(f"{__name__}.{module}"), function)
@@ -0,0 +1,1171 @@
+"""Phase 5: results, SRM and A/A checks, live, ratio and quantile analysis"""
+import io
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from playbook import aa as ab_aa
+from playbook import catalog
+from playbook import instrumentation
+from playbook import livelog
+from playbook import quality as ab_quality
+from playbook import quantiles as ab_quantiles
+from playbook import ratio as ab_ratio
+from playbook import srm as ab_srm
+from playbook import stats as ab_stats
+from playbook import triggered as ab_triggered
+from ui.common import cached_figure, get_registry, persist_design, scatter_trace
+from ui.theme import GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_GREY, GOOGLE_GREY_LIGHT, GOOGLE_RED, GOOGLE_YELLOW
+
+@cached_figure
+@instrumentation.timed_fn("figure", "results_comparison")
+def build_results_figure(control_rate, treatment_rate, p_value):
+    """Grouped bar chart of control vs treatment rates"""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        name='Control',
+        x=['Conversion Rate'],
+        y=[control_rate*100],
+        marker_color=GOOGLE_BLUE,
+        text=[f'{control_rate*100:.2f}%'],
+        textposition='auto'
+    ))
+    fig.add_trace(go.Bar(
+        name='Treatment',
+        x=['Conversion Rate'],
+        y=[treatment_rate*100],
+        marker_color=GOOGLE_GREEN if treatment_rate > control_rate else GOOGLE_RED,
+        text=[f'{treatment_rate*100:.2f}%'],
+        textposition='auto'
+    ))
+    
+    fig.update_layout(
+        title=f'<b>Control vs Treatment</b><br><sub>p={p_value:.4f}</sub>',
+        yaxis_title='Conversion Rate (%)',
+        barmode='group',
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Google Sans'),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def parse_assignment_counts(payload):
+    """Per-interval assignment counts (one column per arm) from uploaded CSV bytes"""
+    return ab_srm.load_assignment_counts(io.BytesIO(payload))
+
+@instrumentation.timed_fn("figure", "srm_monitor")
+def build_srm_monitor_figure(table, summary):
+    """Cumulative and per-interval SRM p-values against the sequential threshold"""
+    fig = go.Figure()
+    
+    fig.add_trace(scatter_trace(
+        table.index, table['p_value'], name='Per-interval p',
+        mode='markers', marker=dict(color=GOOGLE_GREY_LIGHT, size=4)
+    ))
+    fig.add_trace(scatter_trace(
+        table.index, table['cum_p_value'], name='Cumulative p',
+        line=dict(color=GOOGLE_BLUE, width=3)
+    ))
+    fig.add_hline(y=summary['threshold'], line_dash="dash", line_color=GOOGLE_RED,
+                  annotation_text=f"Threshold {summary['threshold']:.1e}")
+    
+    for key, label, color in (('likely_onset', 'Likely onset', GOOGLE_YELLOW),
+                              ('first_detection', 'Detected', GOOGLE_RED)):
+        if summary[key] is not None:
+            fig.add_vline(x=pd.Timestamp(summary[key]).timestamp() * 1000, line_dash="dot",
+                          line_color=color, annotation_text=label)
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>SRM Monitor</b><br><sub>{len(summary['arms'])} arms, {summary['intervals']:,} intervals</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Interval",
+        yaxis_title="P-value (log scale)",
+        yaxis_type="log",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def render_srm_monitor(expected_ratio):
+    """Upload per-day/per-hour assignment counts and track SRM over time"""
+    with st.expander("📈 SRM Monitor Over Time (daily or hourly counts)", expanded=False):
+        st.markdown("""
+        Upload assignment counts per interval for **any number of arms**, either wide
+        (`timestamp, control, treatment, ...`) or long (`timestamp, arm, count`).
+        Every interval and the running total are tested, with α split evenly between the two
+        and divided by the **planned number of intervals**. To re-check as each interval
+        arrives, set that horizon before the test starts and keep it fixed; left at the
+        intervals uploaded, the threshold is only valid for a single final check.
+        """)
+        counts_file = st.file_uploader("**Assignment Counts CSV**", type=["csv"], key="srm_counts")
+        if counts_file is None:
+            return
+        
+        try:
+            counts = parse_assignment_counts(counts_file.getvalue())
+        except ValueError as exc:
+            st.error(f"Could not read the assignment counts: {exc}")
+            return
+        
+        arms = list(counts.columns)
+        default_weights = f"{expected_ratio},{100 - expected_ratio}" if len(arms) == 2 else ",".join(["1"] * len(arms))
+        weights_text = st.text_input(
+            f"**Expected allocation** ({', '.join(arms)})",
+            value=default_weights,
+            key=f"srm_weights_{len(arms)}",
+            help="Comma-separated weights in the column order shown"
+        )
+        horizon = st.number_input(
+            "**Planned intervals** (horizon)", 1, 1000000, max(len(counts), 1), key="srm_horizon",
+            help="Total intervals the test will run for, fixed before monitoring starts"
+        )
+        try:
+            weights = [float(part) for part in weights_text.split(",")]
+            with instrumentation.timed("stat", "srm_monitor"):
+                summary, table = ab_srm.monitor_frame(counts, weights, horizon=int(horizon))
+        except ValueError as exc:
+            st.error(str(exc))
+            return
+        
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Cumulative P-value", f"{summary['final_p_value']:.2e}")
+        col_b.metric("Sequential Threshold", f"{summary['threshold']:.1e}",
+                     help=f"α {summary['alpha']} / 2 tests / {summary['horizon']:,} planned intervals")
+        col_c.metric("Intervals Flagged", f"{int(table['flagged'].sum()):,}")
+        
+        if summary['srm_detected']:
+            details = [f"<li>{label}: <strong>{summary[key]}</strong></li>"
+                       for label, key in (("Cumulative test first fails", 'first_detection'),
+                                          ("Mismatch most likely began", 'likely_onset'),
+                                          ("First interval failing on its own", 'first_bad_interval'))
+                       if summary[key] is not None]
+            st.markdown(f"""
+            <div class="danger-box">
+            <strong>🚨 SRM DETECTED OVER TIME</strong><br><br>
+            <ul>{''.join(details)}</ul>
+            Investigate deployments, targeting or logging changes around the onset.
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-box">
+            ✅ <strong>No SRM in any interval or in the running total</strong>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.plotly_chart(build_srm_monitor_figure(table, summary), use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def parse_aa_metric(payload, column=None):
+    """Per-user metric values and the column used, from uploaded CSV bytes"""
+    return ab_aa.load_metric_data(io.BytesIO(payload), column)
+
+@st.cache_data(show_spinner=False)
+def run_aa_simulation(payload, column, test, replications, split, alpha):
+    """A/A p-values summary for the uploaded history (seeded, so reruns are stable)"""
+    values, _ = parse_aa_metric(payload, column)
+    with instrumentation.timed("stat", "aa_simulation"):
+        p_values = ab_aa.simulate_aa(values, test, replications, split, seed=42,
+                                     workers=min(4, os.cpu_count() or 1))
+        return ab_aa.summarize_aa(p_values, alpha)
+
+@instrumentation.timed_fn("figure", "aa_p_values")
+def build_aa_pvalue_figure(summary):
+    """Histogram of A/A p-values against the flat line a valid test produces"""
+    edges, counts = summary['histogram']
+    centers = (edges[:-1] + edges[1:]) / 2
+    expected = summary['replications'] / len(counts)
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=centers, y=counts, width=np.diff(edges), name='Simulated',
+        marker_color=[GOOGLE_RED if right <= summary['alpha'] + 1e-12 else GOOGLE_BLUE for right in edges[1:]]
+    ))
+    fig.add_hline(y=expected, line_dash="dash", line_color=GOOGLE_GREEN, annotation_text="Uniform")
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>A/A P-value Distribution</b><br><sub>{summary['replications']:,} re-randomizations, "
+                 f"KS D = {summary['ks_statistic']:.4f}</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="P-value",
+        yaxis_title="Replications",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=False,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+AA_TESTS = {
+    'ztest': "Two-proportion z-test (0/1 metric)",
+    'welch': "Welch's t-test (continuous metric)",
+    'mann_whitney': "Mann-Whitney U (skewed metric)",
+}
+
+def render_aa_simulator(split):
+    """Re-randomize historical per-user data to check the test's false-positive rate"""
+    with st.expander("🧪 A/A Simulator (historical per-user data)", expanded=False):
+        st.markdown("""
+        Upload one row per user from a period **without** any experiment (e.g. `user_id, converted`
+        or `user_id, revenue`). Users are randomly split into two fake arms thousands of times and the
+        test is run on each split. A healthy setup rejects about α of the time, and its p-values are
+        uniform.
+        """)
+        history_file = st.file_uploader("**Per-user Metric CSV**", type=["csv"], key="aa_history")
+        if history_file is None:
+            return
+        
+        payload = history_file.getvalue()
+        try:
+            columns = list(pd.read_csv(io.BytesIO(payload), nrows=0).columns)
+            values, detected = parse_aa_metric(payload)
+        except ValueError as exc:
+            st.error(f"Could not read the metric data: {exc}")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        column = col1.selectbox("Metric column", columns, index=columns.index(detected), key="aa_column")
+        if column != detected:
+            try:
+                values, _ = parse_aa_metric(payload, column)
+            except ValueError as exc:
+                st.error(str(exc))
+                return
+        tests = list(AA_TESTS) if ab_aa.is_binary(values) else ['welch', 'mann_whitney']
+        test = col2.selectbox("Test", tests, format_func=AA_TESTS.get, key="aa_test_kind")
+        replications = col3.select_slider("Replications", [1_000, 2_000, 5_000, 10_000, 20_000, 50_000],
+                                          value=10_000, key="aa_replications")
+        alpha = st.session_state.experiment_data.get('alpha', 0.05)
+        st.caption(f"{len(values):,} users, {100 - split}/{split} split, α = {alpha}")
+        if not 0 < split < 100:
+            st.warning(f"A {100 - split}/{split} split leaves one arm empty. Set the Expected Split of the SRM "
+                       "check between 1% and 99% to run the A/A simulation.")
+            return
+        
+        if not st.button("▶️ Run A/A Simulation", use_container_width=True, key="aa_run"):
+            summary = st.session_state.get('aa_result')
+            if summary is None:
+                return
+        else:
+            with st.spinner(f"Running {replications:,} A/A tests..."):
+                summary = run_aa_simulation(payload, column, test, replications, split, alpha)
+            st.session_state['aa_result'] = summary
+            st.session_state.experiment_data.update({
+                'aa_false_positive_rate': summary['false_positive_rate'],
+                'aa_passed': summary['passed'],
+            })
+            persist_design()
+        
+        low, high = summary['fpr_ci']
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("False Positive Rate", f"{summary['false_positive_rate']:.2%}",
+                     delta=f"{summary['false_positive_rate'] - summary['alpha']:+.2%} vs α", delta_color="inverse")
+        col_b.metric("95% Interval", f"{low:.2%} – {high:.2%}")
+        col_c.metric("KS Uniformity p", f"{summary['ks_p_value']:.3f}", help=f"D = {summary['ks_statistic']:.4f}")
+        
+        if summary['passed']:
+            st.markdown(f"""
+            <div class="success-box">
+            ✅ <strong>A/A check passed</strong>: false positives occur at the nominal rate and p-values are uniform.
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="danger-box">
+            <strong>🚨 A/A check failed</strong><br><br>
+            The test rejects too often (or too rarely) or its p-values are not uniform. Common causes:
+            heavy-tailed metrics with small samples, repeated rows per user, or the wrong test for the metric.
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.plotly_chart(build_aa_pvalue_figure(summary), use_container_width=True)
+
+@st.cache_data(show_spinner=False)
+def scan_exposure_log(payload, path, modified, user, variant, timestamp):
+    """Data-quality report from uploaded bytes or a local file (keyed by mtime)"""
+    source = io.BytesIO(payload) if payload is not None else path
+    with instrumentation.timed("stat", "exposure_quality"):
+        return ab_quality.scan_exposures(source, user, variant, timestamp or False)
+
+# Share of users seen in both arms above which the randomization itself is suspect
+QUALITY_MIXED_SHARE_LIMIT = 0.01
+NO_COLUMN = "(none)"
+
+def apply_clean_counts(control, treatment):
+    """Copy clean user counts into the SRM inputs (callers check :func:`counts_out_of_range` first)"""
+    st.session_state['srm_control'] = int(control['clean_users'])
+    st.session_state['srm_treatment'] = int(treatment['clean_users'])
+
+def render_data_quality():
+    """Scan a raw exposure log for duplicates, users in both arms and bot-like users"""
+    with st.expander("🧹 Exposure Log Quality Scan", expanded=False):
+        st.markdown("""
+        Provide the **raw exposure log** (one row per exposure: user id, variant and, ideally, a
+        timestamp). The scan counts duplicate exposures, users exposed to more than one variant and
+        users with bot-like exposure counts or rates, and how many users remain once they are excluded.
+        Large logs are aggregated in hash-partitioned chunks, so they never need to fit in memory.
+        """)
+        col_a, col_b = st.columns(2)
+        upload = col_a.file_uploader("**Exposure Log CSV**", type=["csv"], key="quality_upload")
+        path = col_b.text_input("**...or a local file path** (large files)", key="quality_path",
+                                placeholder="/data/exposures.csv")
+        if upload is None and not path:
+            return
+        
+        payload = upload.getvalue() if upload is not None else None
+        try:
+            modified = None if payload is not None else os.path.getmtime(path)
+            header = list(pd.read_csv(io.BytesIO(payload) if payload is not None else path, nrows=0).columns)
+        except (OSError, ValueError) as exc:
+            st.error(f"Could not read the file: {exc}")
+            return
+        
+        detected = ab_quality.guess_log_columns(header)
+        
+        def default_index(column, fallback):
+            return header.index(column) if column else min(fallback, len(header) - 1)
+        
+        col1, col2, col3 = st.columns(3)
+        user = col1.selectbox("User column", header, index=default_index(detected['user'], 0), key="quality_user")
+        variant = col2.selectbox("Variant column", header, index=default_index(detected['variant'], 1),
+                                 key="quality_variant")
+        time_options = [NO_COLUMN] + header
+        timestamp = col3.selectbox("Timestamp column", time_options,
+                                   index=time_options.index(detected['timestamp'] or NO_COLUMN),
+                                   key="quality_timestamp")
+        timestamp = None if timestamp == NO_COLUMN else timestamp
+        
+        try:
+            with st.spinner("Scanning the exposure log..."):
+                report = scan_exposure_log(payload, path, modified, user, variant, timestamp)
+        except (ValueError, KeyError) as exc:
+            st.error(f"Could not scan the file: {exc}")
+            return
+        
+        summary = {key: report[key] for key in ('rows', 'users', 'duplicate_rows', 'mixed_users', 'bot_users',
+                                                'excluded_users')}
+        if st.session_state.experiment_data.get('data_quality') != summary:
+            st.session_state.experiment_data['data_quality'] = summary
+            persist_design()
+        
+        users = max(report['users'], 1)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Exposure Rows", f"{report['rows']:,}", help=f"{report['users']:,} distinct users")
+        col2.metric("Duplicate Rows", f"{report['duplicate_rows']:,}",
+                    help="Repeated (user, variant, timestamp) records" if timestamp else
+                    "Repeat exposures of a user to the same variant (no timestamp column)")
+        col3.metric("Users in Both Arms", f"{report['mixed_users']:,}", f"{report['mixed_users'] / users:.2%}",
+                    delta_color="off")
+        col4.metric("Bot-like Users", f"{report['bot_users']:,}", f"{report['bot_users'] / users:.2%}",
+                    delta_color="off")
+        rule = f"more than {report['bot_event_fence']:,.0f} exposures"
+        if report['bot_rate_limit']:
+            rule += f", or more than {report['bot_rate_limit']:g} per minute"
+        st.caption(f"Bot-like: {rule}. Excluded users: {report['excluded_users']:,} "
+                   f"({report['excluded_users'] / users:.2%})")
+        
+        table = pd.DataFrame.from_dict(report['variants'], orient='index')
+        st.dataframe(
+            table[['rows', 'duplicate_rows', 'users', 'mixed_users', 'bot_users', 'excluded_users', 'clean_users']]
+            .rename(columns={
+                'rows': 'Rows', 'duplicate_rows': 'Duplicates', 'users': 'Users', 'mixed_users': 'Both Arms',
+                'bot_users': 'Bot-like', 'excluded_users': 'Excluded', 'clean_users': 'Clean Users'
+            }).style.format('{:,.0f}'),
+            use_container_width=True
+        )
+        
+        if report['mixed_users'] / users > QUALITY_MIXED_SHARE_LIMIT:
+            st.error(f"🚨 {report['mixed_users'] / users:.1%} of users saw more than one variant. Check that "
+                     "assignment is keyed on a stable user id before trusting the results.")
+        elif report['excluded_users'] or report['duplicate_rows']:
+            st.warning(f"⚠️ Exclude {report['excluded_users']:,} users (both arms or bot-like) and deduplicate "
+                       f"{report['duplicate_rows']:,} rows before analyzing; run the SRM check on clean counts.")
+        else:
+            st.success("✅ No duplicates, cross-arm users or bot-like users found")
+        
+        if len(report['variants']) >= 2:
+            control, treatment = _split_live_variants(report['variants'])
+            arms = (report['variants'][control], report['variants'][treatment])
+            problem = counts_out_of_range(*({'n': arm['clean_users']} for arm in arms), minimum=0,
+                                          inputs="the SRM check")
+            if problem:
+                st.caption(f"⚠️ {problem} The clean counts can't be copied.")
+            st.button("⬇️ Use Clean User Counts in the SRM Check", on_click=apply_clean_counts,
+                      disabled=problem is not None, args=arms, key="quality_apply")
+
+@st.cache_resource
+def get_log_follower(path):
+    """Process-wide tail follower per log file, resuming from the registry cursor"""
+    registry = get_registry()
+    return livelog.LogFollower(path, registry.load_log_cursor(path), registry.save_log_cursor)
+
+def _split_live_variants(stats):
+    """(control, treatment) variant names from a live log's per-variant totals"""
+    names = list(stats)
+    control = next((name for name in names if name.strip().lower() in ("control", "a", "0", "ctrl")), names[0])
+    treatment = next(name for name in names if name != control)
+    return control, treatment
+
+# Bounds of the Step 2 sample-size inputs
+RESULTS_MIN_N = 100
+RESULTS_MAX_N = 10000000
+
+def counts_out_of_range(control, treatment, minimum=RESULTS_MIN_N, inputs="Step 2"):
+    """Why per-arm totals can't go into the ``inputs`` unchanged (None when they can)"""
+    smallest = min(control['n'], treatment['n'])
+    largest = max(control['n'], treatment['n'])
+    if smallest < minimum:
+        return f"An arm has only {smallest:,.0f} samples; {inputs} needs at least {minimum:,} per arm."
+    if largest > RESULTS_MAX_N:
+        return f"An arm has {largest:,.0f} samples; {inputs} accepts at most {RESULTS_MAX_N:,} per arm."
+    return None
+
+def apply_live_counts(control, treatment):
+    """Copy per-arm totals into the Step 2 inputs (callers check :func:`counts_out_of_range` first)"""
+    for arm, stats in (("control", control), ("treatment", treatment)):
+        st.session_state[f"results_{arm}_n"] = int(stats['n'])
+        st.session_state[f"results_{arm}_x"] = int(stats['x'])
+
+def render_live_results(path):
+    """Poll the exposure log for appended records and show the running results"""
+    follower = get_log_follower(path)
+    try:
+        with instrumentation.timed("stat", "live_log_poll"):
+            cursor = follower.poll()
+    except (OSError, ValueError) as exc:
+        st.error(f"Could not read {path}: {exc}")
+        return
+    
+    stats = cursor['stats']
+    poll = follower.last_poll
+    st.caption(f"Last refresh {datetime.fromtimestamp(poll['at']):%H:%M:%S} · +{poll['records']:,} records "
+               f"({poll['bytes'] / 1024:,.1f} KB) in {poll['seconds'] * 1000:.1f} ms · "
+               f"{cursor['records']:,} records total at byte {cursor['offset']:,}"
+               + ("" if follower.caught_up else " · catching up"))
+    if cursor['skipped']:
+        st.caption(f"⚠️ Skipped {cursor['skipped']:,} unparsable or oversized lines "
+                   f"(last at byte {cursor['skipped_offset']:,}); they are left out of the totals.")
+    
+    if len(stats) < 2:
+        st.info("Waiting for records from at least two variants...")
+        return
+    
+    table = pd.DataFrame.from_dict(stats, orient='index')
+    table['rate'] = table['x'] / table['n']
+    table['mean_value'] = table['value_sum'] / table['n']
+    st.dataframe(
+        table[['n', 'x', 'rate', 'mean_value']].rename(columns={
+            'n': 'Exposures', 'x': 'Conversions', 'rate': 'Rate', 'mean_value': 'Mean Value'
+        }).style.format({'Exposures': '{:,.0f}', 'Conversions': '{:,.0f}', 'Rate': '{:.2%}', 'Mean Value': '{:,.2f}'}),
+        use_container_width=True
+    )
+    
+    control, treatment = _split_live_variants(stats)
+    test = ab_stats.two_proportion_ztest(stats[control]['n'], stats[control]['x'],
+                                         stats[treatment]['n'], stats[treatment]['x'])
+    col_a, col_b, col_c = st.columns(3)
+    col_a.metric("Live P-value", f"{float(test['p_value']):.4f}")
+    col_b.metric("Live Relative Lift", f"{float(test['relative_lift']):+.2f}%")
+    col_c.metric("Comparison", f"{treatment} vs {control}")
+    
+    problem = counts_out_of_range(stats[control], stats[treatment])
+    if problem:
+        st.caption(f"⚠️ {problem} The live counts can't be copied below.")
+    if st.button("⬇️ Use Live Counts Below", on_click=apply_live_counts, disabled=problem is not None,
+                 args=(stats[control], stats[treatment]), key="live_apply") and hasattr(st, "fragment"):
+        st.rerun(scope="app")
+
+def render_live_mode():
+    """Tail a growing exposure log and refresh the running results on a timer"""
+    with st.expander("🔴 Live Mode: follow a growing exposure log", expanded=False):
+        st.markdown("""
+        Point at a local CSV (header row) or JSON-lines exposure log with `variant` and
+        `converted` columns (optional `value`). Only records appended since the last refresh
+        are parsed; per-variant totals and the file offset are kept in the experiment registry.
+        """)
+        path = st.text_input("**Exposure Log Path**", key="live_log_path", placeholder="/data/exposures.csv")
+        col_a, col_b = st.columns(2)
+        live = col_a.toggle("Auto-refresh", key="live_enabled") if hasattr(st, "toggle") else \
+            col_a.checkbox("Auto-refresh", key="live_enabled")
+        interval = col_b.number_input("Refresh every (seconds)", 2, 3600, 10, key="live_interval")
+        
+        if not path:
+            return
+        if live and hasattr(st, "fragment"):
+            st.fragment(run_every=interval)(render_live_results)(path)
+        else:
+            st.button("🔄 Refresh", key="live_refresh")
+            render_live_results(path)
+
+@st.cache_data(show_spinner=False)
+def load_triggered_analysis(payload, path, modified, columns, exposure_events, conversion_events):
+    """First-exposure report from uploaded bytes or a local file (keyed by mtime)"""
+    source = io.BytesIO(payload) if payload is not None else path
+    with instrumentation.timed("stat", "first_exposures"):
+        return ab_triggered.triggered_analysis(source, dict(columns), exposure_events, conversion_events)
+
+# Rows read to offer the event names of the event column
+TRIGGER_EVENT_SAMPLE_ROWS = 100000
+
+def apply_triggered_counts(control, treatment, dilution_factor):
+    """Copy triggered totals into the Step 2 inputs and the trigger rate into the decision math"""
+    apply_live_counts(control, treatment)
+    st.session_state.experiment_data['dilution_factor'] = dilution_factor
+    # Re-seed the decision tab's trigger share (and its saved session value) from the new dilution factor
+    st.session_state.pop('impact_trigger_share', None)
+    st.session_state.get('_session_widgets', {}).pop('impact_trigger_share', None)
+    persist_design()
+
+def render_triggered_analysis():
+    """Reduce a raw event log to first exposures and analyze the triggered population"""
+    with st.expander("🎯 Triggered Analysis: first exposures from a raw event log", expanded=False):
+        st.markdown("""
+        Provide the **raw event log** (one row per event: user id, event name, variant on exposure
+        events, ideally a timestamp and an experiment id). Each user is counted once per experiment,
+        at their **first exposure**, and only conversions at or after it are attributed. Users who
+        never triggered the experience stay out of the comparison; their share sets the
+        **dilution factor** used for the business impact in the Decision phase.
+        """)
+        col_a, col_b = st.columns(2)
+        upload = col_a.file_uploader("**Event Log CSV**", type=["csv"], key="trigger_upload")
+        path = col_b.text_input("**...or a local file path** (large files)", key="trigger_path",
+                                placeholder="/data/events.csv")
+        if upload is None and not path:
+            return
+        
+        payload = upload.getvalue() if upload is not None else None
+        try:
+            modified = None if payload is not None else os.path.getmtime(path)
+            header = list(pd.read_csv(io.BytesIO(payload) if payload is not None else path, nrows=0).columns)
+        except (OSError, ValueError) as exc:
+            st.error(f"Could not read the file: {exc}")
+            return
+        
+        detected = ab_triggered.guess_event_columns(header)
+        optional = [NO_COLUMN] + header
+        
+        def default_index(column, fallback):
+            return header.index(column) if column else min(fallback, len(header) - 1)
+        
+        col1, col2, col3 = st.columns(3)
+        user = col1.selectbox("User column", header, index=default_index(detected['user'], 0), key="trigger_user")
+        event = col2.selectbox("Event column", header, index=default_index(detected['event'], 1),
+                               key="trigger_event")
+        variant = col3.selectbox("Variant column", header, index=default_index(detected['variant'], 2),
+                                 key="trigger_variant")
+        col1, col2, col3 = st.columns(3)
+        timestamp = col1.selectbox("Timestamp column", optional,
+                                   index=optional.index(detected['timestamp'] or NO_COLUMN), key="trigger_timestamp")
+        experiment = col2.selectbox("Experiment column", optional,
+                                    index=optional.index(detected['experiment'] or NO_COLUMN), key="trigger_experiment")
+        value = col3.selectbox("Value column", optional, index=optional.index(detected['value'] or NO_COLUMN),
+                               key="trigger_value")
+        
+        try:
+            sample = pd.read_csv(io.BytesIO(payload) if payload is not None else path, usecols=[event],
+                                 nrows=TRIGGER_EVENT_SAMPLE_ROWS)[event]
+        except (OSError, ValueError) as exc:
+            st.error(f"Could not read the event column: {exc}")
+            return
+        names = sorted(sample.dropna().astype(str).str.strip().unique())
+        col1, col2 = st.columns(2)
+        exposure_events = col1.multiselect(
+            "Exposure events", names, default=[name for name in names if name.lower() in ab_triggered.EXPOSURE_EVENTS],
+            key="trigger_exposure_events")
+        conversion_events = col2.multiselect(
+            "Conversion events", names,
+            default=[name for name in names if name.lower() in ab_triggered.CONVERSION_EVENTS],
+            key="trigger_conversion_events")
+        if not exposure_events:
+            st.info("Pick the event names that mark an exposure to the experience.")
+            return
+        
+        columns = {role: None if column == NO_COLUMN else column for role, column in (
+            ('user', user), ('event', event), ('variant', variant), ('timestamp', timestamp),
+            ('experiment', experiment), ('value', value))}
+        try:
+            with st.spinner("Reducing the log to first exposures..."):
+                report = load_triggered_analysis(payload, path, modified, tuple(columns.items()),
+                                                 tuple(exposure_events), tuple(conversion_events))
+        except (ValueError, KeyError) as exc:
+            st.error(f"Could not analyze the file: {exc}")
+            return
+        if not report['experiments']:
+            st.warning("No exposure events with a variant were found.")
+            return
+        
+        names = list(report['experiments'])
+        name = st.selectbox("Experiment", names, key="trigger_experiment_name") if len(names) > 1 else names[0]
+        result = report['experiments'][name]
+        stats = result['variants']
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Triggered Users", f"{result['triggered_users']:,}",
+                    help=f"Out of {report['population']:,} users with any event ({report['rows']:,} rows)")
+        col2.metric("Dilution Factor", f"{result['dilution_factor']:.1%}",
+                    help="Triggered users as a share of all users in the log")
+        col3.metric("Repeat Exposures Removed", f"{result['duplicate_exposures']:,}")
+        col4.metric("Pre-exposure Conversions", f"{result['pre_exposure_conversions']:,}",
+                    help="Conversions before the user's first exposure, not attributed to the experiment")
+        
+        table = pd.DataFrame.from_dict(stats, orient='index')
+        table['rate'] = table['x'] / table['n']
+        table['mean_value'] = table['value_sum'] / table['n']
+        st.dataframe(
+            table[['n', 'exposures', 'x', 'rate', 'mean_value']].rename(columns={
+                'n': 'Triggered Users', 'exposures': 'Exposures', 'x': 'Converters', 'rate': 'Rate',
+                'mean_value': 'Value per User'
+            }).style.format({'Triggered Users': '{:,.0f}', 'Exposures': '{:,.0f}', 'Converters': '{:,.0f}',
+                             'Rate': '{:.2%}', 'Value per User': '{:,.2f}'}),
+            use_container_width=True
+        )
+        
+        if len(stats) < 2:
+            st.info("Only one variant has triggered users.")
+            return
+        control, treatment = _split_live_variants(stats)
+        test = ab_stats.two_proportion_ztest(stats[control]['n'], stats[control]['x'],
+                                             stats[treatment]['n'], stats[treatment]['x'])
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Triggered P-value", f"{float(test['p_value']):.4f}")
+        col_b.metric("Triggered Relative Lift", f"{float(test['relative_lift']):+.2f}%")
+        col_c.metric("Comparison", f"{treatment} vs {control}")
+        st.caption(f"The triggered lift applies to {result['dilution_factor']:.1%} of users; the overall absolute "
+                   f"effect per user is the triggered absolute effect times that share.")
+        problem = counts_out_of_range(stats[control], stats[treatment])
+        if problem:
+            st.warning(f"⚠️ {problem} The triggered counts can't be copied below.")
+        st.button("⬇️ Use Triggered Counts Below", on_click=apply_triggered_counts, disabled=problem is not None,
+                  args=(stats[control], stats[treatment], result['dilution_factor']), key="trigger_apply")
+
+# Default (numerator, denominator) columns for catalog metrics that are ratios of per-user sums
+RATIO_METRIC_COLUMNS = {
+    "Click-to-Open Rate (CTOR)": ("clicks", "opens"),
+    "Average Order Value (AOV)": ("revenue", "orders"),
+    "Items per Order": ("items", "orders"),
+    "Pages per Session": ("pageviews", "sessions"),
+    "Average Session Duration": ("session_seconds", "sessions"),
+    "Cost per Click (CPC)": ("cost", "clicks"),
+    "Cost per Acquisition (CPA)": ("cost", "conversions"),
+    "Return on Ad Spend (ROAS)": ("revenue", "cost"),
+}
+
+@st.cache_data(show_spinner=False)
+def load_ratio_stats(payload, path, modified, numerator, denominator, variant):
+    """Per-variant sufficient statistics from uploaded bytes or a local file (keyed by mtime)"""
+    source = io.BytesIO(payload) if payload is not None else path
+    with instrumentation.timed("stat", "ratio_stats"):
+        return ab_ratio.stream_ratio_stats(source, numerator, denominator, variant)
+
+@instrumentation.timed_fn("figure", "ratio_ci")
+def build_ratio_ci_figure(result, alpha):
+    """Confidence interval of the ratio difference: delta method vs naive Bernoulli"""
+    diff = result['absolute_lift']
+    rows = [("Delta method", result['ci_upper'] - diff, GOOGLE_BLUE)]
+    if np.isfinite(result['naive_se']):
+        rows.append(("Naive (Bernoulli)", result['naive_ci_upper'] - diff, GOOGLE_GREY_LIGHT))
+    
+    fig = go.Figure()
+    for label, half_width, color in rows:
+        fig.add_trace(go.Scatter(
+            x=[diff], y=[label], mode='markers', name=label,
+            marker=dict(color=color, size=12),
+            error_x=dict(type='constant', value=half_width, color=color, thickness=3, width=8)
+        ))
+    fig.add_vline(x=0, line_dash="dash", line_color=GOOGLE_RED)
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Ratio Difference</b><br><sub>{1 - alpha:.0%} confidence intervals</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Treatment − Control",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=False,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def render_ratio_analysis():
+    """Delta-method test for ratio metrics from user-level numerator/denominator data"""
+    metric = st.session_state.experiment_data.get('metric')
+    with st.expander("➗ Ratio Metric Analysis (delta method)", expanded=metric in RATIO_METRIC_COLUMNS):
+        st.markdown("""
+        For metrics like **CTOR** (clicks / opens) or **AOV** (revenue / orders) the denominator is
+        random and several units come from the same user, so a Bernoulli test understates the variance.
+        Provide **one row per user** with the variant, the numerator and the denominator; the file is
+        aggregated in a single streaming pass, so large exports never need to fit in memory.
+        """)
+        col_a, col_b = st.columns(2)
+        upload = col_a.file_uploader("**User-level CSV**", type=["csv"], key="ratio_upload")
+        path = col_b.text_input("**...or a local file path** (large files)", key="ratio_path",
+                                placeholder="/data/users.csv")
+        if upload is None and not path:
+            return
+        
+        payload = upload.getvalue() if upload is not None else None
+        try:
+            modified = None if payload is not None else os.path.getmtime(path)
+            header = list(pd.read_csv(io.BytesIO(payload) if payload is not None else path, nrows=0).columns)
+        except (OSError, ValueError) as exc:
+            st.error(f"Could not read the file: {exc}")
+            return
+        
+        default_num, default_den = RATIO_METRIC_COLUMNS.get(metric, (None, None))
+        lowered = [column.strip().lower() for column in header]
+        
+        def default_index(name, fallback):
+            return lowered.index(name) if name in lowered else min(fallback, len(header) - 1)
+        
+        variant_default = next((lowered.index(name) for name in ab_ratio.VARIANT_COLUMNS if name in lowered), 0)
+        col1, col2, col3 = st.columns(3)
+        variant = col1.selectbox("Variant column", header, index=variant_default, key="ratio_variant")
+        numerator = col2.selectbox("Numerator", header, index=default_index(default_num, 1), key="ratio_numerator")
+        denominator = col3.selectbox("Denominator", header, index=default_index(default_den, 2),
+                                     key="ratio_denominator")
+        
+        try:
+            stats, users = load_ratio_stats(payload, path, modified, numerator, denominator, variant)
+        except (ValueError, KeyError) as exc:
+            st.error(f"Could not aggregate the file: {exc}")
+            return
+        if len(stats) < 2:
+            st.warning("Need at least two variants in the variant column")
+            return
+        
+        control_default, treatment_default = _split_live_variants(stats)
+        names = list(stats)
+        col1, col2 = st.columns(2)
+        control = col1.selectbox("Control variant", names, index=names.index(control_default), key="ratio_control")
+        treatment = col2.selectbox("Treatment variant", [name for name in names if name != control],
+                                   key="ratio_treatment")
+        
+        alpha = st.session_state.experiment_data.get('alpha', 0.05)
+        with instrumentation.timed("stat", "delta_method_ztest"):
+            result = {key: float(value) for key, value in
+                      ab_ratio.delta_method_ztest(stats[control], stats[treatment], alpha).items()}
+        st.session_state['ratio_results'] = {**result, 'numerator': numerator, 'denominator': denominator}
+        
+        st.caption(f"{users:,} users aggregated · {numerator} / {denominator}")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Control Ratio", f"{result['control_ratio']:.4f}")
+        col2.metric("Treatment Ratio", f"{result['treatment_ratio']:.4f}", delta=f"{result['relative_lift']:+.2f}%")
+        col3.metric("P-value (delta)", f"{result['p_value']:.4f}")
+        if np.isfinite(result['naive_p_value']):
+            col4.metric("P-value (naive)", f"{result['naive_p_value']:.4f}",
+                        help=f"Bernoulli over {denominator}; variance understated "
+                             f"{result['variance_inflation']:.2f}x")
+        
+        if result['p_value'] < alpha:
+            st.success(f"✅ Significant at α = {alpha}: {1 - alpha:.0%} CI for the difference "
+                       f"[{result['ci_lower']:.4f}, {result['ci_upper']:.4f}]")
+        else:
+            st.info(f"Not significant at α = {alpha}: {1 - alpha:.0%} CI for the difference "
+                    f"[{result['ci_lower']:.4f}, {result['ci_upper']:.4f}]")
+        if np.isfinite(result['naive_p_value']) and (result['naive_p_value'] < alpha) != (result['p_value'] < alpha):
+            st.warning("⚠️ The naive Bernoulli test reaches a different conclusion. Trust the delta method: "
+                       f"{denominator} from the same user are correlated.")
+        
+        st.plotly_chart(build_ratio_ci_figure(result, alpha), use_container_width=True)
+
+# Preferred value columns for quantile effects, most specific first
+QUANTILE_METRIC_COLUMNS = ("revenue", "order_value", "session_seconds", "session_duration", "duration", "value")
+QUANTILE_LEVELS = [0.25, 0.5, 0.75, 0.9, 0.95, 0.99]
+
+@st.cache_data(show_spinner=False)
+def load_quantile_sketches(payload, path, modified, metric, variant):
+    """Per-variant t-digests from uploaded bytes or a local file (keyed by mtime)"""
+    source = io.BytesIO(payload) if payload is not None else path
+    with instrumentation.timed("stat", "quantile_sketches"):
+        return ab_quantiles.stream_sketches(source, metric, variant)
+
+@instrumentation.timed_fn("figure", "quantile_effects")
+def build_quantile_effects_figure(effects, alpha):
+    """Treatment − control difference at each quantile with its confidence interval"""
+    labels = [f"p{level * 100:g}" for level in effects['quantile']]
+    colors = [
+        (GOOGLE_GREEN if diff > 0 else GOOGLE_RED) if significant else GOOGLE_GREY_LIGHT
+        for diff, significant in zip(effects['difference'], effects['significant'])
+    ]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=labels, y=effects['difference'], mode='markers', name='Difference',
+        marker=dict(color=colors, size=12),
+        error_y=dict(type='data', symmetric=False, color=GOOGLE_BLUE, thickness=2, width=8,
+                     array=effects['ci_upper'] - effects['difference'],
+                     arrayminus=effects['difference'] - effects['ci_lower'])
+    ))
+    fig.add_hline(y=0, line_dash="dash", line_color=GOOGLE_RED)
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Quantile Treatment Effects</b><br><sub>{1 - alpha:.0%} confidence intervals from the sketches</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Quantile",
+        yaxis_title="Treatment − Control",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=False,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def render_quantile_analysis():
+    """p50/p90/p99 shifts from mergeable per-variant sketches, stored per day in the registry"""
+    with st.expander("📊 Quantile Treatment Effects (p50 / p90 / p99)", expanded=False):
+        st.markdown("""
+        For skewed metrics like **revenue** or **session duration**, shifts in the median or the tail can
+        matter more than the mean. Each variant is summarised by a compact **t-digest** sketch built while
+        streaming the file. Store a day's sketches in the registry and later days merge with them,
+        so earlier partitions never need to be rescanned.
+        """)
+        data = st.session_state.experiment_data
+        experiment_id = data.get('experiment_id')
+        registry = get_registry()
+        
+        col_a, col_b = st.columns(2)
+        upload = col_a.file_uploader("**User-level CSV** (one day's partition)", type=["csv"], key="quantile_upload")
+        path = col_b.text_input("**...or a local file path** (large files)", key="quantile_path",
+                                placeholder="/data/revenue_2024-06-01.csv")
+        
+        sketches, rows, metric = {}, 0, None
+        if upload is not None or path:
+            payload = upload.getvalue() if upload is not None else None
+            try:
+                modified = None if payload is not None else os.path.getmtime(path)
+                header = list(pd.read_csv(io.BytesIO(payload) if payload is not None else path, nrows=0).columns)
+            except (OSError, ValueError) as exc:
+                st.error(f"Could not read the file: {exc}")
+                return
+            
+            lowered = [column.strip().lower() for column in header]
+            variant_default = next((lowered.index(name) for name in ab_ratio.VARIANT_COLUMNS if name in lowered), 0)
+            metric_default = next((lowered.index(name) for name in QUANTILE_METRIC_COLUMNS if name in lowered),
+                                  min(1, len(header) - 1))
+            col1, col2, col3 = st.columns(3)
+            variant = col1.selectbox("Variant column", header, index=variant_default, key="quantile_variant")
+            metric = col2.selectbox("Metric column", header, index=metric_default, key="quantile_metric")
+            st.session_state.setdefault('quantile_day', datetime.now().date())
+            day = col3.date_input("Partition day", key="quantile_day")
+            
+            try:
+                sketches, rows = load_quantile_sketches(payload, path, modified, metric, variant)
+            except (ValueError, KeyError) as exc:
+                st.error(f"Could not sketch the file: {exc}")
+                return
+            
+            if st.button("💾 Store this day's sketches", key="quantile_store",
+                         help="Saved with the experiment; storing the same day again replaces it"):
+                experiment_id = experiment_id or persist_design()
+                if not experiment_id:
+                    st.warning("Size the experiment in the Design phase before storing sketches.")
+                    return
+                registry.save_sketches(experiment_id, metric, day,
+                                       {name: digest.to_dict() for name, digest in sketches.items()})
+                try:
+                    registry.flush()
+                except Exception as exc:
+                    st.error(f"Could not store the sketches: {exc}")
+                else:
+                    st.success(f"Stored {len(sketches)} variant sketches of `{metric}` for {day}")
+        
+        stored = registry.load_sketches(experiment_id) if experiment_id else []
+        if metric is None and stored:
+            # No file: analyse the stored partitions alone
+            metrics = sorted({row['metric'] for row in stored})
+            metric = st.selectbox("Stored metric", metrics, key="quantile_stored_metric")
+        stored = [row for row in stored if row['metric'] == metric and not (sketches and row['day'] == str(day))]
+        
+        combined = ab_quantiles.merge_sketches({}, sketches)
+        if stored:
+            days = sorted({row['day'] for row in stored})
+            st.session_state.setdefault('quantile_merge_stored', True)
+            if not sketches or st.checkbox(f"Merge {len(days)} stored day(s) ({days[0]} → {days[-1]})",
+                                           key="quantile_merge_stored"):
+                for row in stored:
+                    ab_quantiles.merge_sketches(combined, {row['variant']: ab_quantiles.TDigest.from_dict(row['sketch'])})
+        if not combined:
+            return
+        if len(combined) < 2:
+            st.warning("Need at least two variants in the variant column")
+            return
+        
+        control_default, treatment_default = _split_live_variants(combined)
+        names = list(combined)
+        col1, col2, col3 = st.columns(3)
+        control = col1.selectbox("Control variant", names, index=names.index(control_default), key="quantile_control")
+        treatment = col2.selectbox("Treatment variant", [name for name in names if name != control],
+                                   key="quantile_treatment")
+        st.session_state.setdefault('quantile_levels', list(ab_quantiles.DEFAULT_QUANTILES))
+        levels = col3.multiselect("Quantiles", QUANTILE_LEVELS, key="quantile_levels",
+                                  format_func=lambda level: f"p{level * 100:g}")
+        if not levels:
+            st.info("Select at least one quantile")
+            return
+        
+        alpha = data.get('alpha', 0.05)
+        with instrumentation.timed("stat", "quantile_effects"):
+            effects = ab_quantiles.quantile_effects(combined[control], combined[treatment], sorted(levels), alpha)
+        st.session_state['quantile_results'] = {'metric': metric, 'effects': effects.to_dict('records')}
+        
+        counts = " · ".join(f"{name}: {combined[name].count:,.0f}" for name in (control, treatment))
+        st.caption(f"`{metric}` · {counts} users" + (f" · {rows:,} rows in this file" if rows else ""))
+        display = effects.assign(quantile=[f"p{level * 100:g}" for level in effects['quantile']])
+        st.dataframe(
+            display.style.format({
+                'control': "{:,.2f}", 'treatment': "{:,.2f}", 'difference': "{:+,.2f}",
+                'relative_lift': "{:+.2f}%", 'ci_lower': "{:+,.2f}", 'ci_upper': "{:+,.2f}", 'p_value': "{:.4f}",
+            }),
+            hide_index=True, use_container_width=True
+        )
+        significant = display.loc[display['significant'], 'quantile'].tolist()
+        if significant:
+            st.success(f"✅ Significant shifts at α = {alpha}: {', '.join(significant)}")
+        else:
+            st.info(f"No quantile shift is significant at α = {alpha}")
+        
+        st.plotly_chart(build_quantile_effects_figure(effects, alpha), use_container_width=True)
+
+def tab_analysis():
+    st.markdown('<p class="phase-header">📈 Phase 5: Analysis</p>', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <p style="font-size: 1rem; line-height: 1.6; color: {GOOGLE_GREY}; margin: 0;">
+    Your experiment has completed. Now analyze the results, interpret statistical significance, 
+    and make a data-driven decision based on rigorous statistical methods.
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Experiment recap
+    with st.expander("📋 Your Experiment Design Recap", expanded=False):
+        if st.session_state.experiment_data:
+            data = st.session_state.experiment_data
+            st.markdown(f"""
+            - **Channel:** {data.get('channel', 'N/A')}
+            - **Metric:** {data.get('metric', 'N/A')}
+            - **Baseline:** {catalog.format_metric_value(data.get('baseline', 0), data.get('distribution', 'binomial'))}
+            - **MDE:** {data.get('mde', 0):.1f}%
+            - **Sample Size:** {data.get('sample_size_per_group', 0):,} per group
+            - **Duration:** {data.get('duration_days', 0)} days
+            """)
+    
+    # Step 1: Data Quality
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">✅ Step 1: Data Quality & Sanity Checks</div>
+    <p style="color: {GOOGLE_GREY_LIGHT};">Before analyzing, verify your data is trustworthy</p>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 🔍 Sample Ratio Mismatch Check")
+        expected_ratio = st.number_input("Expected Split (Control%)", 0, 100, 50, key="srm_expected")
+        actual_control_n = st.number_input("Actual Control Sample", 0, 10000000, 10000, key="srm_control")
+        actual_treatment_n = st.number_input("Actual Treatment Sample", 0, 10000000, 10000, key="srm_treatment")
+        
+        total_samples = actual_control_n + actual_treatment_n
+        actual_control_pct = (actual_control_n / total_samples * 100) if total_samples > 0 else 0
+        
+        # Chi-square SRM test
+        with instrumentation.timed("stat", "srm_test"):
+            _, srm_p_value = ab_stats.srm_test(actual_control_n, actual_treatment_n, expected_ratio)
+        srm_p_value = float(srm_p_value)
+        
+        col_a, col_b = st.columns(2)
+        col_a.metric("Actual Control %", f"{actual_control_pct:.1f}%")
+        col_b.metric("SRM P-value", f"{srm_p_value:.4f}")
+        
+        if srm_p_value < 0.001:
+            st.markdown(f"""
+            <div class="danger-box">
+            <strong>🚨 SRM DETECTED</strong> (p={srm_p_value:.6f})<br><br>
+            Sample sizes deviate significantly. Possible causes:
+            <ul>
+            <li>Bot traffic affecting one variant</li>
+            <li>Randomization implementation bug</li>
+            <li>Triggering condition issues</li>
+            </ul>
+            <strong>⚠️ DO NOT TRUST RESULTS</strong>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="success-box">
+            ✅ <strong>No SRM detected</strong> (p={srm_p_value:.4f})
+            </div>
+            """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("#### 🧪 A/A Test Recommendation")
+        st.markdown(f"""
+        <div class="info-box">
+        <strong>Have you run an A/A test?</strong><br><br>
+        An A/A test verifies:
+        <ul>
+        <li>✓ Randomization works correctly</li>
+        <li>✓ No systematic biases</li>
+        <li>✓ False positive rate matches α</li>
+        </ul>
+        <strong>Best practice:</strong> Run before first real experiment, or simulate one below
+        from historical data
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if 'aa_passed' in st.session_state.experiment_data:
+            rate = st.session_state.experiment_data['aa_false_positive_rate']
+            if st.session_state.experiment_data['aa_passed']:
+                st.success(f"✅ A/A simulation passed (false positive rate {rate:.2%})")
+            else:
+                st.error(f"🚨 A/A simulation failed (false positive rate {rate:.2%})")
+    
+    render_srm_monitor(expected_ratio)
+    render_aa_simulator(100 - expected_ratio)
+    render_data_quality()
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 2: Enter Results
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">📊 Step 2: Enter Experiment Results</div>
+    """, unsafe_allow_html=True)
+    
+    render_live_mode()
+    render_triggered_analysis()
+    render_ratio_analysis()
+    render_quantile_analysis()
+    
+    # Defaults are seeded through session state (not value=) so live mode can fill the inputs
+    st.session_state.setdefault("results_control_n", 10000)
+    st.session_state.setdefault("results_treatment_n", 10000)
+    st.session_state.setdefault("results_control_x", int(st.session_state.results_control_n * 0.05))
+    st.session_state.setdefault("results_treatment_x", int(st.session_state.results_treatment_n * 0.055))
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Control Group (A)")
+        control_n = st.number_input("Total Sample Size", RESULTS_MIN_N, RESULTS_MAX_N, key="results_control_n")
+        if st.session_state.get("results_control_x", 0) > control_n:
+            st.session_state.results_control_x = int(control_n * 0.05)
+        control_x = st.number_input("Number of Successes", 0, control_n, key="results_control_x")
+        control_rate = control_x / control_n if control_n > 0 else 0
+        
+        st.metric("Control Rate", f"{control_rate*100:.2f}%", f"{control_x:,} successes")
+    
+    with col2:
+        st.markdown("#### Treatment Group (B)")
+        treatment_n = st.number_input("Total Sample Size", RESULTS_MIN_N, RESULTS_MAX_N, key="results_treatment_n")
+        if st.session_state.get("results_treatment_x", 0) > treatment_n:
+            st.session_state.results_treatment_x = int(treatment_n * 0.055)
+        treatment_x = st.number_input("Number of Successes", 0, treatment_n, key="results_treatment_x")
+        treatment_rate = treatment_x / treatment_n if treatment_n > 0 else 0
+        
+        st.metric("Treatment Rate", f"{treatment_rate*100:.2f}%", f"{treatment_x:,} successes")
+    
+    # Step 3: Analyze
+    if st.button("📊 Analyze Results", type="primary", use_container_width=True):
+        # Two-proportion z-test with 95% CI
+        with instrumentation.timed("stat", "two_proportion_ztest"):
+            test = ab_stats.two_proportion_ztest(control_n, control_x, treatment_n, treatment_x)
+        st.session_state['analysis_results'] = {key: float(value) for key, value in test.items()}
+        st.session_state['analysis_results'].update({'control_n': control_n, 'treatment_n': treatment_n})
+        
+        # Persist results and today's counts so they survive a refresh
+        registry = get_registry()
+        experiment_id = st.session_state.experiment_data.get('experiment_id') or persist_design()
+        if experiment_id:
+            registry.save_analysis(experiment_id, st.session_state['analysis_results'])
+            registry.record_snapshot(experiment_id, datetime.now().date(), control_n, control_x, treatment_n,
+                                     treatment_x)
+        else:
+            st.caption("Results are not saved to the registry until the Design phase has sized the experiment.")
+        
+        p_value = st.session_state['analysis_results']['p_value']
+        absolute_lift = st.session_state['analysis_results']['absolute_lift']
+        relative_lift = st.session_state['analysis_results']['relative_lift']
+        ci_lower = st.session_state['analysis_results']['ci_lower']
+        ci_upper = st.session_state['analysis_results']['ci_upper']
+        
+        st.markdown("---")
+        st.markdown("### 📈 Key Metrics")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Absolute Lift", f"{absolute_lift:.2f}%p")
+        col2.metric("Relative Lift", f"{relative_lift:.2f}%")
+        col3.metric("P-value", f"{p_value:.4f}")
+        
+        if p_value < 0.05:
+            col4.metric("Result", "✅ Significant")
+        else:
+            col4.metric("Result", "❌ Not Sig")
+        
+        st.caption(f"**95% CI:** [{ci_lower*100:.2f}%, {ci_upper*100:.2f}%]")
+        
+        # Interpretation
+        st.markdown("### 🎯 Statistical Interpretation")
+        
+        if p_value < 0.05:
+            if relative_lift > 0:
+                st.markdown(f"""
+                <div class="success-box">
+                <h4>✅ Statistically Significant Improvement</h4>
+                <p><strong>Treatment is {relative_lift:.1f}% better</strong> than control (p={p_value:.4f})</p>
+                <ul>
+                <li>Only a {p_value*100:.2f}% chance of seeing this by random chance</li>
+                <li>True effect likely between {ci_lower*100:.2f}% and {ci_upper*100:.2f}% (95% confidence)</li>
+                <li>Strong evidence for treatment effectiveness</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="danger-box">
+                <h4>❌ Statistically Significant Degradation</h4>
+                <p><strong>Treatment is {abs(relative_lift):.1f}% worse</strong> (p={p_value:.4f})</p>
+                <p>The treatment caused a significant decline. This is valuable learning!</p>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class="warning-box">
+            <h4>⚠️ Not Statistically Significant</h4>
+            <p>No significant difference detected (p={p_value:.4f} ≥ 0.05)</p>
+            <p>The observed {relative_lift:.2f}% change could be due to random chance.</p>
+            <p><strong>Possible reasons:</strong> No true effect, underpowered test, high variance, or bad timing</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Visualization
+        fig = build_results_figure(control_rate, treatment_rate, p_value)
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,515 @@
+"""Phase 6: business impact, rollout strategy and the final decision"""
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from playbook import instrumentation
+from playbook import projection as ab_projection
+from playbook import simulation as ab_simulation
+from playbook import stats as ab_stats
+from ui.common import get_registry, persist_design
+from ui.theme import (GOOGLE_BLUE, GOOGLE_BLUE_LIGHT, GOOGLE_GREEN, GOOGLE_GREY, GOOGLE_GREY_LIGHT,
+                      GOOGLE_RED, GOOGLE_YELLOW)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def run_impact_simulation(control_rate, diff, se_diff, monthly_users, value_per_conversion,
+                          implementation_cost, ongoing_cost_monthly, users_cv, value_cv, draws, horizon_months):
+    """Binned Monte Carlo impact summary (seeded, so reruns are stable and cacheable)"""
+    impact = ab_simulation.simulate_business_impact(
+        control_rate, diff, se_diff, monthly_users, value_per_conversion,
+        implementation_cost, ongoing_cost_monthly, users_cv, value_cv, draws, seed=42
+    )
+    return ab_simulation.summarize_simulation(impact, implementation_cost, ongoing_cost_monthly, horizon_months)
+
+@instrumentation.timed_fn("figure", "impact_distribution")
+def build_impact_distribution_figure(summary):
+    """Histogram of simulated monthly revenue impact, losses in red"""
+    edges, counts = summary['monthly_histogram']
+    centers = (edges[:-1] + edges[1:]) / 2
+    
+    fig = go.Figure(go.Bar(
+        x=centers, y=counts / summary['draws'], width=np.diff(edges),
+        marker_color=[GOOGLE_GREEN if center >= 0 else GOOGLE_RED for center in centers],
+        name='Monthly impact'
+    ))
+    fig.add_vline(x=summary['monthly_p50'], line_dash="dash", line_color=GOOGLE_BLUE,
+                  annotation_text=f"Median ${summary['monthly_p50']:,.0f}")
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Monthly Revenue Impact</b><br><sub>{summary['draws']:,} simulated outcomes</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Monthly Impact ($)",
+        yaxis_title="Share of Draws",
+        height=350,
+        bargap=0,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        showlegend=False,
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+@instrumentation.timed_fn("figure", "months_to_roi")
+def build_months_to_roi_figure(summary):
+    """Distribution of months to recover the implementation cost"""
+    edges, counts = summary['months_histogram']
+    months, recovered_by = summary['recovered_by_month']
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=counts / summary['draws'], width=np.diff(edges),
+        marker_color=GOOGLE_BLUE_LIGHT, name='Recovered in month'
+    ))
+    fig.add_trace(go.Scatter(
+        x=months, y=recovered_by, name='Recovered by month',
+        line=dict(color=GOOGLE_BLUE, width=3), yaxis='y2'
+    ))
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Months to ROI</b><br><sub>Never recovered in {summary['p_never_recovered']:.1%} of draws</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Months",
+        yaxis=dict(title="Share of Draws"),
+        yaxis2=dict(title="Cumulative", overlaying='y', side='right', range=[0, 1], tickformat='.0%'),
+        height=350,
+        bargap=0,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        legend=dict(orientation='h', y=-0.25),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def render_impact_simulation(results, monthly_users, value_per_conversion, implementation_cost, ongoing_cost_monthly):
+    """Monte Carlo view of the business impact using the lift's uncertainty"""
+    st.markdown("---")
+    st.markdown("#### 🎲 Impact Uncertainty (Monte Carlo)")
+    
+    if not st.toggle("Simulate impact from the lift's confidence interval", key="mc_enabled"):
+        st.caption("Draws the lift from its sampling distribution, with uncertainty in traffic and value, "
+                   "instead of trusting the point estimate.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    users_cv = col1.slider("Monthly users uncertainty (±%)", 0, 50, 10, key="mc_users_cv") / 100
+    value_cv = col2.slider("Value per conversion uncertainty (±%)", 0, 50, 10, key="mc_value_cv") / 100
+    horizon = col3.selectbox("ROI horizon (months)", [6, 12, 24, 36], index=1, key="mc_horizon")
+    draws = col4.selectbox("Draws", [10_000, 100_000, 1_000_000], index=2, key="mc_draws",
+                           format_func=lambda n: f"{n:,}")
+    
+    with instrumentation.timed("stat", "impact_simulation"):
+        summary = run_impact_simulation(
+            results['control_rate'], results['treatment_rate'] - results['control_rate'], results['se_diff'],
+            monthly_users, value_per_conversion, implementation_cost, ongoing_cost_monthly,
+            users_cv, value_cv, draws, horizon
+        )
+    
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(f"P(ROI > 0 in {horizon} mo)", f"{summary['roi_positive']:.1%}")
+    col2.metric("P(Positive Impact)", f"{summary['p_positive_impact']:.1%}")
+    col3.metric("Monthly Impact 90% Range", f"${summary['monthly_p5']:,.0f} – ${summary['monthly_p95']:,.0f}")
+    col4.metric("Median Months to ROI",
+                f"{summary['months_to_roi_p50']:.1f}" if np.isfinite(summary['months_to_roi_p50']) else "N/A")
+    
+    fig_col1, fig_col2 = st.columns(2)
+    fig_col1.plotly_chart(build_impact_distribution_figure(summary), use_container_width=True)
+    fig_col2.plotly_chart(build_months_to_roi_figure(summary), use_container_width=True)
+
+@instrumentation.timed_fn("figure", "rollout_projection")
+def build_rollout_projection_figure(projection, effect_index, decay_index, cost_index, selected_strategy):
+    """Cumulative net value per rollout strategy for one scenario, with the grid range of the chosen one"""
+    cumulative = projection['cumulative_net']
+    months = projection['months']
+    palette = [GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_YELLOW, GOOGLE_RED, GOOGLE_GREY]
+    
+    fig = go.Figure()
+    selected = projection['strategies'].index(selected_strategy) if selected_strategy in projection['strategies'] else None
+    if selected is not None:
+        grid = cumulative[selected].reshape(-1, len(months))
+        fig.add_trace(go.Scatter(x=months, y=grid.max(axis=0), line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=months, y=grid.min(axis=0), fill='tonexty', line=dict(width=0),
+                                 fillcolor='rgba(66, 133, 244, 0.15)', name='Selected: full grid range'))
+    
+    for index, name in enumerate(projection['strategies']):
+        fig.add_trace(go.Scatter(
+            x=months, y=cumulative[index, effect_index, decay_index, cost_index], name=name,
+            line=dict(color=palette[index % len(palette)], width=4 if index == selected else 2,
+                      dash='solid' if index == selected else 'dot')
+        ))
+    fig.add_hline(y=0, line_color=GOOGLE_GREY_LIGHT)
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Cumulative Net Value by Rollout Strategy</b><br><sub>{len(months)}-month projection</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Month",
+        yaxis_title="Cumulative Net ($)",
+        height=400,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        legend=dict(orientation='h', y=-0.2),
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def render_rollout_projection(results, rollout_options, selected_strategy, monthly_users, value_per_conversion,
+                              implementation_cost, ongoing_cost_monthly):
+    """Project every rollout option over a grid of effect, decay and cost assumptions"""
+    with st.expander("📈 Compare Rollout Strategies (24-month projection)", expanded=False):
+        col1, col2 = st.columns(2)
+        decays = col1.multiselect(
+            "Monthly effect decay scenarios", [0.0, 0.01, 0.02, 0.05, 0.10, 0.20],
+            default=list(ab_projection.DEFAULT_DECAYS), format_func=lambda d: f"{d:.0%}/month", key="proj_decays"
+        ) or [0.0]
+        cost_multipliers = col2.multiselect(
+            "Cost scenarios (× entered costs)", [0.5, 0.75, 1.0, 1.25, 1.5, 2.0],
+            default=list(ab_projection.DEFAULT_COST_MULTIPLIERS), format_func=lambda c: f"{c:g}×", key="proj_costs"
+        ) or [1.0]
+        
+        effects = {
+            'CI lower': results['ci_lower'],
+            'Point estimate': results['treatment_rate'] - results['control_rate'],
+            'CI upper': results['ci_upper'],
+        }
+        schedules = {name: ab_projection.ROLLOUT_SCHEDULES[name]
+                     for name in rollout_options if name in ab_projection.ROLLOUT_SCHEDULES}
+        with instrumentation.timed("stat", "rollout_projection"):
+            projection = ab_projection.project_rollouts(
+                monthly_users, value_per_conversion, effects, implementation_cost, ongoing_cost_monthly,
+                schedules, sorted(decays), sorted(cost_multipliers)
+            )
+        
+        col1, col2, col3 = st.columns(3)
+        effect_label = col1.selectbox("Effect shown", projection['effects'], index=1, key="proj_effect")
+        decay = col2.selectbox("Decay shown", projection['decays'], format_func=lambda d: f"{d:.0%}/month",
+                               key="proj_decay")
+        cost = col3.selectbox("Costs shown", projection['cost_multipliers'], format_func=lambda c: f"{c:g}×",
+                              index=int(np.argmin(np.abs(projection['cost_multipliers'] - 1))), key="proj_cost")
+        
+        fig = build_rollout_projection_figure(
+            projection, projection['effects'].index(effect_label),
+            int(np.flatnonzero(projection['decays'] == decay)[0]),
+            int(np.flatnonzero(projection['cost_multipliers'] == cost)[0]),
+            selected_strategy
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        summary = ab_projection.scenario_summary(projection)
+        st.markdown(f"**Across all {projection['cumulative_net'][0].size // len(projection['months'])} "
+                    f"effect × decay × cost scenarios:**")
+        st.dataframe(
+            summary.set_index('strategy').rename(columns={
+                'worst_net': 'Worst 24-mo Net', 'median_net': 'Median 24-mo Net', 'best_net': 'Best 24-mo Net',
+                'share_positive': 'Scenarios Positive', 'median_breakeven_month': 'Median Breakeven Month'
+            }).style.format({
+                'Worst 24-mo Net': '${:,.0f}', 'Median 24-mo Net': '${:,.0f}', 'Best 24-mo Net': '${:,.0f}',
+                'Scenarios Positive': '{:.0%}', 'Median Breakeven Month': '{:.0f}'
+            }),
+            use_container_width=True
+        )
+        
+        st.download_button(
+            "⬇️ Download Projection (CSV)",
+            ab_projection.projection_frame(projection).to_csv(index=False).encode(),
+            file_name="rollout_projection.csv",
+            mime="text/csv",
+            key="proj_download"
+        )
+
+def tab_decision():
+    st.markdown('<p class="phase-header">✅ Phase 6: Decision</p>', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <p style="font-size: 1rem; line-height: 1.6; color: {GOOGLE_GREY}; margin: 0;">
+    Make an informed decision about rolling out the treatment. Quantify business impact,
+    assess ROI, and document your learnings for future experiments.
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    results = st.session_state.get('analysis_results')
+    if not results:
+        st.info("📊 Run the analysis phase first to compute experiment outcomes")
+        return
+    
+    control_rate = results['control_rate']
+    treatment_rate = results['treatment_rate']
+    absolute_lift = results['absolute_lift']
+    relative_lift = results['relative_lift']
+    p_value = results['p_value']
+    ci_lower = results['ci_lower']
+    ci_upper = results['ci_upper']
+    
+    # Step 4: Recommendation
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">💡 Step 4: Decision Framework</div>
+    """, unsafe_allow_html=True)
+    
+    if p_value < 0.05 and relative_lift > 0:
+        st.markdown(f"""
+        <div class="success-box">
+        <h4>✅ RECOMMENDATION: ROLL OUT TREATMENT</h4>
+        <p><strong>Rationale:</strong></p>
+        <ul>
+        <li>Statistically significant improvement: {relative_lift:.1f}% (p={p_value:.4f})</li>
+        <li>95% confident true effect is positive (CI: [{ci_lower*100:.2f}%, {ci_upper*100:.2f}%])</li>
+        <li>Low risk given strong statistical evidence</li>
+        </ul>
+        <p><strong>Next Steps:</strong></p>
+        <ol>
+        <li>Check guardrail metrics for degradation</li>
+        <li>Perform segment analysis (device, geo, cohort)</li>
+        <li>Plan gradual rollout (10% → 50% → 100%)</li>
+        <li>Document learnings for future tests</li>
+        <li>Maintain 5-10% holdout for long-term measurement</li>
+        </ol>
+        </div>
+        """, unsafe_allow_html=True)
+    elif p_value < 0.05 and relative_lift < 0:
+        st.markdown(f"""
+        <div class="danger-box">
+        <h4>❌ RECOMMENDATION: DO NOT ROLL OUT</h4>
+        <p>Statistically significant <strong>degradation</strong>: {abs(relative_lift):.1f}% worse</p>
+        <p><strong>Next Steps:</strong></p>
+        <ol>
+        <li>Perform root-cause analysis (session replays, user feedback)</li>
+        <li>Look for segment-specific wins</li>
+        <li>Refine hypothesis and iterate on improved variant</li>
+        <li>Document findings - negative results are valuable</li>
+        </ol>
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown(f"""
+        <div class="warning-box">
+        <h4>⚠️ RECOMMENDATION: CONTEXT-DEPENDENT</h4>
+        <p>No statistically significant difference (p={p_value:.4f})</p>
+        <p><strong>Options:</strong></p>
+        <ul>
+        <li><strong>Extend test:</strong> Increase exposure to reduce variance</li>
+        <li><strong>Ship anyway:</strong> Only if cost/risk is low</li>
+        <li><strong>Abandon & iterate:</strong> Design new variant</li>
+        <li><strong>Sequential testing:</strong> Plan another checkpoint</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 5: Business Impact
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">💰 Step 5: Quantify Business Impact</div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        monthly_users = st.number_input(
+            "**Expected Monthly Users**",
+            min_value=1000,
+            max_value=1_000_000_000,
+            value=100_000,
+            step=10_000,
+            key="impact_monthly_users"
+        )
+        value_per_conversion = st.number_input(
+            "**Value per Conversion ($)**",
+            min_value=0.0,
+            max_value=100_000.0,
+            value=50.0,
+            step=5.0,
+            key="impact_value"
+        )
+        # Seeded from the triggered analysis, whose lift only applies to users who reach the experience
+        dilution_factor = st.session_state.experiment_data.get('dilution_factor', 1.0)
+        st.session_state.setdefault("impact_trigger_share", max(round(100 * dilution_factor, 2), 0.01))
+        trigger_share = st.number_input(
+            "**Share of Monthly Users Who Trigger the Experience (%)**",
+            min_value=0.01,
+            max_value=100.0,
+            step=5.0,
+            key="impact_trigger_share",
+            help="The dilution factor: the lift was measured on triggered users only"
+        )
+        affected_users = monthly_users * trigger_share / 100
+        if trigger_share < 100:
+            st.caption(f"Impact over {affected_users:,.0f} triggered users/month. Overall lift across all users: "
+                       f"{absolute_lift * trigger_share / 100:.3f}%p (triggered {absolute_lift:.2f}%p × "
+                       f"{trigger_share:g}%)")
+    
+    with col2:
+        with instrumentation.timed("stat", "business_impact"):
+            impact = ab_stats.business_impact(control_rate, treatment_rate, affected_users, value_per_conversion)
+        baseline_conversions = float(impact['baseline_conversions'])
+        incremental_conversions = float(impact['incremental_conversions'])
+        monthly_impact = float(impact['monthly_impact'])
+        annual_impact = float(impact['annual_impact'])
+        
+        st.metric("Baseline Conversions/Month", f"{baseline_conversions:,.0f}")
+        st.metric("Incremental Conversions/Month", f"{incremental_conversions:,.0f}")
+        st.metric("**Monthly Revenue Impact**", f"**${monthly_impact:,.0f}**")
+        st.metric("**Annual Revenue Impact**", f"**${annual_impact:,.0f}**")
+    
+    # ROI Assessment
+    st.markdown("---")
+    st.markdown("#### 🎯 ROI Assessment")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        implementation_cost = st.number_input(
+            "One-time Implementation Cost ($)",
+            0, 1_000_000, 10_000, 1_000,
+            key="impact_implementation_cost"
+        )
+    with col2:
+        ongoing_cost_monthly = st.number_input(
+            "Ongoing Monthly Cost ($)",
+            0, 100_000, 0, 500,
+            key="impact_ongoing_cost"
+        )
+    
+    with instrumentation.timed("stat", "business_impact"):
+        roi = ab_stats.business_impact(control_rate, treatment_rate, affected_users, value_per_conversion,
+                                       implementation_cost, ongoing_cost_monthly)
+    first_month_net = float(roi['first_month_net'])
+    ongoing_monthly_net = float(roi['ongoing_monthly_net'])
+    months_to_roi = float(roi['months_to_roi'])
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("First Month Net", f"${first_month_net:,.0f}")
+    col2.metric("Ongoing Monthly Net", f"${ongoing_monthly_net:,.0f}")
+    col3.metric("Months to ROI", f"{months_to_roi:.1f}" if months_to_roi != float('inf') else "N/A")
+    
+    if first_month_net > 0:
+        st.markdown("""
+        <div class="success-box">
+        ✅ <strong>Positive ROI from Month 1</strong> - Implementation cost recovered immediately
+        </div>
+        """, unsafe_allow_html=True)
+    elif months_to_roi <= 6:
+        st.markdown(f"""
+        <div class="success-box">
+        ✅ <strong>Good ROI</strong> - Recovered in {months_to_roi:.1f} months
+        </div>
+        """, unsafe_allow_html=True)
+    else:
+        st.markdown("""
+        <div class="danger-box">
+        ❌ <strong>Questionable ROI</strong> - Re-evaluate effort vs benefit
+        </div>
+        """, unsafe_allow_html=True)
+    
+    render_impact_simulation(results, affected_users, value_per_conversion, implementation_cost, ongoing_cost_monthly)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Rollout Strategy
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">🚀 Rollout Strategy</div>
+    """, unsafe_allow_html=True)
+    
+    rollout_options = {
+        "Staged rollout (10% → 50% → 100%)": "Gradual ramp with monitoring",
+        "Holdout control (keep 5-10%)": "Maintain ghost control for long-term measurement",
+        "Geo / cohort phased launch": "Staggered deployment by market",
+        "Dark launch (behind feature flag)": "Enable for internal/QA first",
+        "Do not roll out": "Capture learnings and iterate"
+    }
+    
+    default_strategy = "Staged rollout (10% → 50% → 100%)" if p_value < 0.05 and relative_lift > 0 else "Do not roll out"
+    strategy_options = list(rollout_options.keys())
+    
+    try:
+        default_index = strategy_options.index(default_strategy)
+    except ValueError:
+        default_index = 0
+    
+    selected_strategy = st.selectbox(
+        "**Recommended Rollout Approach**",
+        strategy_options,
+        index=default_index
+    )
+    
+    if not isinstance(selected_strategy, str) or selected_strategy not in rollout_options:
+        if isinstance(selected_strategy, int):
+            selected_strategy = strategy_options[selected_strategy]
+        else:
+            selected_strategy = strategy_options[0]
+    
+    st.markdown(f"""
+    <div class="info-box">
+    <strong>{selected_strategy}</strong><br>
+    {rollout_options[selected_strategy]}
+    </div>
+    """, unsafe_allow_html=True)
+    
+    render_rollout_projection(results, rollout_options, selected_strategy, affected_users, value_per_conversion,
+                              implementation_cost, ongoing_cost_monthly)
+    
+    st.text_area(
+        "**Launch Plan Notes**",
+        placeholder="Document owners, dates, communication steps, success checkpoints, rollback triggers...",
+        key="rollout_notes",
+        height=100
+    )
+    
+    if st.button("💾 Record Decision in Registry", use_container_width=True):
+        experiment_id = st.session_state.experiment_data.get('experiment_id') or persist_design()
+        if not experiment_id:
+            st.warning("Size the experiment in the Design phase before recording a decision in the registry.")
+        else:
+            get_registry().record_decision(
+                experiment_id,
+                selected_strategy,
+                st.session_state.get('rollout_notes', ''),
+                {
+                    'monthly_impact': monthly_impact,
+                    'annual_impact': annual_impact,
+                    'first_month_net': first_month_net,
+                    'months_to_roi': months_to_roi if months_to_roi != float('inf') else None
+                }
+            )
+            st.success("✅ Decision recorded")
+    
+    # Final Summary
+    st.markdown("---")
+    st.markdown("### 📋 Final Experiment Summary")
+    
+    st.markdown(f"""
+    <div class="metric-card">
+    <h4>Experiment Results</h4>
+    <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1.5rem; margin-top: 1rem;">
+    <div>
+    <p><strong>Control Rate:</strong><br>{control_rate*100:.2f}%</p>
+    <p><strong>Treatment Rate:</strong><br>{treatment_rate*100:.2f}%</p>
+    </div>
+    <div>
+    <p><strong>Absolute Lift:</strong><br>{absolute_lift:.2f}%p</p>
+    <p><strong>Relative Lift:</strong><br>{relative_lift:.2f}%</p>
+    </div>
+    <div>
+    <p><strong>P-value:</strong><br>{p_value:.4f}</p>
+    <p><strong>95% CI:</strong><br>[{ci_lower*100:.2f}%, {ci_upper*100:.2f}%]</p>
+    </div>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.success("🎉 Experiment complete! Document your findings in your experimentation log for future reference.")
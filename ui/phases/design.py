@@ -0,0 +1,895 @@
+"""Phase 3: sample size, duration and the design trade-off tools"""
+import io
+from datetime import date, datetime
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from playbook import allocation as ab_allocation
+from playbook import catalog
+from playbook import curves as ab_curves
+from playbook import forecast as ab_forecast
+from playbook import instrumentation
+from playbook import inverse as ab_inverse
+from playbook import stats as ab_stats
+from ui.common import cached_figure, persist_design, scatter_trace
+from ui.theme import (GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_GREY, GOOGLE_GREY_LIGHT, GOOGLE_LIGHT_GREY,
+                      GOOGLE_RED, GOOGLE_YELLOW)
+
+@cached_figure
+@instrumentation.timed_fn("figure", "sampling_distributions")
+def build_sampling_distribution_figure(n_per_group, baseline, new_value, distribution="binomial", sd=None,
+                                       dispersion=0.0):
+    """Normal approximations of control and treatment success counts (sample means for non-rates)"""
+    if distribution == "binomial":
+        x, (y_control, y_treatment) = ab_stats.sampling_distribution_curves(
+            n_per_group, [baseline / 100, new_value / 100]
+        )
+        x_title = "Number of Successes"
+    else:
+        means = [baseline, new_value]
+        x, (y_control, y_treatment) = ab_stats.mean_sampling_curves(
+            n_per_group, means, ab_stats.metric_variance(means, distribution, sd, dispersion)
+        )
+        x_title = "Sample Mean"
+    x_control = x_treatment = x
+    
+    fig = go.Figure()
+    
+    fig.add_trace(scatter_trace(
+        x_control, y_control, name='Control',
+        fill='tozeroy', fillcolor=f'rgba(66, 133, 244, 0.3)',
+        line=dict(color=GOOGLE_BLUE, width=3)
+    ))
+    
+    fig.add_trace(scatter_trace(
+        x_treatment, y_treatment, name='Treatment',
+        fill='tozeroy', fillcolor=f'rgba(52, 168, 83, 0.3)',
+        line=dict(color=GOOGLE_GREEN, width=3)
+    ))
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Sampling Distributions</b><br><sub>Control ({catalog.format_metric_value(baseline, distribution)}) "
+                 f"vs Treatment ({catalog.format_metric_value(new_value, distribution)})</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title=x_title,
+        yaxis_title="Probability Density",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def parse_traffic_history(payload):
+    """Daily traffic Series from uploaded CSV bytes"""
+    return ab_forecast.load_traffic_history(io.BytesIO(payload))
+
+@instrumentation.timed_fn("figure", "traffic_forecast")
+def build_traffic_forecast_figure(history, forecast, end_date):
+    """Observed daily traffic, the forecast with its band and the projected end date"""
+    fig = go.Figure()
+    
+    fig.add_trace(scatter_trace(
+        history.index, history.values, name='Observed',
+        line=dict(color=GOOGLE_GREY, width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=forecast.index, y=forecast['upper'], name='Upper band',
+        line=dict(width=0), showlegend=False, hoverinfo='skip'
+    ))
+    fig.add_trace(go.Scatter(
+        x=forecast.index, y=forecast['lower'], name='80% band',
+        fill='tonexty', fillcolor='rgba(66, 133, 244, 0.2)', line=dict(width=0)
+    ))
+    fig.add_trace(scatter_trace(
+        forecast.index, forecast['forecast'], name='Forecast',
+        line=dict(color=GOOGLE_BLUE, width=3)
+    ))
+    
+    if end_date is not None:
+        fig.add_vline(x=datetime.combine(end_date, datetime.min.time()).timestamp() * 1000,
+                      line_dash="dash", line_color=GOOGLE_GREEN,
+                      annotation_text=f"End {end_date:%b %d}")
+    
+    fig.update_layout(
+        title=dict(
+            text="<b>Daily Traffic Forecast</b><br><sub>Weekly seasonality + trend, 80% prediction band</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Date",
+        yaxis_title="Daily Visitors",
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+@st.cache_data(show_spinner=False)
+def run_split_optimizer(baseline, mde, alpha, power, daily_traffic, control_cost, treatment_cost,
+                        value_per_conversion, p_worse, downside, cost_per_day, metric):
+    """Cost and duration of every traffic split on the optimizer grid"""
+    with instrumentation.timed("stat", "split_optimizer"):
+        return ab_allocation.split_costs(
+            baseline, mde, alpha, power, daily_traffic, control_cost, treatment_cost,
+            value_per_conversion, p_worse, downside, cost_per_day, **metric
+        )
+
+@instrumentation.timed_fn("figure", "split_optimizer")
+def build_split_optimizer_figure(costs, best, current_split):
+    """Expected cost (or duration) across treatment shares with the optimum marked"""
+    by_cost = best['objective'] == "cost"
+    fig = go.Figure()
+    
+    if by_cost:
+        for column, name, color in (('exposure_cost', 'Exposure', GOOGLE_BLUE), ('risk_cost', 'Risk', GOOGLE_RED),
+                                    ('delay_cost', 'Delay', GOOGLE_YELLOW)):
+            fig.add_trace(go.Scatter(
+                x=costs['split'], y=costs[column], name=name,
+                line=dict(color=color, width=1.5, dash='dot')
+            ))
+        y_column, y_title = 'expected_cost', "Expected Cost ($)"
+    else:
+        y_column, y_title = 'duration_days', "Duration (days)"
+    
+    fig.add_trace(go.Scatter(
+        x=costs['split'], y=costs[y_column], name='Total' if by_cost else 'Duration',
+        line=dict(color=GOOGLE_GREEN, width=3)
+    ))
+    fig.add_trace(go.Scatter(
+        x=[best['split']], y=[best[y_column]], name='Optimum', mode='markers',
+        marker=dict(color=GOOGLE_GREEN, size=12, line=dict(color='white', width=2))
+    ))
+    fig.add_vline(x=current_split, line_dash="dash", line_color=GOOGLE_GREY,
+                  annotation_text=f"Current {current_split}%")
+    
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Traffic Split Optimizer</b><br><sub>Optimum {best['split']:.1f}% to treatment "
+                 f"(exact unequal-allocation sample size)</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title="Treatment Share (%)",
+        yaxis_title=y_title,
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    
+    return fig
+
+def _apply_optimal_split(split):
+    """Move the split slider to the optimum and recalculate the design"""
+    st.session_state['design_split'] = split
+    st.session_state['_recalculate_design'] = True
+
+def render_split_optimizer(baseline, mde, alpha, power, current_split, metric):
+    """Find the treatment share that minimises expected cost or duration"""
+    with st.expander("⚖️ Optimize Traffic Split"):
+        st.caption("Scores every split from 5% to 95% (0.1% steps) with the exact unequal-allocation "
+                   "sample size. Without a delay cost the cheapest design simply starves the costly arm.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            daily_traffic = st.number_input("Daily visitors", min_value=100, max_value=10000000, step=1000,
+                                            value=int(st.session_state.experiment_data.get('daily_traffic', 10000)),
+                                            key="split_opt_traffic")
+            cost_per_day = st.number_input("Delay cost per day ($)", min_value=0.0, value=250.0, step=50.0,
+                                           key="split_opt_delay", help="Opportunity cost of every extra day of testing")
+        with col2:
+            control_cost = st.number_input("Cost per control user ($)", min_value=0.0, value=0.0, step=0.01,
+                                           key="split_opt_control_cost")
+            treatment_cost = st.number_input("Cost per treatment user ($)", min_value=0.0, value=0.0, step=0.01,
+                                             key="split_opt_treatment_cost",
+                                             help="e.g. discount, incentive or paid placement per exposed user")
+        with col3:
+            if metric['distribution'] == "binomial":
+                value_per_conversion = st.number_input("Value per conversion ($)", min_value=0.0, value=50.0,
+                                                       step=5.0, key="split_opt_value")
+            else:
+                value_per_conversion = st.number_input("Value per unit of the metric ($)", min_value=0.0, value=1.0,
+                                                       step=0.1, key="split_opt_unit_value",
+                                                       help="1.0 for revenue metrics; e.g. margin per item for counts")
+            p_worse = st.slider("P(treatment is worse)", 0.0, 1.0, 0.5, 0.05, key="split_opt_p_worse",
+                                help="Prior belief; the risk cost assumes a drop of one MDE if it is worse")
+        
+        objective = st.radio("Minimize", ["cost", "duration"], horizontal=True, key="split_opt_objective",
+                             format_func=lambda value: {"cost": "Expected cost", "duration": "Test duration"}[value])
+        
+        costs = run_split_optimizer(baseline, mde, alpha, power, daily_traffic, control_cost, treatment_cost,
+                                    value_per_conversion, p_worse, mde, cost_per_day, metric)
+        if costs['duration_days'].isna().all():
+            st.info("No valid design for these inputs: the target rate would exceed 100% "
+                    "or the variance is undefined.")
+            return
+        best = ab_allocation.optimal_split(costs, objective)
+        recommended = int(round(best['split']))
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Optimal Split", f"{100 - best['split']:.1f}/{best['split']:.1f}", help="Control/Treatment")
+        col2.metric("Duration", f"{best['duration_days']:.1f} days")
+        col3.metric("Expected Cost", f"${best['expected_cost']:,.0f}",
+                    delta=f"${best['savings_vs_equal']:,.0f} vs 50/50" if objective == "cost" else None)
+        
+        st.plotly_chart(build_split_optimizer_figure(costs, best, current_split), use_container_width=True)
+        st.button(f"✅ Use {100 - recommended}/{recommended} Split", use_container_width=True,
+                  disabled=recommended == current_split,
+                  on_click=_apply_optimal_split, args=(recommended,))
+
+@st.cache_data(show_spinner=False)
+def compute_design_curves(baseline, mde, alpha, power, split, daily_traffic, metric):
+    """Power-vs-n, MDE-vs-duration and power-vs-MDE grids for one design"""
+    with instrumentation.timed("stat", "design_curves"):
+        return ab_curves.design_curves(baseline, mde, alpha, power, split, daily_traffic, **metric)
+
+CURVE_COLORS = [GOOGLE_YELLOW, GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_RED]
+
+def _curve_layout(fig, title, subtitle, x_title, y_title):
+    fig.update_layout(
+        title=dict(
+            text=f"<b>{title}</b><br><sub>{subtitle}</sub>",
+            font=dict(size=16, family='Google Sans')
+        ),
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        height=350,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='x unified',
+        margin=dict(l=50, r=50, t=80, b=50)
+    )
+    return fig
+
+@cached_figure
+@instrumentation.timed_fn("figure", "power_vs_n")
+def build_power_curve_figure(curves, mde, power):
+    """Power as the sample grows, for half, one and twice the MDE"""
+    family = curves['power_vs_n']
+    fig = go.Figure()
+    for color, line_mde, values in zip(CURVE_COLORS, family['mde'], family['power']):
+        fig.add_trace(go.Scatter(
+            x=family['n'], y=values, name=f"MDE {line_mde:g}%",
+            line=dict(color=color, width=3 if np.isclose(line_mde, mde) else 1.5)
+        ))
+    fig.add_hline(y=power, line_dash="dash", line_color=GOOGLE_GREY, annotation_text=f"Target {power:.0%}")
+    fig.add_vline(x=curves['required_n'], line_dash="dash", line_color=GOOGLE_GREY,
+                  annotation_text=f"{curves['required_n']:,.0f}")
+    fig.update_yaxes(tickformat=".0%", range=[0, 1.02])
+    return _curve_layout(fig, "Power vs Sample Size", "Total samples across both arms", "Total Samples", "Power")
+
+@cached_figure
+@instrumentation.timed_fn("figure", "mde_vs_duration")
+def build_mde_duration_figure(curves, mde, power):
+    """Smallest detectable lift after each day of testing, per power level"""
+    family = curves['mde_vs_duration']
+    fig = go.Figure()
+    for color, level, values in zip(CURVE_COLORS, family['power'], family['mde']):
+        fig.add_trace(go.Scatter(
+            x=family['days'], y=values, name=f"{level:.0%} power",
+            line=dict(color=color, width=3 if np.isclose(level, power) else 1.5)
+        ))
+    fig.add_trace(go.Scatter(
+        x=[curves['days']], y=[mde], name='Your design', mode='markers',
+        marker=dict(color=GOOGLE_RED, size=12, line=dict(color='white', width=2))
+    ))
+    for week in range(7, int(family['days'][-1]) + 1, 7):
+        fig.add_vline(x=week, line_color=GOOGLE_GREY_LIGHT, line_width=1)
+    return _curve_layout(fig, "MDE vs Test Duration", "Weekly gridlines; run whole weeks to cover seasonality",
+                         "Days", "Detectable Relative Lift (%)")
+
+@cached_figure
+@instrumentation.timed_fn("figure", "power_vs_mde")
+def build_power_mde_figure(curves, mde, power):
+    """Power against the true lift at half, one and twice the required sample"""
+    family = curves['power_vs_mde']
+    fig = go.Figure()
+    for color, factor, values in zip(CURVE_COLORS, ab_curves.SCALE_FACTORS, family['power']):
+        fig.add_trace(go.Scatter(
+            x=family['mde'], y=values, name=f"{factor:g}x sample",
+            line=dict(color=color, width=3 if factor == 1 else 1.5)
+        ))
+    fig.add_hline(y=power, line_dash="dash", line_color=GOOGLE_GREY, annotation_text=f"Target {power:.0%}")
+    fig.add_vline(x=mde, line_dash="dash", line_color=GOOGLE_GREY, annotation_text=f"MDE {mde:g}%")
+    fig.update_yaxes(tickformat=".0%", range=[0, 1.02])
+    return _curve_layout(fig, "Power vs True Effect", "Chance of detecting lifts smaller or larger than the MDE",
+                         "True Relative Lift (%)", "Power")
+
+def render_design_curves(baseline, mde, alpha, power, split, metric):
+    """Power and MDE trade-off frontier for the current inputs, updated on every change"""
+    with st.expander("📈 Power & MDE Trade-offs", expanded=True):
+        st.caption("The whole frontier around your inputs, recomputed live: no need to press Calculate "
+                   "to see what a larger sample, a longer test or a different MDE buys you.")
+        st.session_state.setdefault('curve_daily_traffic', int(st.session_state.experiment_data.get('daily_traffic', 10000)))
+        daily_traffic = st.number_input("Daily visitors (both arms)", min_value=100, max_value=10000000, step=1000,
+                                        key="curve_daily_traffic")
+        
+        curves = compute_design_curves(baseline, mde, alpha, power, split, daily_traffic, metric)
+        if not np.isfinite(curves['required_n']):
+            st.info("No valid design for these inputs: the target rate would exceed 100% "
+                    "or the variance is undefined.")
+            return
+        
+        power_tab, duration_tab, mde_tab = st.tabs(["Power vs sample", "MDE vs duration", "Power vs effect"])
+        with power_tab:
+            st.plotly_chart(build_power_curve_figure(curves, mde, power), use_container_width=True)
+        with duration_tab:
+            st.plotly_chart(build_mde_duration_figure(curves, mde, power), use_container_width=True)
+        with mde_tab:
+            st.plotly_chart(build_power_mde_figure(curves, mde, power), use_container_width=True)
+
+def render_budget_solver(baseline, mde, alpha, power, split, metric):
+    """Detectable MDE, achievable power and required alpha for a fixed list size or campaign length"""
+    with st.expander("🎯 Fixed Budget: What Can We Detect?"):
+        st.caption("For a fixed list size or campaign length: solves the design backwards for the smallest "
+                   "detectable lift, the power left for your MDE and the α it would take.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            budget_kind = st.radio("Budget", ["samples", "days"], horizontal=True, key="budget_kind",
+                                   format_func=lambda value: {"samples": "Total users", "days": "Campaign length"}[value])
+        with col2:
+            if budget_kind == "samples":
+                total_n = st.number_input("Total users (both arms)", min_value=100, max_value=1_000_000_000,
+                                          value=20_000, step=1_000, key="budget_samples",
+                                          help="e.g. the size of the email list or the audience segment")
+            else:
+                days = st.number_input("Campaign length (days)", min_value=1, max_value=365, value=14,
+                                       key="budget_days")
+                total_n = days * st.session_state.get('curve_daily_traffic', 10_000)
+                st.caption(f"{total_n:,.0f} users at the daily traffic set in the trade-off curves above")
+        
+        with instrumentation.timed("stat", "inverse_solvers"):
+            solved = ab_inverse.solve_budget(baseline, total_n, mde, alpha, power, split, **metric)
+        
+        detectable = f"{solved['mde']:.3g}%"
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Detectable MDE", detectable if np.isfinite(solved['mde']) else "—",
+                    help=f"Smallest relative lift detected with {power:.0%} power at α = {alpha}")
+        col2.metric(f"Power for a {mde:g}% lift", f"{solved['power']:.0%}" if np.isfinite(solved['power']) else "—",
+                    delta=f"{solved['power'] - power:+.0%} vs target" if np.isfinite(solved['power']) else None)
+        col3.metric(f"α for {power:.0%} power", f"{solved['alpha']:.2g}" if np.isfinite(solved['alpha']) else "—",
+                    help="Significance level at which this budget reaches the target power for your MDE")
+        
+        if not np.isfinite(solved['mde']):
+            st.warning("This budget cannot detect any realistic lift. Widen the audience or run longer.")
+        elif not np.isfinite(solved['power']):
+            st.info(f"No valid design for a {mde:g}% MDE: the target rate would exceed 100%. "
+                    f"This budget detects lifts down to {detectable}.")
+        elif solved['mde'] > mde:
+            st.warning(f"This budget is underpowered for a {mde:g}% MDE: plan around a {detectable} "
+                       f"lift, or accept {solved['power']:.0%} power.")
+        else:
+            st.success(f"This budget detects your {mde:g}% MDE with room to spare (down to {detectable}).")
+
+def tab_design_experiment():
+    st.markdown('<p class="phase-header">🔬 Phase 3: Experiment Design</p>', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <p style="font-size: 1rem; line-height: 1.6; color: {GOOGLE_GREY}; margin: 0;">
+    Calculate how long to run your test and how many samples you need to detect a meaningful effect.
+    This is the most critical phase - getting sample size wrong wastes time and resources.
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Step 1: Randomization
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">🎲 Step 1: Randomization Strategy</div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        unit = st.selectbox(
+            "**Randomization Unit**",
+            ["User ID", "Session ID", "Device ID", "Email Address", "Page View", "Geographic Region", "Account/Org ID"],
+            key="design_unit",
+            help="What entity do you randomize on? Most common: User ID"
+        )
+        
+        st.markdown(f"""
+        <div class="info-box" style="margin-top: 1rem;">
+        <strong>💡 Why randomization unit matters:</strong>
+        <ul style="margin: 0.5rem 0; padding-left: 1.2rem; font-size: 0.9rem;">
+        <li><strong>User ID:</strong> Consistent experience across sessions (recommended)</li>
+        <li><strong>Session ID:</strong> Faster data but users may see both variants</li>
+        <li><strong>Page View:</strong> Maximum speed but high contamination risk</li>
+        <li><strong>Account ID:</strong> B2B tests where org-level effects matter</li>
+        </ul>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.session_state.setdefault('design_split', 50)
+        split = st.slider(
+            "**Traffic Split** (%)",
+            5, 95, step=1,
+            key="design_split",
+            help="% of traffic to treatment. 50/50 is most statistically powerful"
+        )
+        
+        # Visual split representation
+        st.markdown(f"""
+        <div style="display: flex; gap: 0.5rem; margin: 1rem 0;">
+        <div style="flex: {100-split}; background: {GOOGLE_BLUE}; padding: 1rem; border-radius: 8px; color: white; text-align: center; font-weight: 600;">
+        Control<br>{100-split}%
+        </div>
+        <div style="flex: {split}; background: {GOOGLE_GREEN}; padding: 1rem; border-radius: 8px; color: white; text-align: center; font-weight: 600;">
+        Treatment<br>{split}%
+        </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if split != 50:
+            # Total-sample inflation of an unequal split at equal arm variances
+            power_loss = 1 / (4 * (split / 100) * (1 - split / 100))
+            st.warning(f"⚠️ Unequal split reduces statistical power. You'll need ~{power_loss:.2f}x more samples.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Step 2: Select Metric
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">📏 Step 2: Select Primary Metric & Get Baseline</div>
+    """, unsafe_allow_html=True)
+    
+    channel_options = ["Select a channel..."] + list(catalog.MARKETING_METRICS.keys())
+    channel = st.selectbox("**Marketing Channel**", channel_options, index=0, key="design_channel")
+    
+    if not isinstance(channel, str):
+        if isinstance(channel, int) and 0 <= channel < len(channel_options):
+            channel = channel_options[channel]
+        else:
+            channel = channel_options[0]
+    
+    if channel != "Select a channel...":
+        metric_names = [m['name'] for m in catalog.MARKETING_METRICS[channel]]
+        selected_metric_name = st.selectbox("**Primary Success Metric**", metric_names, key="design_metric")
+        
+        selected_metric = next(m for m in catalog.MARKETING_METRICS[channel] if m['name'] == selected_metric_name)
+        
+        # Enhanced metric card
+        st.markdown(f"""
+        <div class="metric-card">
+        <h4>{selected_metric['name']}</h4>
+        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-top: 1rem;">
+        <div>
+        <p><strong>Description:</strong><br>{selected_metric['description']}</p>
+        <p><strong>Formula:</strong><br><code>{selected_metric['formula']}</code></p>
+        </div>
+        <div>
+        <p><strong>Distribution:</strong><br>{selected_metric['distribution']}</p>
+        <p><strong>Statistical Test:</strong><br>{selected_metric['test']}</p>
+        <p><strong>Typical Range:</strong><br>{selected_metric['typical_range']}</p>
+        </div>
+        </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        with st.expander("📍 Where to Get Your Baseline Data"):
+            st.info(selected_metric['where_to_get_baseline'])
+            st.caption(f"**Industry Benchmark Source:** {selected_metric['industry_source']}")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Step 3: Power Analysis
+        st.markdown(f"""
+        <div class="section-container">
+        <div class="section-title">⚡ Step 3: Power Analysis - Calculate Sample Size</div>
+        <p style="color: {GOOGLE_GREY_LIGHT}; margin-bottom: 1rem; font-size: 0.9rem;">
+        Sample size calculation ensures you have enough data to detect a meaningful effect
+        </p>
+        """, unsafe_allow_html=True)
+        
+        # The metric's distribution picks the sample-size formula
+        distribution = catalog.sample_size_family(selected_metric)
+        metric_params = {'distribution': distribution, 'sd': None, 'dispersion': 0.0}
+        
+        # Create three columns for inputs
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("#### 1️⃣ Baseline")
+            if distribution == "binomial":
+                baseline = st.number_input(
+                    "Current metric value (%)",
+                    min_value=0.1,
+                    max_value=100.0,
+                    value=5.0,
+                    step=0.1,
+                    key="design_baseline",
+                    help="Get from your analytics platform"
+                )
+            else:
+                baseline = st.number_input(
+                    "Current mean per user",
+                    min_value=0.0001,
+                    max_value=1e9,
+                    value=catalog.typical_metric_value(selected_metric),
+                    key=f"design_mean::{selected_metric_name}",
+                    help=f"Average {selected_metric_name} per randomization unit over the last 2-4 weeks"
+                )
+            if distribution == "normal":
+                st.session_state.setdefault('design_sd', float(baseline))
+                metric_params['sd'] = st.number_input(
+                    "Standard deviation per user",
+                    min_value=0.0001,
+                    max_value=1e9,
+                    key="design_sd",
+                    help="From the same historical data. Skewed metrics (revenue, durations) often have "
+                         "an SD at or above the mean."
+                )
+            elif distribution == "negative_binomial":
+                st.session_state.setdefault('design_dispersion', 0.5)
+                metric_params['dispersion'] = st.number_input(
+                    "Dispersion φ (Var = μ + φμ²)",
+                    min_value=0.0,
+                    max_value=100.0,
+                    step=0.1,
+                    key="design_dispersion",
+                    help="Overdispersion of the per-user counts; 0 is Poisson. Estimate as (variance − mean) / mean²."
+                )
+            elif distribution == "poisson":
+                st.caption("Poisson counts: variance = mean")
+            
+            with st.expander("ℹ️ How to determine baseline"):
+                st.markdown(f"""
+                **For {selected_metric_name}:**
+                
+                1. **Check your analytics:** {selected_metric['where_to_get_baseline']}
+                2. **Time window:** Use last 2-4 weeks (avoid seasonality)
+                3. **Segment if needed:** Mobile vs Desktop, New vs Returning
+                4. **Exclude outliers:** Remove bot traffic, test accounts
+                5. **Verify stability:** Metric should be relatively stable, not trending
+                
+                **Industry benchmark:** {selected_metric['typical_range']}  
+                *Source: {selected_metric['industry_source']}*
+                
+                ⚠️ **Common mistake:** Using a single day or including a promo period  
+                ✅ **Best practice:** 2-4 week average excluding unusual events
+                """)
+        
+        with col2:
+            st.markdown("#### 2️⃣ MDE")
+            mde = st.number_input(
+                "Minimum Detectable Effect (%)",
+                min_value=1.0,
+                max_value=100.0,
+                value=10.0,
+                step=1.0,
+                key="design_mde",
+                help="Relative % change you want to detect"
+            )
+            
+            absolute_change = baseline * (mde / 100)
+            new_value = baseline + absolute_change
+            
+            if distribution == "binomial":
+                st.metric("New Value", f"{new_value:.2f}%", f"+{absolute_change:.2f}%p")
+            else:
+                st.metric("New Value", f"{new_value:,.2f}", f"+{absolute_change:,.2f}")
+            
+            with st.expander("ℹ️ How to choose MDE"):
+                st.markdown(f"""
+                **MDE (Minimum Detectable Effect)** is the smallest change that matters to your business.
+                
+                **Framework for choosing MDE:**
+                
+                1. **Business Value Calculation:**
+                   - If {selected_metric_name} improves by {mde}%, what's the $ impact?
+                   - Does it cover cost of implementation + experiment?
+                   - Example: 10% CVR increase on $1M/month revenue = $100K/month
+                
+                2. **Typical MDE by Metric Type:**
+                   - 🟢 **High-frequency metrics** (CTR, Opens): 5-15% is detectable
+                   - 🟡 **Medium-frequency** (CVR, Add-to-Cart): 10-20% realistic
+                   - 🔴 **Low-frequency** (Purchases, Subscriptions): 15-30% needed
+                
+                3. **Trade-offs:**
+                   - Smaller MDE = Longer test duration = More resources
+                   - Larger MDE = Shorter test = Faster decisions but miss small wins
+                
+                4. **Reality Check:**
+                   - Current: {catalog.format_metric_value(baseline, distribution)}
+                   - {mde}% change = {catalog.format_metric_value(new_value, distribution)}
+                   - Is this realistic? Most winning tests: 5-20% improvement
+                
+                ⚠️ **Common mistake:** MDE too small (3-5%) requires months of data  
+                ✅ **Best practice:** Start with 10-15% MDE, iterate based on results
+                """)
+        
+        with col3:
+            st.markdown("#### 3️⃣ Parameters")
+            alpha = st.number_input(
+                "Significance level (α)",
+                min_value=0.01,
+                max_value=0.10,
+                value=0.05,
+                step=0.01,
+                key="design_alpha",
+                help="False positive rate (standard: 0.05)"
+            )
+            
+            with st.expander("ℹ️ Understanding Alpha (α)"):
+                st.markdown(f"""
+                **Alpha (α)** is your tolerance for **false positives** - declaring a winner when there's actually no effect.
+                
+                **What it means:**
+                - α = 0.05 means 5% chance of false positive (Type I error)
+                - If you run 20 A/A tests, you'd expect ~1 false positive
+                
+                **When to adjust:**
+                - **α = 0.01** (stricter): High-risk changes (billing, checkout flow)
+                - **α = 0.05** (standard): Most marketing tests - **RECOMMENDED**
+                - **α = 0.10** (looser): Early-stage exploration, low risk
+                
+                **Multiple Testing Problem:**
+                - If testing 10 metrics, chance of ≥1 false positive = 40%!
+                - Solution: Bonferroni correction (α/n) or FDR control
+                - Best practice: Declare ONE primary metric before test
+                
+                **P-value interpretation:**
+                - p < α → Reject null hypothesis (statistically significant)
+                - p ≥ α → Fail to reject null (not significant)
+                
+                ⚠️ **Common mistake:** p=0.051, "almost significant" → Still not significant!  
+                ✅ **Best practice:** Set α=0.05 and stick to it. No p-hacking.
+                """)
+            
+            power = st.number_input(
+                "Statistical power (1-β)",
+                min_value=0.70,
+                max_value=0.95,
+                value=0.80,
+                step=0.05,
+                key="design_power",
+                help="Detection rate (standard: 0.80)"
+            )
+            
+            with st.expander("ℹ️ Understanding Power (1-β)"):
+                st.markdown(f"""
+                **Power (1-β)** is your ability to **detect a real effect** when it exists.
+                
+                **What it means:**
+                - Power = 0.80 means 80% chance of detecting true effect (if MDE exists)
+                - β = 0.20 means 20% chance of false negative (Type II error)
+                - Higher power = need more samples = longer test
+                
+                **Power trade-offs:**
+                - **0.70 (70%)**: Acceptable for early exploration, faster tests
+                - **0.80 (80%)**: Industry standard - **RECOMMENDED**
+                - **0.90 (90%)**: High-stakes decisions, worth extra time
+                
+                **What affects power:**
+                1. Sample size ↑ → Power ↑ (most controllable)
+                2. MDE ↑ → Power ↑ (larger effects easier to detect)
+                3. Variance ↓ → Power ↑ (more consistent data)
+                4. α ↑ → Power ↑ (but more false positives)
+                
+                **Power vs Sample Size:**
+                - 0.80 power: baseline sample size
+                - 0.90 power: ~1.4x more samples needed
+                - 0.95 power: ~1.8x more samples needed
+                
+                **Underpowered tests are dangerous:**
+                - True winner might appear non-significant
+                - Waste resources running test that can't detect effect
+                - False confidence from noisy results
+                
+                ⚠️ **Common mistake:** Running test without power calculation  
+                ✅ **Best practice:** Calculate sample size BEFORE starting test
+                """)
+        
+        render_design_curves(baseline, mde, alpha, power, split, metric_params)
+        render_budget_solver(baseline, mde, alpha, power, split, metric_params)
+        render_split_optimizer(baseline, mde, alpha, power, split, metric_params)
+        
+        # Calculate button (also fired when the optimizer applies a new split)
+        recalculate = st.session_state.pop('_recalculate_design', False)
+        if st.button("🧮 Calculate Sample Size", type="primary", use_container_width=True) or recalculate:
+            with instrumentation.timed("stat", "metric_sample_size"):
+                exact_total = ab_stats.metric_sample_size(baseline, mde, alpha, power, split, **metric_params)
+            if not np.isfinite(exact_total):
+                st.error("No valid design for these inputs: the target rate would exceed 100% "
+                         "or the variance is undefined.")
+            else:
+                control_n = int(np.ceil(exact_total * (1 - split / 100)))
+                treatment_n = int(np.ceil(exact_total * split / 100))
+                # Per-group size is what the smaller arm needs; durations are driven by it
+                n_per_group = min(control_n, treatment_n)
+                n_total = control_n + treatment_n
+                
+                st.session_state.experiment_data.update({
+                    'channel': channel,
+                    'metric': selected_metric_name,
+                    'baseline': baseline,
+                    'mde': mde,
+                    'sample_size_per_group': n_per_group,
+                    'control_sample_size': control_n,
+                    'treatment_sample_size': treatment_n,
+                    'total_sample_size': n_total,
+                    'split': split,
+                    'alpha': alpha,
+                    'power': power,
+                    **metric_params,
+                    'lifecycle': selected_metric['lifecycle'],
+                    'calculated': True
+                })
+                persist_design()
+                st.rerun()
+        
+        # Show results if calculated
+        if st.session_state.experiment_data.get('calculated'):
+            n_per_group = st.session_state.experiment_data['sample_size_per_group']
+            n_total = st.session_state.experiment_data['total_sample_size']
+            design_split = st.session_state.experiment_data.get('split', 50)
+            
+            st.markdown("---")
+            st.markdown("### 📊 Sample Size Results")
+            
+            if split != design_split:
+                st.warning(f"⚠️ Sample sizes were calculated for a {100-design_split}/{design_split} split. "
+                           f"Recalculate to use {100-split}/{split}.")
+            
+            # Enhanced results display
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if design_split == 50:
+                    st.metric("**Per Group**", f"{n_per_group:,}", help="Samples needed per variant")
+                else:
+                    control_n = st.session_state.experiment_data.get('control_sample_size', n_per_group)
+                    treatment_n = st.session_state.experiment_data.get('treatment_sample_size', n_per_group)
+                    st.metric("**Control / Treatment**", f"{control_n:,} / {treatment_n:,}",
+                              help="Samples needed per variant at the unequal split")
+            with col2:
+                st.metric("**Total Samples**", f"{n_total:,}", help="Total across both groups")
+            with col3:
+                st.metric("**Traffic Split**", f"{100-design_split}/{design_split}", help="Control/Treatment")
+            
+            # Visualization
+            fig = build_sampling_distribution_figure(n_per_group, baseline, new_value, **metric_params)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            # Step 4: Duration
+            st.markdown("---")
+            st.markdown("### ⏱️ Step 4: Calculate Test Duration")
+            
+            daily_traffic = st.number_input(
+                "**Average Daily Visitors/Users**",
+                min_value=100,
+                max_value=10000000,
+                value=10000,
+                step=1000,
+                key="design_daily_traffic",
+                help="Get from Google Analytics"
+            )
+            
+            # The smaller arm sets the pace
+            effective_daily = daily_traffic * (min(design_split, 100 - design_split) / 100)
+            with instrumentation.timed("stat", "duration_days"):
+                days_needed = int(ab_stats.duration_days(n_per_group, daily_traffic, design_split))
+            flat_days = days_needed
+            
+            history_file = st.file_uploader(
+                "**Daily Traffic History (optional)**",
+                type=["csv"],
+                key="traffic_history",
+                help="CSV with a date column and a daily visitors column. At least 2 weeks; "
+                     "8+ weeks gives a much better read on weekly seasonality and trend."
+            )
+            
+            traffic_model, projection = None, None
+            if history_file is not None:
+                try:
+                    history = parse_traffic_history(history_file.getvalue())
+                    with instrumentation.timed("stat", "traffic_forecast"):
+                        traffic_model = ab_forecast.fit_traffic_model(history)
+                        launch = st.session_state.get('impl_launch_date') or date.today()
+                        projection = ab_forecast.forecast_duration(traffic_model, launch, n_per_group, design_split)
+                except ValueError as exc:
+                    st.error(f"Could not use the traffic history: {exc}")
+            
+            if projection is not None and projection['days'] is not None:
+                days_needed = projection['days']
+            
+            design_changes = {'duration_days': days_needed, 'daily_traffic': daily_traffic,
+                              'traffic_model': traffic_model}
+            if any(st.session_state.experiment_data.get(k) != v for k, v in design_changes.items()):
+                st.session_state.experiment_data.update(design_changes)
+                persist_design()
+            
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Daily Traffic", f"{daily_traffic:,}")
+            col2.metric("Effective Daily", f"{int(effective_daily):,}")
+            col3.metric("**Test Duration**", f"**{days_needed} days**")
+            
+            if projection is not None:
+                if projection['days'] is None:
+                    st.warning("The forecast never reaches the required sample within a year; "
+                               "using the flat-traffic estimate.")
+                else:
+                    slowest = projection['days_high']
+                    band = f"{projection['days_low']}–{slowest}" if slowest else f"{projection['days_low']}+"
+                    fcol1, fcol2, fcol3 = st.columns(3)
+                    fcol1.metric("Forecast End Date", f"{projection['end_date']:%b %d, %Y}",
+                                 help="First day the cumulative sample of the smaller arm reaches the target")
+                    fcol2.metric("80% Range", f"{band} days",
+                                 help="80% interval for the test length, from the prediction band of the cumulative "
+                                      "traffic (daily deviations from the forecast treated as independent)")
+                    fcol3.metric("Flat-Traffic Estimate", f"{flat_days} days",
+                                 delta=f"{days_needed - flat_days:+d} days", delta_color="off")
+                    fig = build_traffic_forecast_figure(
+                        history, projection['forecast'].iloc[:max(slowest or days_needed, days_needed) + 7],
+                        projection['end_date']
+                    )
+                    st.plotly_chart(fig, use_container_width=True)
+            
+            # Duration guidance
+            if days_needed < 7:
+                st.markdown(f"""
+                <div class="warning-box">
+                <strong>⚠️ Short Duration: {days_needed} days</strong><br><br>
+                Consider running for at least 7-14 days to:
+                <ul>
+                <li>Capture weekly patterns (weekday vs weekend)</li>
+                <li>Allow novelty effect to settle</li>
+                <li>Ensure statistical validity</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            elif days_needed <= 14:
+                st.markdown(f"""
+                <div class="success-box">
+                <strong>✅ Ideal Duration: {days_needed} days</strong><br><br>
+                This duration balances speed with statistical validity.
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="warning-box">
+                <strong>⚠️ Long Duration: {days_needed} days ({days_needed/7:.1f} weeks)</strong><br><br>
+                Consider:
+                <ul>
+                <li>Increasing MDE to shorten test</li>
+                <li>Lowering power to 0.70-0.75</li>
+                <li>Sequential testing with adjusted α</li>
+                </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Final summary
+            st.markdown(f"""
+            <div class="success-box" style="margin-top: 2rem;">
+            <h4>📋 Experiment Design Summary</h4>
+            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; margin-top: 1rem;">
+            <div>
+            <p><strong>Metric:</strong> {selected_metric_name}</p>
+            <p><strong>Channel:</strong> {channel}</p>
+            <p><strong>Baseline:</strong> {catalog.format_metric_value(baseline, distribution)}</p>
+            </div>
+            <div>
+            <p><strong>Target:</strong> {catalog.format_metric_value(new_value, distribution)}</p>
+            <p><strong>Sample Size:</strong> {n_per_group:,} per group</p>
+            <p><strong>Duration:</strong> {days_needed} days</p>
+            </div>
+            </div>
+            <p style="margin-top: 1rem; padding-top: 1rem; border-top: 1px solid {GOOGLE_LIGHT_GREY};">
+            <strong>Statistical Parameters:</strong> {int(power*100)}% power to detect {mde}% relative change with α={alpha}
+            </p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
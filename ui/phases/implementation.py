@@ -0,0 +1,358 @@
+"""Phase 4: launch checklist, traffic assignment and the portfolio planner"""
+import io
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from playbook import assignment as ab_assignment
+from playbook import forecast as ab_forecast
+from playbook import instrumentation
+from playbook import portfolio as ab_portfolio
+from ui.common import get_registry
+from ui.theme import (GOOGLE_BLUE, GOOGLE_BLUE_LIGHT, GOOGLE_GREEN, GOOGLE_GREY, GOOGLE_GREY_LIGHT,
+                      GOOGLE_RED, GOOGLE_YELLOW)
+
+PORTFOLIO_COLUMNS = ['name', 'sample_size_per_group', 'split', 'surface', 'layer', 'priority', 'traffic_share']
+
+def _portfolio_row(name, design):
+    return {
+        'name': name,
+        'sample_size_per_group': design.get('sample_size_per_group'),
+        'split': design.get('split', 50),
+        'surface': design.get('channel') or 'Default surface',
+        'layer': 'default',
+        'priority': 0,
+        'traffic_share': 100,
+    }
+
+def import_registry_designs(limit=100):
+    """Portfolio rows and known daily traffic for saved designs with a sample size"""
+    registry = get_registry()
+    rows, traffic = [], {}
+    for summary in registry.list_experiments(limit=limit):
+        experiment = registry.load_experiment(summary['id'])
+        design = (experiment or {}).get('design') or {}
+        if design.get('sample_size_per_group'):
+            rows.append(_portfolio_row(summary['name'], design))
+            if design.get('daily_traffic'):
+                traffic.setdefault(rows[-1]['surface'], design['daily_traffic'])
+    return rows, traffic
+
+@instrumentation.timed_fn("figure", "portfolio_gantt")
+def build_portfolio_gantt(schedule):
+    """Gantt chart of the scheduled portfolio, one bar per experiment"""
+    frame = schedule.assign(
+        lane=schedule['surface'] + " · " + schedule['layer'].astype(str),
+        start=pd.to_datetime(schedule['start_date']),
+        finish=pd.to_datetime(schedule['end_date']),
+    )
+    fig = px.timeline(
+        frame, x_start='start', x_end='finish', y='name', color='lane',
+        hover_data={'duration_days': True, 'traffic_share': True, 'priority': True},
+        color_discrete_sequence=[GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_YELLOW, GOOGLE_RED, GOOGLE_BLUE_LIGHT, GOOGLE_GREY]
+    )
+    fig.update_yaxes(autorange="reversed", title=None)
+    fig.update_layout(
+        title=dict(text="<b>Experiment Portfolio Schedule</b>", font=dict(size=16, family='Google Sans')),
+        height=max(300, 28 * len(frame) + 120),
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        legend_title_text='Surface · Layer',
+        margin=dict(l=50, r=50, t=60, b=50)
+    )
+    return fig
+
+def render_portfolio_planner(launch_date):
+    """Schedule many designs over shared surfaces and mutual-exclusion layers"""
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">🗓️ Portfolio Planner</div>
+    <p style="color: {GOOGLE_GREY_LIGHT};">Experiments on the same surface and layer share its traffic;
+    different layers are orthogonal. Set each test's share of its layer's traffic and its priority.</p>
+    """, unsafe_allow_html=True)
+    
+    data = st.session_state.experiment_data
+    if 'portfolio_rows' not in st.session_state:
+        rows = [_portfolio_row(f"{data.get('channel')} · {data.get('metric')}", data)] \
+            if data.get('sample_size_per_group') else []
+        st.session_state.portfolio_rows = rows
+        st.session_state.portfolio_traffic = {rows[0]['surface']: data.get('daily_traffic', 10000)} if rows else {}
+    
+    if st.button("📥 Import Saved Designs from Registry", key="portfolio_import"):
+        rows, traffic = import_registry_designs()
+        st.session_state.portfolio_rows = rows
+        st.session_state.portfolio_traffic = {**st.session_state.portfolio_traffic, **traffic}
+        for key in ("portfolio_editor", "portfolio_surfaces"):
+            st.session_state.pop(key, None)
+    
+    experiments = st.data_editor(
+        pd.DataFrame(st.session_state.portfolio_rows, columns=PORTFOLIO_COLUMNS),
+        num_rows="dynamic",
+        use_container_width=True,
+        key="portfolio_editor",
+        column_config={
+            'name': st.column_config.TextColumn("Experiment", required=True),
+            'sample_size_per_group': st.column_config.NumberColumn("n per Group", min_value=1, required=True),
+            'split': st.column_config.NumberColumn("Treatment %", min_value=1, max_value=99, default=50),
+            'surface': st.column_config.TextColumn("Surface", required=True),
+            'layer': st.column_config.TextColumn("Layer", default="default"),
+            'priority': st.column_config.NumberColumn("Priority", default=0, help="Higher runs first"),
+            'traffic_share': st.column_config.NumberColumn("Traffic %", min_value=1, max_value=100, default=100,
+                                                           help="Share of the layer's traffic this test takes"),
+        }
+    )
+    experiments = experiments.dropna(subset=['name', 'sample_size_per_group', 'surface'])
+    if experiments.empty:
+        st.info("Add experiments above (or import saved designs) to build a schedule")
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    known_traffic = st.session_state.portfolio_traffic
+    surfaces = st.data_editor(
+        pd.DataFrame({'surface': sorted(experiments['surface'].unique())}).assign(
+            daily_traffic=lambda frame: frame['surface'].map(known_traffic).fillna(10000)
+        ),
+        use_container_width=True,
+        disabled=['surface'],
+        key="portfolio_surfaces",
+        column_config={'daily_traffic': st.column_config.NumberColumn("Daily Eligible Traffic", min_value=1)}
+    )
+    order = st.radio(
+        "Scheduling goal",
+        ["lpt", "spt"],
+        format_func={'lpt': "Shortest total calendar (longest tests first)",
+                     'spt': "Earliest results (shortest tests first)"}.get,
+        horizontal=True,
+        key="portfolio_order"
+    )
+    
+    try:
+        with instrumentation.timed("stat", "schedule_portfolio"):
+            schedule, summary = ab_portfolio.schedule_portfolio(
+                experiments, dict(zip(surfaces['surface'], surfaces['daily_traffic'])), launch_date, order
+            )
+    except ValueError as exc:
+        st.error(str(exc))
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Portfolio Duration", f"{summary['makespan_days']} days",
+                help="From the first launch until the last experiment completes")
+    col2.metric("If Run One at a Time", f"{summary['sequential_days']} days")
+    col3.metric("All Results By", f"{summary['end_date']:%b %d, %Y}")
+    
+    st.plotly_chart(build_portfolio_gantt(schedule), use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+ASSIGNMENT_COLUMNS = ['name', 'layer', 'traffic_share', 'split']
+
+def render_assignment_engine():
+    """Salted-hash bulk assignment of an uploaded ID file with uniformity checks"""
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">🎲 Assignment Engine</div>
+    <p style="color: {GOOGLE_GREY_LIGHT};">Deterministic bucketing: the same ID and salt always get the same arm.
+    Experiments in one layer split its traffic; layers are independent of each other.</p>
+    """, unsafe_allow_html=True)
+    
+    data = st.session_state.experiment_data
+    if 'assign_rows' not in st.session_state:
+        name = f"{data.get('channel')} · {data.get('metric')}" if data.get('metric') else "experiment"
+        st.session_state.assign_rows = [{'name': name, 'layer': "default", 'traffic_share': 100,
+                                         'split': data.get('split', 50)}]
+    
+    id_file = st.file_uploader(
+        "**ID File**",
+        type=["csv", "txt"],
+        key="assign_ids",
+        help="CSV with one ID per row (column id, user_id, session_id, account_id or visitor_id, "
+             "otherwise the first column). IDs are hashed as text."
+    )
+    col1, col2 = st.columns(2)
+    st.session_state.setdefault('assign_salt', data.get('experiment_id') or "")
+    salt = col1.text_input("Salt", key="assign_salt",
+                           help="Change the salt to re-randomize; keep it to reproduce assignments")
+    id_column = col2.text_input("ID column (optional)", key="assign_id_column")
+    
+    experiments = st.data_editor(
+        pd.DataFrame(st.session_state.assign_rows, columns=ASSIGNMENT_COLUMNS),
+        num_rows="dynamic",
+        use_container_width=True,
+        key="assign_editor",
+        column_config={
+            'name': st.column_config.TextColumn("Experiment", required=True),
+            'layer': st.column_config.TextColumn("Layer", default="default"),
+            'traffic_share': st.column_config.NumberColumn("Traffic %", min_value=0.01, max_value=100, default=100,
+                                                           help="Share of the layer's IDs in this experiment"),
+            'split': st.column_config.NumberColumn("Treatment %", min_value=1, max_value=99, default=50),
+        }
+    )
+    configs = [
+        {key: value for key, value in row.items() if pd.notna(value)}
+        for row in experiments.dropna(subset=['name']).to_dict('records')
+    ]
+    
+    if st.button("🎲 Generate Assignments", type="primary", use_container_width=True,
+                 disabled=id_file is None or not configs):
+        output = io.BytesIO()
+        try:
+            with instrumentation.timed("stat", "assign_ids"):
+                result = ab_assignment.assign_file(io.BytesIO(id_file.getvalue()), configs, output,
+                                                   salt=salt, id_column=id_column or None)
+        except (ValueError, KeyError) as exc:
+            st.error(f"Could not assign IDs: {exc}")
+        else:
+            st.session_state.assignment_result = {**result, 'csv': output.getvalue(), 'source': id_file.name}
+    
+    result = st.session_state.get('assignment_result')
+    if result:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("IDs", f"{result['ids']:,}")
+        col2.metric("Assignments", f"{result['rows']:,}", help="One row per ID and layer with an experiment")
+        col3.metric("Hashing Throughput", f"{result['ids_per_second'] / 1e6:.1f}M IDs/s")
+        
+        st.dataframe(result['counts'], use_container_width=True, hide_index=True)
+        checks = result['checks'].assign(
+            experiment=lambda frame: frame['experiment'].fillna("(all buckets)")
+        )[['check', 'layer', 'experiment', 'n', 'chi2', 'df', 'p_value', 'passed']]
+        st.dataframe(checks, use_container_width=True, hide_index=True,
+                     column_config={'p_value': st.column_config.NumberColumn("p-value", format="%.4f")})
+        if result['passed']:
+            st.success(f"✅ Uniformity checks passed (α = {ab_assignment.DEFAULT_ALPHA}): arm counts match the "
+                       "configured splits and hash buckets are evenly filled")
+        else:
+            st.error("🚨 Uniformity check failed: counts deviate from the configured splits. "
+                     "Check for duplicate IDs or a malformed ID column before launching.")
+        
+        st.download_button(
+            "📥 Download Assignments (CSV)",
+            result['csv'],
+            file_name=f"assignments_{os.path.splitext(result['source'])[0]}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def tab_implementation():
+    st.markdown('<p class="phase-header">🚀 Phase 4: Implementation</p>', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <p style="font-size: 1rem; line-height: 1.6; color: {GOOGLE_GREY}; margin: 0;">
+    Move from design to execution with confidence. Use this comprehensive checklist to align 
+    engineering, analytics, and stakeholders before launching your experiment.
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Experiment snapshot (once the Design phase has sized the experiment)
+    data = st.session_state.experiment_data
+    if data.get('sample_size_per_group') is not None:
+        sample_size = data['sample_size_per_group']
+        sample_size = f"{sample_size:,}" if isinstance(sample_size, (int, float)) else sample_size
+        st.markdown(f"""
+        <div class="info-box">
+        <h4 style="margin: 0 0 1rem 0;">📋 Experiment Snapshot</h4>
+        <div style="display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem;">
+        <div>
+        <strong>Channel:</strong> {data.get('channel', 'N/A')}<br>
+        <strong>Metric:</strong> {data.get('metric', 'N/A')}
+        </div>
+        <div>
+        <strong>Sample Size:</strong> {sample_size}/group<br>
+        <strong>Duration:</strong> {data.get('duration_days', 'N/A')} days
+        </div>
+        <div>
+        <strong>α:</strong> {data.get('alpha', '0.05')}<br>
+        <strong>Power:</strong> {int(data.get('power', 0.8)*100)}%
+        </div>
+        </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">🎯 Launch Checklist</div>
+    """, unsafe_allow_html=True)
+    
+    launch_col1, launch_col2 = st.columns(2)
+    
+    with launch_col1:
+        st.markdown("#### 🛠 Technical Implementation")
+        
+        checks = [
+            ("impl_tracking", "Event tracking verified in staging/dogfood"),
+            ("impl_flag", "Experiment flag configured with correct exposure rules"),
+            ("impl_eligibility", "Eligibility & exclusion criteria validated"),
+            ("impl_srm", "SRM alert configured (sample ratio mismatch monitoring)")
+        ]
+        
+        for key, label in checks:
+            if st.checkbox(label, key=key):
+                st.markdown(f"<span style='color: {GOOGLE_GREEN};'>✓</span>", unsafe_allow_html=True)
+        
+        st.text_area(
+            "**Monitoring Dashboard Links**",
+            placeholder="Paste links to dashboards, logging, metric alerts...",
+            key="impl_dashboards",
+            height=100
+        )
+    
+    with launch_col2:
+        st.markdown("#### 🤝 Cross-functional Alignment")
+        
+        checks = [
+            ("impl_alignment", "Launch checklist reviewed with Eng/Product/Analytics"),
+            ("impl_rollout", "Rollout & rollback plan documented"),
+            ("impl_comms", "Communications plan ready (stakeholders, support)"),
+            ("impl_qa", "QA playbook signed off (acceptance criteria met)")
+        ]
+        
+        for key, label in checks:
+            if st.checkbox(label, key=key):
+                st.markdown(f"<span style='color: {GOOGLE_GREEN};'>✓</span>", unsafe_allow_html=True)
+        
+        st.text_area(
+            "**Risks & Mitigation**",
+            placeholder="Dependencies, guardrail monitoring, on-call rotations...",
+            key="impl_risks",
+            height=100
+        )
+    
+    # Launch timeline
+    st.markdown("---")
+    st.markdown("#### 📅 Launch Timeline")
+    
+    # Follow the design's duration (traffic forecast when available) until the user edits the dates
+    launch_date = st.session_state.get('impl_launch_date') or date.today()
+    days, end_band = data.get('duration_days'), None
+    if data.get('traffic_model') and data.get('sample_size_per_group'):
+        projection = ab_forecast.forecast_duration(
+            data['traffic_model'], launch_date, data['sample_size_per_group'], data.get('split', 50)
+        )
+        days = projection['days'] or days
+        end_band = (projection['end_date_low'], projection['end_date_high'])
+    if days:
+        planned = (launch_date + timedelta(days=days // 2), launch_date + timedelta(days=days - 1))
+        if st.session_state.get('_impl_planned_dates') != planned or 'impl_end_date' not in st.session_state:
+            st.session_state.impl_mid_check, st.session_state.impl_end_date = planned
+            st.session_state._impl_planned_dates = planned
+    
+    col1, col2, col3 = st.columns(3)
+    col1.date_input("**Target Launch Date**", key="impl_launch_date")
+    col2.date_input("**Mid-test Check-in**", key="impl_mid_check")
+    col3.date_input("**Planned End Date**", key="impl_end_date")
+    
+    if end_band and all(end_band):
+        st.caption(f"Traffic forecast: end date between {end_band[0]:%b %d} and {end_band[1]:%b %d} "
+                   f"(80% band) for a {launch_date:%b %d} launch.")
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    render_assignment_engine()
+    render_portfolio_planner(launch_date)
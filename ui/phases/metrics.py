@@ -0,0 +1,192 @@
+"""Phase 2: success metrics and the marketing metrics dictionary"""
+import streamlit as st
+
+from playbook import catalog
+from ui.theme import GOOGLE_BG, GOOGLE_BLUE, GOOGLE_GREEN, GOOGLE_GREY, GOOGLE_GREY_LIGHT
+
+def tab_define_metrics():
+    st.markdown('<p class="phase-header">📊 Phase 2: Define Metrics</p>', unsafe_allow_html=True)
+    
+    st.markdown(f"""
+    <div class="section-container">
+    <p style="font-size: 1rem; line-height: 1.6; color: {GOOGLE_GREY}; margin: 0;">
+    Select metrics that directly measure your hypothesis. A well-designed measurement plan includes
+    <strong>success metrics</strong>, <strong>supporting metrics</strong>, and <strong>guardrail metrics</strong>.
+    </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Enhanced metric selection interface
+    st.markdown(f"""
+    <div class="section-container">
+    <div class="section-title">3️⃣ Build Your Measurement Plan</div>
+    """, unsafe_allow_html=True)
+    
+    metric_tabs = st.tabs(["✅ Success Metrics", "🎯 Support Metrics", "🛡️ Guardrail Metrics", "📚 Full Dictionary"])
+    
+    with metric_tabs[0]:
+        st.markdown("""
+        ### Primary Success Metrics
+        
+        Your **Overall Evaluation Criterion (OEC)** - the main metric that determines experiment success.
+        Choose 1-2 metrics that directly measure your hypothesis.
+        """)
+        
+        col1, col2 = st.columns([2, 1])
+        
+        with col1:
+            success_metric = st.text_input(
+                "Primary Success Metric",
+                placeholder="e.g., Purchase Conversion Rate",
+                help="The #1 metric that matters most"
+            )
+            success_why = st.text_area(
+                "Why is this the right success metric?",
+                placeholder="Links directly to revenue, measures end-to-end journey impact",
+                height=100,
+                help="Justify why this metric is your OEC"
+            )
+        
+        with col2:
+            st.markdown(f"""
+            <div class="info-box" style="margin-top: 2rem;">
+            <strong>💡 Good Success Metrics</strong>
+            <ul style="margin: 0.5rem 0; padding-left: 1.2rem; font-size: 0.9rem;">
+            <li>Directly tied to business value</li>
+            <li>Sensitive to changes</li>
+            <li>Measurable in experiment timeframe</li>
+            <li>Not easily gamed</li>
+            </ul>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        check_success = st.checkbox("✓ Success metric defined", key="success_metric")
+    
+    with metric_tabs[1]:
+        st.markdown("""
+        ### Supporting Metrics
+        
+        Secondary metrics that provide context and help interpret results. These explain **how** the treatment worked.
+        """)
+        
+        support_metrics = st.multiselect(
+            "Select 2-4 support metrics",
+            ["CTR", "Time on Page", "Add-to-Cart Rate", "Scroll Depth", "Video Completion", "Pages/Session", "Bounce Rate"],
+            help="Metrics that help explain the mechanism of change"
+        )
+        
+        if support_metrics:
+            st.markdown(f"""
+            <div class="success-box">
+            <strong>✓ Selected {len(support_metrics)} support metrics:</strong> {', '.join(support_metrics)}
+            </div>
+            """, unsafe_allow_html=True)
+        
+        check_support = st.checkbox("✓ Support metrics selected", key="support_metric")
+    
+    with metric_tabs[2]:
+        st.markdown("""
+        ### Guardrail Metrics
+        
+        Early warning system to ensure your treatment doesn't cause unintended harm.
+        These metrics should **not** degrade significantly.
+        """)
+        
+        guardrail_metrics = st.multiselect(
+            "Select 2-3 guardrail metrics",
+            ["Bounce Rate", "Cart Abandonment", "Unsubscribe Rate", "Page Load Time", "Error Rate", "Return Rate", "Customer Satisfaction"],
+            help="Metrics that protect against negative side effects"
+        )
+        
+        if guardrail_metrics:
+            st.markdown(f"""
+            <div class="warning-box">
+            <strong>⚠️ Monitoring {len(guardrail_metrics)} guardrail metrics:</strong> {', '.join(guardrail_metrics)}
+            <br><br>
+            <strong>Remember:</strong> If any guardrail degrades significantly, consider not shipping even if primary metric improves.
+            </div>
+            """, unsafe_allow_html=True)
+        
+        check_guardrail = st.checkbox("✓ Guardrail metrics selected", key="guardrail_metric")
+    
+    with metric_tabs[3]:
+        show_full_metrics_dictionary()
+    
+    # Progress indicator
+    total_checks = sum([
+        st.session_state.get('success_metric', False),
+        st.session_state.get('support_metric', False),
+        st.session_state.get('guardrail_metric', False)
+    ])
+    
+    st.markdown(f"""
+    <div style="margin-top: 2rem; padding: 1rem; background: {GOOGLE_BG}; border-radius: 8px;">
+    <strong>Measurement Plan Progress:</strong> {total_checks}/3 complete
+    <div style="background: white; height: 8px; border-radius: 10px; margin-top: 0.5rem; overflow: hidden;">
+    <div style="background: linear-gradient(90deg, {GOOGLE_BLUE} 0%, {GOOGLE_GREEN} 100%); 
+                height: 100%; width: {(total_checks/3)*100}%; transition: width 0.5s ease;"></div>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def show_full_metrics_dictionary():
+    """Enhanced metrics dictionary with better organization"""
+    st.markdown("### 📊 Complete Marketing Metrics Dictionary")
+    
+    st.markdown(f"""
+    <div class="info-box">
+    <strong>How to use this dictionary:</strong>
+    <ol style="margin: 0.5rem 0; padding-left: 1.5rem;">
+    <li>🎯 Browse key metrics tracked for each channel</li>
+    <li>📐 Reference probability distributions for sample sizing</li>
+    <li>📍 Find baseline sources to gather historical benchmarks</li>
+    <li>🛡️ Identify guardrail metrics alongside primary KPIs</li>
+    </ol>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Enhanced channel display
+    for channel in catalog.MARKETING_METRICS.keys():
+        with st.expander(f"📱 {channel}", expanded=False):
+            metrics = catalog.MARKETING_METRICS[channel]
+            
+            for idx, metric in enumerate(metrics):
+                # Alternating background colors
+                bg_color = GOOGLE_BG if idx % 2 == 0 else "white"
+                
+                st.markdown(f"""
+                <div style="background: {bg_color}; padding: 1.25rem; border-radius: 8px; margin: 0.75rem 0; border-left: 4px solid {GOOGLE_BLUE};">
+                <div style="display: flex; justify-content: space-between; align-items: start;">
+                <div style="flex: 1;">
+                <h4 style="color: {GOOGLE_BLUE}; margin: 0 0 0.5rem 0;">{metric['name']}</h4>
+                <p style="color: {GOOGLE_GREY}; margin: 0 0 0.75rem 0;">{metric['description']}</p>
+                
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 0.5rem; font-size: 0.9rem;">
+                <div><strong>Formula:</strong> <code>{metric['formula']}</code></div>
+                <div><strong>Typical Range:</strong> {metric['typical_range']}</div>
+                <div><strong>Distribution:</strong> {metric['distribution']}</div>
+                <div><strong>Test:</strong> {metric['test']}</div>
+                </div>
+                
+                <div style="background: rgba(66, 133, 244, 0.08); padding: 0.75rem; border-radius: 6px; margin-top: 0.75rem; font-size: 0.85rem;">
+                <strong>📍 Where to get baseline:</strong> {metric['where_to_get_baseline']}<br>
+                <em style="color: {GOOGLE_GREY_LIGHT};">Source: {metric['industry_source']}</em>
+                </div>
+                </div>
+                
+                <div style="margin-left: 1rem;">
+                """, unsafe_allow_html=True)
+                
+                # Lifecycle badge
+                lifecycle_colors = {
+                    "Awareness": "badge-awareness",
+                    "Consideration": "badge-consideration",
+                    "Conversion": "badge-conversion",
+                    "Retention": "badge-retention"
+                }
+                badge_class = lifecycle_colors.get(metric['lifecycle'], "badge-awareness")
+                st.markdown(f'<div class="metric-badge {badge_class}">{metric["lifecycle"]}</div>', unsafe_allow_html=True)
+                
+                st.markdown("</div></div></div>", unsafe_allow_html=True)
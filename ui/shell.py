@@ -0,0 +1,207 @@
+"""Page chrome around the active phase: header, navigation, sidebars and session resume."""
+import pandas as pd
+import streamlit as st
+
+from playbook import instrumentation
+from playbook import session as ab_session
+from ui.common import get_registry
+from ui.theme import GOOGLE_BLUE, GOOGLE_BLUE_DARK
+
+# Session snapshots: URL parameter, widget values and results restored on reopen
+SESSION_PARAM = "session"
+SESSION_STATE_KEYS = ('current_tab', 'experiment_data', 'analysis_results', 'ratio_results', 'quantile_results')
+SESSION_WIDGET_KEYS = (
+    'business_objective_select', 'success_metric',
+    'design_unit', 'design_split', 'design_channel', 'design_metric', 'design_baseline', 'design_sd',
+    'design_dispersion', 'design_mde', 'design_alpha', 'design_power', 'design_daily_traffic',
+    'curve_daily_traffic', 'budget_kind', 'budget_samples', 'budget_days', 'impl_launch_date',
+    'srm_expected', 'srm_control', 'srm_treatment',
+    'results_control_n', 'results_control_x', 'results_treatment_n', 'results_treatment_x',
+    'impact_monthly_users', 'impact_value', 'impact_trigger_share', 'impact_implementation_cost',
+    'impact_ongoing_cost', 'mc_enabled', 'mc_users_cv', 'mc_value_cv', 'mc_horizon', 'mc_draws', 'rollout_notes',
+)
+# Widget families: per-metric mean inputs and the split optimizer's inputs
+SESSION_WIDGET_PREFIXES = ('design_mean::', 'split_opt_')
+
+def restore_session():
+    """Resume the snapshot named by the URL token, once per browser session
+
+    Widget values and results are written back to the session state and the
+    script reruns, so widgets pick them up as their own values and nothing
+    shown from ``experiment_data`` or the stored results is recomputed.
+    """
+    if '_session_token' in st.session_state:
+        return
+    token = st.query_params.get(SESSION_PARAM) or ab_session.new_session_token()
+    st.session_state['_session_token'] = token
+    st.query_params[SESSION_PARAM] = token
+    
+    blob = get_registry().load_session(token)
+    if blob is None:
+        return
+    try:
+        snapshot = ab_session.decode_snapshot(blob)
+    except ValueError:
+        return
+    widgets = snapshot.get('widgets', {})
+    for key, value in {**widgets, **snapshot.get('state', {})}.items():
+        st.session_state[key] = value
+    st.session_state['_session_widgets'] = widgets
+    st.session_state['_session_saved'] = blob
+    st.rerun()
+
+def save_session():
+    """Queue the session snapshot under its token if it changed since the last write"""
+    token = st.session_state.get('_session_token')
+    if token is None:
+        return
+    # Widgets off the current tab drop out of the session state; keep their last values
+    widgets = st.session_state.setdefault('_session_widgets', {})
+    for key in list(st.session_state.keys()):
+        if key in SESSION_WIDGET_KEYS or key.startswith(SESSION_WIDGET_PREFIXES):
+            widgets[key] = st.session_state[key]
+    snapshot = {
+        'widgets': widgets,
+        'state': {key: st.session_state[key] for key in SESSION_STATE_KEYS if key in st.session_state},
+    }
+    with instrumentation.timed("stat", "session_snapshot"):
+        blob = ab_session.encode_snapshot(snapshot)
+    if blob != st.session_state.get('_session_saved'):
+        get_registry().save_session(token, blob)
+        st.session_state['_session_saved'] = blob
+
+def render_registry_sidebar():
+    """Browse, reload and start experiments stored in the registry"""
+    registry = get_registry()
+    
+    st.markdown("### 📚 Experiment Registry")
+    # Writes are asynchronous, so failures surface on the rerun after they happen
+    for exc in registry.take_errors():
+        st.error(f"A registry write failed and was not saved: {exc}")
+    channel_filter = st.selectbox("Channel", ["All channels"] + registry.distinct_values('channel'), key="registry_channel")
+    status_filter = st.selectbox("Status", ["Any status", "design", "analyzed", "decided"], key="registry_status")
+    
+    filters = {
+        'channel': None if channel_filter == "All channels" else channel_filter,
+        'status': None if status_filter == "Any status" else status_filter
+    }
+    experiments = {row['id']: row for row in registry.list_experiments(limit=50, **filters)}
+    st.caption(f"{registry.count_experiments(**filters):,} saved experiments")
+    
+    if experiments:
+        selected_id = st.selectbox(
+            "Saved experiments",
+            list(experiments),
+            format_func=lambda eid: f"{experiments[eid]['name']} ({experiments[eid]['status']}, {experiments[eid]['created_at'][:10]})",
+            key="registry_selected"
+        )
+        if st.button("📂 Load Experiment", use_container_width=True):
+            experiment = registry.load_experiment(selected_id)
+            if experiment:
+                st.session_state.experiment_data = {**experiment['design'], 'experiment_id': selected_id}
+                st.session_state['design_split'] = int(experiment['design'].get('split', 50))
+                if experiment['analysis']:
+                    st.session_state['analysis_results'] = experiment['analysis']
+                else:
+                    st.session_state.pop('analysis_results', None)
+                st.rerun()
+    
+    if st.button("➕ New Experiment", use_container_width=True):
+        st.session_state.experiment_data = {}
+        st.session_state.pop('analysis_results', None)
+        st.rerun()
+
+def render_hero():
+    """Render enhanced hero header"""
+    st.markdown(f"""
+    <div class="hero-header">
+        <div class="hero-title">🔬 Marketing Science: A/B Testing Playbook</div>
+        <div class="hero-subtitle">
+            Design, execute, and analyze marketing experiments with statistical rigor
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_progress_bar(current_step, total_steps=6):
+    """Render progress bar"""
+    progress = ((current_step + 1) / total_steps) * 100
+    st.markdown(f"""
+    <div class="nav-container">
+        <div class="progress-bar">
+            <div class="progress-fill" style="width: {progress}%;"></div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_navigation():
+    """Render enhanced navigation"""
+    if 'current_tab' not in st.session_state:
+        st.session_state.current_tab = 0
+    
+    workflow_steps = [
+        ("🎯", "Objective", "Define your goal"),
+        ("📊", "Metrics", "Choose KPIs"),
+        ("🔬", "Design", "Sample size"),
+        ("🚀", "Launch", "Implementation"),
+        ("📈", "Analyze", "Results"),
+        ("✅", "Decide", "Take action")
+    ]
+    
+    active_idx = st.session_state.current_tab
+    
+    # Progress bar
+    render_progress_bar(active_idx)
+    
+    # Navigation buttons
+    nav_cols = st.columns(len(workflow_steps))
+    
+    for idx, (col, (icon, step, desc)) in enumerate(zip(nav_cols, workflow_steps)):
+        with col:
+            button_label = f"{icon}\n{step}"
+            if st.button(button_label, key=f"nav_btn_{idx}", use_container_width=True, help=desc):
+                st.session_state.current_tab = idx
+                st.rerun()
+    
+    # Active state styling
+    st.markdown(f"""
+    <style>
+    button[key="nav_btn_{active_idx}"] {{
+        background: linear-gradient(135deg, {GOOGLE_BLUE} 0%, {GOOGLE_BLUE_DARK} 100%) !important;
+        color: white !important;
+        font-weight: 700 !important;
+        border: 2px solid {GOOGLE_BLUE_DARK} !important;
+        box-shadow: 0 4px 12px rgba(66, 133, 244, 0.4) !important;
+        transform: translateY(-2px) scale(1.02) !important;
+    }}
+    </style>
+    """, unsafe_allow_html=True)
+
+def render_debug_sidebar(reruns, triggers):
+    """Per-session rerun counts and process-wide timings (``?debug=1`` or AB_INSTRUMENT=1)"""
+    with st.sidebar.expander("🛠 Performance Debug", expanded=True):
+        st.caption(f"Session reruns: {reruns} · triggered by: {', '.join(triggers)}")
+        
+        timings = instrumentation.METRICS.timings()
+        if timings:
+            st.markdown("**Slowest interactions** (process-wide)")
+            st.dataframe(
+                pd.DataFrame(timings).round(2),
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        widget_reruns = st.session_state.get('_instrument_widget_reruns', {})
+        if widget_reruns:
+            st.markdown("**Reruns by widget** (this session)")
+            st.dataframe(
+                pd.DataFrame(sorted(widget_reruns.items(), key=lambda item: -item[1]), columns=["widget", "reruns"]),
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        st.download_button(
+            "⬇️ Prometheus metrics",
+            instrumentation.METRICS.render_prometheus(),
+            file_name="ab_playbook_metrics.prom",
+            mime="text/plain"
+        )
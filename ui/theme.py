@@ -0,0 +1,527 @@
+"""Colour palette and page stylesheet of the app.
+
+The stylesheet is formatted once, at import; every rerun only re-sends it.
+"""
+import streamlit as st
+
+# Enhanced Color Palette
+GOOGLE_BLUE = "#4285F4"
+GOOGLE_RED = "#EA4335"
+GOOGLE_YELLOW = "#FBBC04"
+GOOGLE_GREEN = "#34A853"
+GOOGLE_BLUE_DARK = "#1967D2"
+GOOGLE_BLUE_LIGHT = "#8AB4F8"
+GOOGLE_GREY = "#5F6368"
+GOOGLE_GREY_LIGHT = "#9AA0A6"
+GOOGLE_LIGHT_GREY = "#E8EAED"
+GOOGLE_BG = "#F8F9FA"
+GOOGLE_WHITE = "#FFFFFF"
+
+# Enhanced CSS with modern design
+CSS = f"""
+<style>
+    @import url('https://fonts.googleapis.com/css2?family=Google+Sans:wght@400;500;700&family=Roboto:wght@300;400;500;700&display=swap');
+    
+    * {{
+        font-family: 'Roboto', -apple-system, BlinkMacSystemFont, sans-serif;
+    }}
+    
+    h1, h2, h3, h4, h5, h6, .main-header, .phase-header, .section-title {{
+        font-family: 'Google Sans', 'Roboto', sans-serif !important;
+    }}
+    
+    /* Ensure proper spacing from Streamlit toolbar */
+    .stApp {{
+        padding-top: 1rem;
+    }}
+    
+    header[data-testid="stHeader"] {{
+        background-color: transparent;
+    }}
+    
+    .main {{
+        background: linear-gradient(135deg, {GOOGLE_BG} 0%, #FFFFFF 100%);
+        padding: 0.75rem !important;
+    }}
+    
+    .block-container {{
+        padding-top: 1rem !important;
+        padding-bottom: 0.5rem !important;
+        max-width: 100% !important;
+    }}
+    
+    /* Hero Header */
+    .hero-header {{
+        background: linear-gradient(135deg, {GOOGLE_BLUE} 0%, {GOOGLE_BLUE_DARK} 100%);
+        color: white;
+        padding: 1.25rem 2rem;
+        border-radius: 12px;
+        margin: 0.5rem 0 1rem 0;
+        box-shadow: 0 8px 24px rgba(66, 133, 244, 0.3);
+        position: relative;
+        overflow: hidden;
+    }}
+    
+    .hero-header::before {{
+        content: '';
+        position: absolute;
+        top: -50%;
+        right: -50%;
+        width: 200%;
+        height: 200%;
+        background: radial-gradient(circle, rgba(255,255,255,0.1) 0%, transparent 70%);
+        animation: pulse 8s ease-in-out infinite;
+    }}
+    
+    @keyframes pulse {{
+        0%, 100% {{ transform: scale(1); opacity: 0.5; }}
+        50% {{ transform: scale(1.1); opacity: 0.8; }}
+    }}
+    
+    .hero-title {{
+        font-size: 2rem;
+        font-weight: 700;
+        margin: 0;
+        position: relative;
+        z-index: 1;
+        text-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }}
+    
+    .hero-subtitle {{
+        font-size: 1rem;
+        margin-top: 0.25rem;
+        opacity: 0.95;
+        position: relative;
+        z-index: 1;
+        font-weight: 400;
+    }}
+    
+    /* Enhanced Navigation */
+    .nav-container {{
+        background: white;
+        border-radius: 12px;
+        padding: 0.5rem;
+        margin-bottom: 1rem;
+        box-shadow: 0 2px 12px rgba(0,0,0,0.08);
+        position: sticky;
+        top: 0.5rem;
+        z-index: 100;
+    }}
+    
+    .progress-bar {{
+        height: 4px;
+        background: {GOOGLE_LIGHT_GREY};
+        border-radius: 10px;
+        overflow: hidden;
+        margin-bottom: 0.5rem;
+    }}
+    
+    .progress-fill {{
+        height: 100%;
+        background: linear-gradient(90deg, {GOOGLE_BLUE} 0%, {GOOGLE_GREEN} 100%);
+        border-radius: 10px;
+        transition: width 0.5s ease;
+    }}
+    
+    /* Phase Header */
+    .phase-header {{
+        font-size: 1.8rem;
+        font-weight: 700;
+        color: white;
+        background: linear-gradient(135deg, {GOOGLE_BLUE} 0%, {GOOGLE_BLUE_DARK} 100%);
+        margin: 1rem 0 1rem 0;
+        padding: 1.25rem 2rem;
+        border-radius: 12px;
+        box-shadow: 0 6px 20px rgba(66, 133, 244, 0.3);
+        position: relative;
+        overflow: hidden;
+        animation: slideInLeft 0.6s ease-out;
+    }}
+    
+    @keyframes slideInLeft {{
+        from {{
+            opacity: 0;
+            transform: translateX(-30px);
+        }}
+        to {{
+            opacity: 1;
+            transform: translateX(0);
+        }}
+    }}
+    
+    .phase-header::after {{
+        content: '';
+        position: absolute;
+        top: 0;
+        right: 0;
+        width: 40%;
+        height: 100%;
+        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.1));
+    }}
+    
+    /* Modern Card Design */
+    .section-container {{
+        background: white;
+        border-radius: 12px;
+        padding: 1.25rem 1.75rem;
+        margin: 1rem 0;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.06);
+        border: 1px solid rgba(0,0,0,0.03);
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+        animation: fadeInUp 0.5s ease-out;
+    }}
+    
+    @keyframes fadeInUp {{
+        from {{
+            opacity: 0;
+            transform: translateY(20px);
+        }}
+        to {{
+            opacity: 1;
+            transform: translateY(0);
+        }}
+    }}
+    
+    .section-container:hover {{
+        box-shadow: 0 6px 24px rgba(0,0,0,0.1);
+        transform: translateY(-2px);
+    }}
+    
+    .section-title {{
+        font-size: 1.4rem;
+        font-weight: 600;
+        color: {GOOGLE_BLUE};
+        margin-bottom: 0.75rem;
+        padding-bottom: 0.75rem;
+        border-bottom: 2px solid {GOOGLE_LIGHT_GREY};
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+    }}
+    
+    .section-subtitle {{
+        font-size: 1.1rem;
+        font-weight: 500;
+        color: {GOOGLE_GREY};
+        margin: 1rem 0 0.75rem 0;
+        display: flex;
+        align-items: center;
+        gap: 0.5rem;
+    }}
+    
+    /* Enhanced Metric Card */
+    .metric-card {{
+        background: linear-gradient(135deg, white 0%, {GOOGLE_BG} 100%);
+        border-radius: 10px;
+        padding: 1rem;
+        margin: 0.75rem 0;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        border-left: 4px solid {GOOGLE_BLUE};
+        transition: all 0.3s ease;
+        position: relative;
+        overflow: hidden;
+    }}
+    
+    .metric-card::before {{
+        content: '';
+        position: absolute;
+        top: 0;
+        right: 0;
+        width: 80px;
+        height: 80px;
+        background: radial-gradient(circle, rgba(66, 133, 244, 0.1) 0%, transparent 70%);
+        transform: translate(30%, -30%);
+    }}
+    
+    .metric-card:hover {{
+        box-shadow: 0 4px 16px rgba(0,0,0,0.12);
+        transform: translateX(4px);
+        border-left-width: 6px;
+    }}
+    
+    .metric-card h4 {{
+        color: {GOOGLE_BLUE};
+        font-size: 1.2rem;
+        margin: 0 0 0.5rem 0;
+        font-weight: 600;
+    }}
+    
+    /* Info Boxes with Icons */
+    .info-box {{
+        background: linear-gradient(135deg, rgba(66, 133, 244, 0.08) 0%, rgba(66, 133, 244, 0.03) 100%);
+        border-left: 4px solid {GOOGLE_BLUE};
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.75rem 0;
+        box-shadow: 0 2px 6px rgba(66, 133, 244, 0.1);
+        transition: all 0.3s ease;
+    }}
+    
+    .info-box:hover {{
+        box-shadow: 0 3px 10px rgba(66, 133, 244, 0.15);
+        transform: translateX(2px);
+    }}
+    
+    .success-box {{
+        background: linear-gradient(135deg, rgba(52, 168, 83, 0.08) 0%, rgba(52, 168, 83, 0.03) 100%);
+        border-left: 4px solid {GOOGLE_GREEN};
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.75rem 0;
+        box-shadow: 0 2px 6px rgba(52, 168, 83, 0.1);
+        transition: all 0.3s ease;
+    }}
+    
+    .success-box:hover {{
+        box-shadow: 0 3px 10px rgba(52, 168, 83, 0.15);
+        transform: translateX(2px);
+    }}
+    
+    .warning-box {{
+        background: linear-gradient(135deg, rgba(251, 188, 4, 0.08) 0%, rgba(251, 188, 4, 0.03) 100%);
+        border-left: 4px solid {GOOGLE_YELLOW};
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.75rem 0;
+        box-shadow: 0 2px 6px rgba(251, 188, 4, 0.1);
+        transition: all 0.3s ease;
+    }}
+    
+    .warning-box:hover {{
+        box-shadow: 0 3px 10px rgba(251, 188, 4, 0.15);
+        transform: translateX(2px);
+    }}
+    
+    .danger-box {{
+        background: linear-gradient(135deg, rgba(234, 67, 53, 0.08) 0%, rgba(234, 67, 53, 0.03) 100%);
+        border-left: 4px solid {GOOGLE_RED};
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.75rem 0;
+        box-shadow: 0 2px 6px rgba(234, 67, 53, 0.1);
+        transition: all 0.3s ease;
+    }}
+    
+    .danger-box:hover {{
+        box-shadow: 0 3px 10px rgba(234, 67, 53, 0.15);
+        transform: translateX(2px);
+    }}
+    
+    /* Enhanced Buttons */
+    .stButton>button {{
+        background: linear-gradient(135deg, {GOOGLE_BLUE} 0%, {GOOGLE_BLUE_DARK} 100%);
+        color: white;
+        border: none;
+        border-radius: 8px;
+        padding: 0.75rem 2rem;
+        font-weight: 600;
+        font-size: 1rem;
+        box-shadow: 0 4px 12px rgba(66, 133, 244, 0.3);
+        transition: all 0.3s ease;
+        cursor: pointer;
+    }}
+    
+    .stButton>button:hover {{
+        box-shadow: 0 6px 20px rgba(66, 133, 244, 0.4);
+        transform: translateY(-2px);
+    }}
+    
+    .stButton>button:active {{
+        transform: translateY(0);
+    }}
+    
+    /* Navigation Buttons */
+    button[key^="nav_btn_"] {{
+        background: {GOOGLE_WHITE} !important;
+        color: {GOOGLE_GREY} !important;
+        border: 2px solid {GOOGLE_LIGHT_GREY} !important;
+        border-radius: 10px !important;
+        padding: 0.6rem 0.4rem !important;
+        font-size: 0.9rem !important;
+        font-weight: 500 !important;
+        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.05) !important;
+        min-height: 60px !important;
+        display: flex !important;
+        flex-direction: column !important;
+        align-items: center !important;
+        justify-content: center !important;
+        gap: 0.15rem !important;
+        line-height: 1.2 !important;
+    }}
+    
+    button[key^="nav_btn_"]:hover {{
+        background: #E8F0FE !important;
+        color: {GOOGLE_BLUE} !important;
+        border-color: {GOOGLE_BLUE_LIGHT} !important;
+        transform: translateY(-2px) !important;
+        box-shadow: 0 4px 12px rgba(66, 133, 244, 0.2) !important;
+    }}
+    
+    /* Metric Badges */
+    .metric-badge {{
+        display: inline-block;
+        padding: 0.35rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.8rem;
+        font-weight: 600;
+        margin-right: 0.5rem;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }}
+    
+    .badge-awareness {{ 
+        background: linear-gradient(135deg, {GOOGLE_YELLOW} 0%, #F9AB00 100%); 
+        color: #3C4043; 
+    }}
+    .badge-consideration {{ 
+        background: linear-gradient(135deg, {GOOGLE_BLUE} 0%, {GOOGLE_BLUE_DARK} 100%); 
+        color: white; 
+    }}
+    .badge-conversion {{ 
+        background: linear-gradient(135deg, {GOOGLE_GREEN} 0%, #0F9D58 100%); 
+        color: white; 
+    }}
+    .badge-retention {{ 
+        background: linear-gradient(135deg, {GOOGLE_RED} 0%, #C5221F 100%); 
+        color: white; 
+    }}
+    
+    /* Enhanced Expander */
+    .streamlit-expanderHeader {{
+        background: {GOOGLE_BG};
+        border-radius: 8px;
+        font-weight: 500;
+        color: {GOOGLE_GREY};
+        padding: 0.75rem !important;
+        transition: all 0.3s ease;
+    }}
+    
+    .streamlit-expanderHeader:hover {{
+        background: #E8F0FE;
+        color: {GOOGLE_BLUE};
+    }}
+    
+    /* Input Fields */
+    .stTextInput>div>div>input,
+    .stNumberInput>div>div>input,
+    .stSelectbox>div>div>select,
+    .stTextArea>div>div>textarea {{
+        border-radius: 8px !important;
+        border: 2px solid {GOOGLE_LIGHT_GREY} !important;
+        padding: 0.75rem !important;
+        transition: all 0.3s ease !important;
+    }}
+    
+    .stTextInput>div>div>input:focus,
+    .stNumberInput>div>div>input:focus,
+    .stSelectbox>div>div>select:focus,
+    .stTextArea>div>div>textarea:focus {{
+        border-color: {GOOGLE_BLUE} !important;
+        box-shadow: 0 0 0 3px rgba(66, 133, 244, 0.1) !important;
+    }}
+    
+    /* Metric Display */
+    .stMetric {{
+        background: white;
+        padding: 0.75rem;
+        border-radius: 8px;
+        box-shadow: 0 2px 6px rgba(0,0,0,0.06);
+        transition: all 0.3s ease;
+    }}
+    
+    .stMetric:hover {{
+        box-shadow: 0 3px 12px rgba(0,0,0,0.1);
+        transform: translateY(-1px);
+    }}
+    
+    /* Tabs */
+    .stTabs [data-baseweb="tab-list"] {{
+        gap: 1rem;
+        background: {GOOGLE_BG};
+        border-radius: 12px;
+        padding: 0.5rem;
+    }}
+    
+    .stTabs [data-baseweb="tab"] {{
+        border-radius: 8px;
+        padding: 0.75rem 1.5rem;
+        font-weight: 500;
+        transition: all 0.3s ease;
+    }}
+    
+    .stTabs [aria-selected="true"] {{
+        background: white;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+    }}
+    
+    /* Checkbox */
+    .stCheckbox {{
+        padding: 0.5rem;
+        transition: all 0.3s ease;
+    }}
+    
+    .stCheckbox:hover {{
+        background: {GOOGLE_BG};
+        border-radius: 6px;
+    }}
+    
+    /* Dataframe */
+    .dataframe {{
+        border-radius: 8px !important;
+        overflow: hidden !important;
+    }}
+    
+    /* Scrollbar */
+    ::-webkit-scrollbar {{
+        width: 10px;
+        height: 10px;
+    }}
+    
+    ::-webkit-scrollbar-track {{
+        background: {GOOGLE_BG};
+        border-radius: 10px;
+    }}
+    
+    ::-webkit-scrollbar-thumb {{
+        background: {GOOGLE_GREY_LIGHT};
+        border-radius: 10px;
+    }}
+    
+    ::-webkit-scrollbar-thumb:hover {{
+        background: {GOOGLE_GREY};
+    }}
+    
+    /* Responsive Typography */
+    @media (max-width: 768px) {{
+        .hero-title {{
+            font-size: 1.5rem;
+        }}
+        
+        .section-title {{
+            font-size: 1.2rem;
+        }}
+        
+        button[key^="nav_btn_"] {{
+            font-size: 0.8rem !important;
+            padding: 0.5rem 0.25rem !important;
+            min-height: 50px !important;
+        }}
+    }}
+    
+    /* Loading Animation */
+    @keyframes shimmer {{
+        0% {{ background-position: -1000px 0; }}
+        100% {{ background-position: 1000px 0; }}
+    }}
+    
+    .loading {{
+        animation: shimmer 2s infinite;
+        background: linear-gradient(to right, {GOOGLE_BG} 0%, {GOOGLE_LIGHT_GREY} 50%, {GOOGLE_BG} 100%);
+        background-size: 1000px 100%;
+    }}
+</style>
+"""
+
+def apply_theme():
+    """Inject the stylesheet (must run on every rerun, after ``st.set_page_config``)"""
+    st.markdown(CSS, unsafe_allow_html=True)